@@ -1,9 +1,9 @@
+import time
+_boot_start = time.perf_counter()
+
 import streamlit as st
-import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
-import joblib
 import os
 import sys
 import random
@@ -11,11 +11,15 @@ import random
 # Append project root
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from nlp.embedder import get_mean_embedding
-from core.matcher import match_roles
-from core.salary import predict_salary
-from core.demand import get_gap_skills
-from roadmap.generator import generate_roadmap
+# Only what the landing page needs is imported here. pandas, plotly.express,
+# the embedder (torch) and the model artifacts load in the background warm-up
+# or on the first analysis.
+from core.startup import record_timing, startup_report, start_warmup, format_report
+# Stage spans and cache counters; no-ops unless CAREER_TRACING=1
+from core.tracing import is_enabled, register_source, snapshot, span, start_exporters_from_env
+
+if 'import.app' not in startup_report():
+    record_timing('import.app', time.perf_counter() - _boot_start)
 
 # --- PAGE CONFIG ---
 st.set_page_config(page_title="Career Intelligence", layout="wide", page_icon="📈")
@@ -28,18 +32,298 @@ def load_css():
 load_css()
 
 # --- LOAD MODELS ---
-@st.cache_resource
+MODEL_BASE = os.path.join(os.path.dirname(__file__), 'models')
+
 def load_data_artifacts():
-    base = os.path.join(os.path.dirname(__file__), 'models')
-    try:
-        salary_model = joblib.load(os.path.join(base, 'salary.pkl'))
-        role_df = joblib.load(os.path.join(base, 'roles.pkl'))
-        demand_map = joblib.load(os.path.join(base, 'demand_map.pkl'))
-        return salary_model, role_df, demand_map
-    except Exception as e:
-        return None, None, None
+    from core.artifacts import load_artifacts
+    from core.matcher import RoleIndex
+    from core.profile_cache import GapEngine
+    with span("artifacts.load"):
+        # Memory-mapped bundle when built, legacy pickles otherwise
+        salary_model, role_df, demand_map = load_artifacts(MODEL_BASE)
+        # Built once per process; every rerun reuses the normalized role matrix
+        role_index = RoleIndex(role_df)
+        # Gap/roadmap results cached per profile signature, scoped to this artifact version
+        gap_engine = GapEngine(role_df, version=getattr(salary_model, 'version', None) or 'legacy')
+    register_source("gap_roadmap", gap_engine.cache.stats)
+    return salary_model, role_df, role_index, demand_map, gap_engine
+
+def read_demand_engine():
+    # (bundle version, engine); the engine is absent on mock-only setups
+    from core.artifacts import bundle_version, current_bundle_dir, load_demand_engine
+    version, bundle_dir = bundle_version(MODEL_BASE), current_bundle_dir(MODEL_BASE)
+    engine = load_demand_engine(bundle_dir) if bundle_dir else None
+    if engine is not None:
+        engine.roll_to() # Expire counts that fell out of the windows since the bundle was built
+    return version, engine
+
+def read_skill_graph():
+    # (bundle version, graph) published with the bundle
+    from core.artifacts import bundle_version, current_bundle_dir, load_skill_graph
+    version, bundle_dir = bundle_version(MODEL_BASE), current_bundle_dir(MODEL_BASE)
+    graph = load_skill_graph(bundle_dir) if bundle_dir else None
+    if graph is not None:
+        graph.weights() # Precompute PPMI so queries are a sparse row sum
+    return version, graph
+
+def load_encoder():
+    from nlp.embedder import encoder_stats, warm_up
+    warm_up()
+    register_source("encoder_batcher", encoder_stats)
+
+@st.cache_resource
+def get_warmup():
+    # One background warm-up per server process, started right after boot
+    start_exporters_from_env()
+    return start_warmup({"artifacts": load_data_artifacts, "demand": read_demand_engine,
+                         "graph": read_skill_graph, "encoder": load_encoder})
+
+warmup = get_warmup()
+
+@st.cache_resource(max_entries=1)
+def load_published_artifacts(version):
+    # Keyed by bundle version: a refresh published while the server runs is
+    # loaded once, then shared by every session
+    return load_data_artifacts()
+
+@st.cache_resource(max_entries=1)
+def load_demand_engine(version):
+    # Same version key as load_published_artifacts
+    return read_demand_engine()[1]
+
+@st.cache_resource(max_entries=1)
+def load_skill_graph(version):
+    return read_skill_graph()[1]
+
+@st.cache_resource(max_entries=1)
+def load_salary_sketches(version):
+    # P10/P50/P90 digests published with the bundle; None for older bundles
+    from core.artifacts import current_bundle_dir, load_sketches
+    bundle_dir = current_bundle_dir(MODEL_BASE)
+    return load_sketches(bundle_dir) if bundle_dir else None
+
+def percentile_card(title, pct, scope):
+    # pct is (p10, p50, p90, count) from SalarySketches.percentiles
+    if pct is None:
+        value, subtext = "N/A", f"No salary data for {scope}"
+    else:
+        value, subtext = f"₹{pct[0]:.1f} - {pct[2]:.1f} LPA", f"P10-P90 · Median ₹{pct[1]:.1f} · {pct[3]:,} postings"
+    st.markdown(f"""
+    <div class="metric-card">
+        <div class="metric-title">{title}</div>
+        <div class="metric-value">{value}</div>
+        <div class="metric-subtext">{subtext}</div>
+    </div>
+    """, unsafe_allow_html=True)
+
+# --- ANALYSIS STAGES ---
+# Each stage is memoized on exactly the inputs it depends on, so a rerun only
+# recomputes what changed: a new experience value re-predicts salary, a new
+# target role re-runs gap/roadmap, and the encoder only sees new skill sets.
+# Underscored arguments aren't hashed by Streamlit; the artifact `version`
+# (and the demand engine's `day`) stand in for them in the cache key.
+TARGET_ROLES = ["Machine Learning Engineer", "Frontend Engineer", "Backend Engineer", "Data Scientist", "DevOps Engineer", "Product Manager"]
+
+def artifact_version(salary_model):
+    return getattr(salary_model, 'version', None) or 'legacy'
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def profile_embedding(skills):
+    from nlp.embedder import get_mean_embedding
+    with span("get_mean_embedding"):
+        return get_mean_embedding(list(skills))
+
+@st.cache_data(max_entries=1024, show_spinner=False)
+def salary_stage(_salary_model, version, skills, experience):
+    from core.salary import predict_salary
+    with span("predict_salary"):
+        return predict_salary(_salary_model, profile_embedding(skills), experience)
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def match_stage(_role_index, version, skills):
+    from core.matcher import match_roles
+    # Match against ALL roles to find the top ones
+    with span("match_roles"):
+        return match_roles(profile_embedding(skills), _role_index) # Top 3
+
+@st.cache_data(max_entries=1024, show_spinner=False)
+def target_stage(_gap_engine, _role_index, _role_df, version, skills, target_role):
+    # Target role gap + roadmap: bitset AND-NOT. They don't depend on experience
+    # (see core/profile_cache.py), so the slider never invalidates this stage.
+    with span("gap_roadmap"):
+        analysis = _gap_engine.analyze(list(skills), 0, target_role) or {"gap_skills": [], "roadmap": {}}
+    # Similarity for the target role comes from the same normalized index
+    target_score = _role_index.score(profile_embedding(skills), target_role)
+    target_row = _role_df[_role_df['Role'] == target_role]
+    return {
+        "gap_skills": analysis["gap_skills"],
+        "roadmap": analysis["roadmap"],
+        "match_pct": int(target_score * 100) if target_score is not None else 0,
+        "demand_level": target_row.iloc[0]['Demand_Level'] if target_score is not None and len(target_row) else 'N/A',
+    }
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def demand_figure(_demand_map, _demand_engine, version, demand_day, skills):
+    import pandas as pd
+    import plotly.express as px
+    # Create Data for user skills demand
+    skill_data = []
+    for s in skills:
+        # 30-day windowed score and 7-vs-30-day trend when the live engine is available
+        base_score = _demand_map.get(s.lower(), 50)
+        if _demand_engine is not None:
+            val = _demand_engine.score(s, default=base_score)
+            trend = _demand_engine.trend(s)
+        else:
+            val, trend = base_score, 0.0
+        skill_data.append({"Skill": s, "Score": val, "Trend": f"{trend:+.0%}"})
+
+    df_skill = pd.DataFrame(skill_data).sort_values("Score", ascending=True)
+
+    fig = px.bar(df_skill, x="Score", y="Skill", orientation='h', color="Score", 
+                 color_continuous_scale=["#21262D", "#22c55e"], hover_data=["Trend"])
+    fig.update_layout(template="plotly_dark", paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', height=300, margin=dict(l=0,r=0,t=0,b=0))
+    fig.update_xaxes(showgrid=False)
+    return fig
+
+@st.cache_data(max_entries=1024, show_spinner=False)
+def trajectory_figure(_salary_model, version, skills, experience):
+    from core.salary import salary_trajectory
+    # Projection: model-predicted range across 0-15 years in one batched call
+    with span("salary_trajectory"):
+        x_vals, y_low, y_high = salary_trajectory(_salary_model, profile_embedding(skills))
+    sal_min, _ = salary_stage(_salary_model, version, skills, experience)
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=x_vals, y=y_low, mode='lines+markers', line=dict(color='#22c55e', width=4, shape='spline'), name='Projected'))
+    fig.add_trace(go.Scatter(x=[experience], y=[sal_min], mode='markers', marker=dict(color='white', size=12), name='You'))
+    fig.update_layout(template="plotly_dark", paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', height=300, margin=dict(l=0,r=0,t=20,b=0))
+    fig.update_xaxes(title="Years of Experience")
+    fig.update_yaxes(title="Salary (₹ LPA)", showgrid=True, gridcolor='#30363D')
+    return fig
+
+# --- FRAGMENTS ---
+# Sections whose own control lives inside them: moving the slider or picking
+# a target role reruns only that fragment, not the whole script. Arguments
+# are kept from the last full run.
+@st.fragment
+def salary_section(salary_model, sketches, skills):
+    with span("fragment.salary"):
+        version = artifact_version(salary_model)
+        xp_input = st.slider("Years of Experience", 0, 15, 3, key="xp_input")
+        sal_min, sal_max = salary_stage(salary_model, version, skills, xp_input)
+
+        s1, s2 = st.columns([1, 2])
+        with s1:
+            st.markdown(f"""
+            <div class="metric-card">
+                <div class="metric-title">Projected Salary</div>
+                <div class="metric-value">₹{sal_min:.1f} - {sal_max:.1f} LPA</div>
+                <div class="metric-subtext">Market Median ±15%</div>
+            </div>
+            """, unsafe_allow_html=True)
+            # Observed spread for this experience band, straight from the sketches
+            from core.quantiles import experience_band
+            band = experience_band(xp_input)
+            pct = sketches.percentiles("band", band) if sketches is not None else None
+            percentile_card(f"Market Range · {band} yrs", pct, f"{band} yrs")
+
+        with s2:
+            st.markdown('<div class="css-card">', unsafe_allow_html=True)
+            st.markdown("##### Salary Trajectory")
+            with span("chart.trajectory"):
+                st.plotly_chart(trajectory_figure(salary_model, version, skills, xp_input), use_container_width=True)
+            st.markdown('</div>', unsafe_allow_html=True)
+
+@st.fragment
+def target_section(salary_model, role_df, role_index, gap_engine, skill_graph, sketches, skills):
+    with span("fragment.target"):
+        target_role = st.selectbox("Target Role", TARGET_ROLES, key="target_role")
+        target = target_stage(gap_engine, role_index, role_df, artifact_version(salary_model), skills, target_role)
+        gap_skills = target["gap_skills"]
+        roadmap = target["roadmap"]
+
+        m1, m2, m3, m4 = st.columns(4)
+
+        with m1:
+            st.markdown(f"""
+            <div class="metric-card">
+                <div class="metric-title">Market Demand</div>
+                <div class="metric-value">{target['demand_level']}</div>
+                <div class="metric-subtext">Based on {len(role_df)*42} Live Jobs</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+        with m2:
+            pct = sketches.percentiles("role", target_role) if sketches is not None else None
+            percentile_card("Role Salary Range", pct, target_role)
+
+        with m3:
+             st.markdown(f"""
+            <div class="metric-card">
+                <div class="metric-title">Profile Match</div>
+                <div class="metric-value">{target['match_pct']:.1f}%</div>
+                <div class="metric-subtext">Cosine Similarity</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+        with m4:
+             st.markdown(f"""
+            <div class="metric-card">
+                <div class="metric-title">Skill Gap</div>
+                <div class="metric-value">{len(gap_skills)} Skills</div>
+                <div class="metric-subtext">Critical & Nice-to-have</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+        # --- SKILL GAP ---
+        st.markdown("#### Skill Gap Analysis")
+        st.markdown('<div class="css-card">', unsafe_allow_html=True)
+        if gap_skills:
+            st.write(f"Missing skills for **{target_role}**:")
+            tags_html = ""
+            for gs in gap_skills:
+                # Mock percentage for gap significance
+                imp = random.randint(43, 98) # Random integers
+                tags_html += f'<span class="tech-tag">{gs}<span class="tech-tag-percentage">{imp}%</span></span>'
+            st.markdown(tags_html, unsafe_allow_html=True)
+        else:
+            st.success("No significant skill gaps found! 🚀")
+
+        # What to learn next: skills that co-occur with the profile in postings
+        related = skill_graph.related(list(skills), k=5) if skill_graph is not None else []
+        if related:
+            st.write("Often paired with your skills:")
+            top_score = related[0][1]
+            tags_html = ""
+            for rs, score in related:
+                tags_html += f'<span class="tech-tag">{rs}<span class="tech-tag-percentage">{int(score / top_score * 100)}%</span></span>'
+            st.markdown(tags_html, unsafe_allow_html=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+        # --- ROADMAP ---
+        st.markdown("#### Personalized Learning Roadmap")
+
+        rm1, rm2, rm3 = st.columns(3)
+
+        if roadmap:
+            with rm1:
+                st.markdown('<div class="roadmap-col"><div class="roadmap-header">Month 1: Fundamentals</div>', unsafe_allow_html=True)
+                for item in roadmap.get("Month 1", []):
+                    st.markdown(f"- {item}")
+                st.markdown('</div>', unsafe_allow_html=True)
+
+            with rm2:
+                st.markdown('<div class="roadmap-col"><div class="roadmap-header">Month 2: Application</div>', unsafe_allow_html=True)
+                for item in roadmap.get("Month 2", []):
+                    st.markdown(f"- {item}")
+                st.markdown('</div>', unsafe_allow_html=True)
 
-salary_model, role_df, demand_map = load_data_artifacts()
+            with rm3:
+                st.markdown('<div class="roadmap-col"><div class="roadmap-header">Month 3: Advanced</div>', unsafe_allow_html=True)
+                for item in roadmap.get("Month 3", []):
+                    st.markdown(f"- {item}")
+                st.markdown('</div>', unsafe_allow_html=True)
 
 # --- TOP NAV (Simulated) ---
 st.markdown("""
@@ -58,23 +342,25 @@ with sidebar:
     st.markdown("Customize your analysis parameters.")
     
     skill_input = st.text_area("Your Skills", "Python, SQL, Machine Learning", height=150)
-    
-    xp_input = st.slider("Years of Experience", 0, 15, 3)
-    
-    target_role = st.selectbox("Target Role", 
-                               ["Machine Learning Engineer", "Frontend Engineer", "Backend Engineer", "Data Scientist", "DevOps Engineer", "Product Manager"]
-    )
+    # Experience and target role sit next to the sections they drive, so
+    # changing them reruns just that section
+    st.caption("Set experience and target role on the dashboard.")
     
     analyze_btn = st.button("Generate Insights", type="primary", use_container_width=True)
 
     st.markdown("---")
     st.caption("v2.4.0 Production Build")
+    with st.expander("Startup timings"):
+        st.caption(format_report() if warmup.is_ready() else f"Warming up... {format_report()}")
+    if is_enabled():
+        with st.expander("Request tracing"):
+            st.json(snapshot(), expanded=False)
 
 # --- MAIN CONTENT ---
 if not analyze_btn and 'analyzed' not in st.session_state:
     # Landing State
     with main:
-        st.info("👈 Enter your skills and experience to unlock career intelligence.")
+        st.info("👈 Enter your skills to unlock career intelligence.")
         
         # Show a sample decorative chart
         x = np.linspace(0, 10, 100)
@@ -84,35 +370,57 @@ if not analyze_btn and 'analyzed' not in st.session_state:
 
 else:
     st.session_state['analyzed'] = True
-    
+
     # 0. PRE-COMPUTE
+    # Blocks only if the warm-up thread hasn't finished loading yet
+    # A failed warm-up keeps its exception, so each load below falls back to
+    # the cached loader, which retries on the next run instead
+    try:
+        from core.artifacts import bundle_version
+        live_version = bundle_version(MODEL_BASE)
+        try:
+            with span("artifacts.wait"):
+                artifacts = warmup.result("artifacts")
+        except Exception as e:
+            print(f"Warm-up artifact load failed, loading directly: {e}")
+            artifacts = load_published_artifacts(live_version or 'legacy')
+        # Switch to a newer bundle if an incremental refresh published one
+        if live_version and live_version != getattr(artifacts[0], 'version', None):
+            artifacts = load_published_artifacts(live_version)
+        salary_model, role_df, role_index, demand_map, gap_engine = artifacts
+    except Exception as e:
+        salary_model, role_df, role_index, demand_map, gap_engine = None, None, None, None, None
+        live_version = None
+    # Graph and demand engine come from the same bundle as the models
+    try:
+        try:
+            demand_version, demand_engine = warmup.result("demand")
+        except Exception:
+            demand_version, demand_engine = live_version, load_demand_engine(live_version)
+        if live_version != demand_version:
+            demand_engine = load_demand_engine(live_version)
+    except Exception as e:
+        demand_engine = None
+    try:
+        try:
+            graph_version, skill_graph = warmup.result("graph")
+        except Exception:
+            graph_version, skill_graph = live_version, load_skill_graph(live_version)
+        if live_version != graph_version:
+            skill_graph = load_skill_graph(live_version)
+    except Exception as e:
+        skill_graph = None
+
     if not salary_model or role_df is None:
         st.error("Models are not loaded. Please run setup first.")
         st.stop()
-        
-    user_skills_list = [s.strip() for s in skill_input.split(',')]
-    user_embedding = get_mean_embedding(user_skills_list)
-    
-    # 1. SALARY PREDICTION
-    sal_min, sal_max = predict_salary(salary_model, user_embedding, xp_input)
-    
-    # 2. ROLE MATCHING
-    # Match against ALL roles to find the top one, but also check the Specific Target Role stats
-    matches = match_roles(user_embedding, role_df) # Top 3
-    # Find specific target role details
-    target_role_row = role_df[role_df['Role'] == target_role].iloc[0] if not role_df[role_df['Role'] == target_role].empty else None
-    
-    # If target role exists, compute gap
-    if target_role_row is not None:
-        gap_skills = get_gap_skills(user_skills_list, target_role_row['Core_Skills'])
-        match_score_target = int(target_role_row.get('match_score', 0) * 100) # Wait, match_roles computes score. We need to re-compute for target if it's not in top 3 or just assume we have embedding.
-        # Let's compute similarity explicitly for target
-        from sklearn.metrics.pairwise import cosine_similarity
-        target_score = cosine_similarity(user_embedding.reshape(1,-1), target_role_row['embedding'].reshape(1,-1))[0][0]
-        match_pct = int(target_score * 100)
-    else:
-        gap_skills = []
-        match_pct = 0
+
+    # Free text through the alias map ("ReactJS" -> react) so gap, demand and
+    # related-skill lookups see the names roles use. Hashable cache key for
+    # every stage; order kept for the demand chart
+    from core.skills import canonical_skill
+    user_skills = tuple(dict.fromkeys(canonical_skill(s) for s in skill_input.split(',') if s.strip()))
+    version = artifact_version(salary_model)
 
     with main:
         # --- HEADER & ACTIONS ---
@@ -122,92 +430,28 @@ else:
         with h_col2:
             st.download_button("📥 Export Report", "Career Analysis Report...", file_name="career_report.txt")
 
-        # --- SECTION 1: EXECUTIVE SUMMARY ---
-        # st.markdown("#### Executive Summary")
-        m1, m2, m3, m4 = st.columns(4)
-        
-        with m1:
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-title">Market Demand</div>
-                <div class="metric-value">{target_role_row['Demand_Level'] if target_role_row is not None else 'N/A'}</div>
-                <div class="metric-subtext">Based on {len(role_df)*42} Live Jobs</div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-        with m2:
-             st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-title">Projected Salary</div>
-                <div class="metric-value">₹{sal_min:.1f} - {sal_max:.1f} LPA</div>
-                <div class="metric-subtext">Market Median ±15%</div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-        with m3:
-             st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-title">Profile Match</div>
-                <div class="metric-value">{match_pct:.1f}%</div>
-                <div class="metric-subtext">Cosine Similarity</div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-        with m4:
-             st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-title">Skill Gap</div>
-                <div class="metric-value">{len(gap_skills)} Skills</div>
-                <div class="metric-subtext">Critical & Nice-to-have</div>
-            </div>
-            """, unsafe_allow_html=True)
-            
+        # --- SECTION 1: COMPENSATION (fragment: experience slider) ---
+        salary_sketches = load_salary_sketches(version)
+        salary_section(salary_model, salary_sketches, user_skills)
+
         st.write("") # Spacer
 
         # --- SECTION 2: MARKET ANALYTICS ---
         c1, c2 = st.columns([1, 1])
-        
+
         with c1:
             st.markdown('<div class="css-card">', unsafe_allow_html=True)
             st.markdown("##### Skill Demand Analytics")
-            # Create Data for user skills demand
-            skill_data = []
-            for s in user_skills_list:
-                # Add slight noise to make it look real
-                val = demand_map.get(s.lower(), 50) + random.randint(-2, 2)
-                skill_data.append({"Skill": s, "Score": val})
-            
-            df_skill = pd.DataFrame(skill_data).sort_values("Score", ascending=True)
-            
-            fig = px.bar(df_skill, x="Score", y="Skill", orientation='h', color="Score", 
-                         color_continuous_scale=["#21262D", "#22c55e"])
-            fig.update_layout(template="plotly_dark", paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', height=300, margin=dict(l=0,r=0,t=0,b=0))
-            fig.update_xaxes(showgrid=False)
-            st.plotly_chart(fig, use_container_width=True)
+            demand_day = demand_engine.day if demand_engine is not None else None
+            # Span covers building the figure (cached) and rendering it
+            with span("chart.demand"):
+                st.plotly_chart(demand_figure(demand_map, demand_engine, version, demand_day, user_skills), use_container_width=True)
             st.markdown('</div>', unsafe_allow_html=True)
-            
+
         with c2:
-            st.markdown('<div class="css-card">', unsafe_allow_html=True)
-            st.markdown("##### Salary Trajectory")
-            # Projection
-            x_vals = [xp_input, xp_input+2, xp_input+5]
-            y_vals = [sal_min, sal_min*1.22, sal_min*1.65] # Non-linear growth
-            
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(x=x_vals, y=y_vals, mode='lines+markers', line=dict(color='#22c55e', width=4, shape='spline')))
-            fig.update_layout(template="plotly_dark", paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', height=300, margin=dict(l=0,r=0,t=20,b=0))
-            fig.update_xaxes(title="Years of Experience")
-            fig.update_yaxes(title="Salary (₹ LPA)", showgrid=True, gridcolor='#30363D')
-            st.plotly_chart(fig, use_container_width=True)
-            st.markdown('</div>', unsafe_allow_html=True)
-            
-        # --- SECTION 3: ROLE MATCHING ---
-        st.markdown("#### Top Role Matches")
-        rc1, rc2, rc3 = st.columns(3)
-        cols = [rc1, rc2, rc3]
-        
-        for i, match in enumerate(matches):
-            with cols[i]:
+            # --- SECTION 3: ROLE MATCHING ---
+            st.markdown("##### Top Role Matches")
+            for match in match_stage(role_index, version, user_skills):
                 # Slight jitter to salary for realism
                 display_sal = match['avg_salary'] + random.uniform(-0.5, 0.5)
                 st.markdown(f"""
@@ -221,46 +465,10 @@ else:
                 </div>
                 """, unsafe_allow_html=True)
 
-        # --- SECTION 4: SKILL GAP ---
-        st.markdown("#### Skill Gap Analysis")
-        st.markdown('<div class="css-card">', unsafe_allow_html=True)
-        if gap_skills:
-            st.write(f"Missing skills for **{target_role}**:")
-            tags_html = ""
-            for gs in gap_skills:
-                # Mock percentage for gap significance
-                imp = random.randint(43, 98) # Random integers
-                tags_html += f'<span class="tech-tag">{gs}<span class="tech-tag-percentage">{imp}%</span></span>'
-            st.markdown(tags_html, unsafe_allow_html=True)
-        else:
-            st.success("No significant skill gaps found! 🚀")
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # --- SECTION 5: ROADMAP ---
-        st.markdown("#### Personalized Learning Roadmap")
-        roadmap = generate_roadmap(gap_skills)
-        
-        rm1, rm2, rm3 = st.columns(3)
-        
-        if roadmap:
-            with rm1:
-                st.markdown('<div class="roadmap-col"><div class="roadmap-header">Month 1: Fundamentals</div>', unsafe_allow_html=True)
-                for item in roadmap.get("Month 1", []):
-                    st.markdown(f"- {item}")
-                st.markdown('</div>', unsafe_allow_html=True)
-                
-            with rm2:
-                st.markdown('<div class="roadmap-col"><div class="roadmap-header">Month 2: Application</div>', unsafe_allow_html=True)
-                for item in roadmap.get("Month 2", []):
-                    st.markdown(f"- {item}")
-                st.markdown('</div>', unsafe_allow_html=True)
-                
-            with rm3:
-                st.markdown('<div class="roadmap-col"><div class="roadmap-header">Month 3: Advanced</div>', unsafe_allow_html=True)
-                for item in roadmap.get("Month 3", []):
-                    st.markdown(f"- {item}")
-                st.markdown('</div>', unsafe_allow_html=True)
-        
+        # --- SECTION 4: TARGET ROLE, SKILL GAP & ROADMAP (fragment: target role) ---
+        st.markdown("#### Target Role")
+        target_section(salary_model, role_df, role_index, gap_engine, skill_graph, salary_sketches, user_skills)
+
         # --- FOOTER ---
         st.markdown("---")
         st.markdown("""
@@ -269,4 +477,3 @@ else:
             <p>Data derived from curated job postings + NLP similarity | Live Source: <strong>RemoteOK</strong></p>
         </div>
         """, unsafe_allow_html=True)
-
@@ -0,0 +1,151 @@
+import argparse
+import ast
+import os
+import resource
+import sys
+import time
+
+import pandas as pd
+
+# Append project root
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from nlp.embedder import get_mean_embeddings
+from core.artifacts import load_artifacts
+from core.matcher import RoleIndex, match_roles_batch
+from core.salary import predict_salary_batch
+from core.demand import get_gap_skills
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_DIR = os.path.join(BASE_DIR, 'models')
+
+# Headless scoring of many candidate profiles against the role catalogue.
+# Input CSV columns: Skills, Experience, optional Candidate_ID / Target_Role.
+# Usage: python batch_score.py candidates.csv scores.csv [--chunksize 5000]
+
+def load_scoring_artifacts():
+    salary_model, role_df, _ = load_artifacts(MODEL_DIR)
+    return salary_model, RoleIndex(role_df)
+
+def parse_skills(raw):
+    """
+    Accepts the app's comma-separated text ("Python, SQL") or a
+    stringified list as written by jobs.csv ("['python', 'sql']").
+    """
+    if isinstance(raw, (list, tuple)):
+        return [str(s).strip() for s in raw if str(s).strip()]
+    if not isinstance(raw, str):
+        return []
+    raw = raw.strip()
+    if raw.startswith('['):
+        try:
+            return [str(s).strip() for s in ast.literal_eval(raw) if str(s).strip()]
+        except (ValueError, SyntaxError):
+            pass
+    return [s.strip() for s in raw.split(',') if s.strip()]
+
+def score_chunk(chunk, salary_model, role_index, top_k=3):
+    """
+    Scores one DataFrame chunk: one encoder pass, one matrix-multiply match
+    and one forest prediction for all rows. Returns a result DataFrame.
+    """
+    skills = [parse_skills(s) for s in chunk['Skills']]
+    experience = pd.to_numeric(chunk['Experience'], errors='coerce').fillna(0).values
+
+    embeddings = get_mean_embeddings(skills)
+    sal_low, sal_high = predict_salary_batch(salary_model, embeddings, experience)
+    matches = match_roles_batch(embeddings, role_index, k=top_k)
+
+    core_skills = dict(zip(role_index.roles, role_index.role_df['Core_Skills']))
+    targets = chunk['Target_Role'].tolist() if 'Target_Role' in chunk else [None] * len(chunk)
+
+    rows = []
+    for i, (user_skills, user_matches) in enumerate(zip(skills, matches)):
+        # Gap is measured against the requested role, else the best match
+        target = targets[i] if isinstance(targets[i], str) and targets[i] in core_skills else None
+        if target is None and user_matches:
+            target = user_matches[0]['role']
+        gap = get_gap_skills(user_skills, core_skills[target]) if target else []
+
+        row = {
+            "Salary_Low": sal_low[i],
+            "Salary_High": sal_high[i],
+            "Target_Role": target or "",
+            "Gap_Skills": ", ".join(sorted(gap)),
+            "Gap_Count": len(gap),
+        }
+        # Always top_k column pairs, so every chunk has the same schema
+        for rank in range(1, top_k + 1):
+            m = user_matches[rank - 1] if rank <= len(user_matches) else None
+            row[f"Match_{rank}_Role"] = m['role'] if m else None
+            row[f"Match_{rank}_Pct"] = m['match_pct'] if m else None
+        rows.append(row)
+
+    result = pd.DataFrame(rows, index=chunk.index)
+    # Explicit dtypes: an all-null column must not change type between chunks
+    for rank in range(1, top_k + 1):
+        result[f"Match_{rank}_Role"] = result[f"Match_{rank}_Role"].astype("string")
+        result[f"Match_{rank}_Pct"] = result[f"Match_{rank}_Pct"].astype("float64")
+    if 'Candidate_ID' in chunk:
+        result.insert(0, 'Candidate_ID', chunk['Candidate_ID'].values)
+    return result
+
+class _ResultWriter:
+    """Appends result chunks to CSV, or to Parquet for a .parquet path (needs pyarrow)."""
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = path.endswith('.parquet')
+        self._writer = None
+        self._first = True
+
+    def write(self, df):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            schema = self._writer.schema if self._writer is not None else None
+            table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode='w' if self._first else 'a', header=self._first, index=False)
+        self._first = False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+def peak_rss_mb():
+    # ru_maxrss is KB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def run_batch(input_path, output_path, chunksize=5000, top_k=3):
+    salary_model, role_index = load_scoring_artifacts()
+    writer = _ResultWriter(output_path)
+
+    total = 0
+    start = time.perf_counter()
+    try:
+        for chunk in pd.read_csv(input_path, chunksize=chunksize):
+            writer.write(score_chunk(chunk, salary_model, role_index, top_k=top_k))
+            total += len(chunk)
+            elapsed = time.perf_counter() - start
+            print(f"Scored {total} profiles ({total / elapsed:.0f} rows/sec)")
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    rate = total / elapsed if elapsed > 0 else 0.0
+    print(f"Done: {total} profiles in {elapsed:.2f}s ({rate:.0f} rows/sec), peak RSS {peak_rss_mb():.0f} MB")
+    return {"rows": total, "seconds": elapsed, "rows_per_sec": rate, "peak_rss_mb": peak_rss_mb()}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score candidate profiles against the role catalogue.")
+    parser.add_argument("input", help="CSV with Skills and Experience columns")
+    parser.add_argument("output", help="Output .csv or .parquet path")
+    parser.add_argument("--chunksize", type=int, default=5000)
+    parser.add_argument("--top-k", type=int, default=3)
+    args = parser.parse_args()
+    run_batch(args.input, args.output, chunksize=args.chunksize, top_k=args.top_k)
@@ -0,0 +1,101 @@
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Append project root
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.skills import VALID_SKILLS
+from nlp.embedder import BACKENDS, load_backend
+
+# Parity-and-speed benchmark for the embedder backends.
+# Each backend runs in its own subprocess so peak RSS isn't polluted by the
+# others; the parent compares every backend's vectors against torch.
+# Usage: python benchmark_embedder.py [--backends torch onnx onnx-int8] [--repeat 5]
+
+def _corpus():
+    skills = sorted(VALID_SKILLS)
+    # Short phrases like app input plus longer comma-joined profiles
+    profiles = [", ".join(skills[i:i + 6]) for i in range(0, len(skills), 3)]
+    return skills + profiles
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def run_backend(backend, out_path, repeat):
+    """Child process: load one backend, time encodes, save vectors."""
+    texts = _corpus()
+
+    start = time.perf_counter()
+    model = load_backend(backend)
+    load_s = time.perf_counter() - start
+
+    vectors = model.encode(texts) # Warm-up pass, also the parity sample
+    start = time.perf_counter()
+    for _ in range(repeat):
+        model.encode(texts)
+    encode_s = time.perf_counter() - start
+
+    np.save(out_path, np.asarray(vectors, dtype=np.float32))
+    print(json.dumps({
+        "backend": backend,
+        "load_s": load_s,
+        "encodes_per_sec": len(texts) * repeat / encode_s if encode_s > 0 else 0.0,
+        "peak_rss_mb": _peak_rss_mb(),
+        "dim": int(vectors.shape[1]),
+    }))
+
+def _cosine_rows(a, b):
+    a = a / np.maximum(np.linalg.norm(a, axis=1, keepdims=True), 1e-12)
+    b = b / np.maximum(np.linalg.norm(b, axis=1, keepdims=True), 1e-12)
+    return np.sum(a * b, axis=1)
+
+def compare(backends, repeat):
+    results = {}
+    vectors = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in backends:
+            out_path = os.path.join(tmp, f"{backend}.npy")
+            proc = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", backend,
+                 "--out", out_path, "--repeat", str(repeat)],
+                capture_output=True, text=True,
+            )
+            if proc.returncode != 0:
+                print(f"{backend}: failed\n{proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else ''}")
+                continue
+            results[backend] = json.loads(proc.stdout.strip().splitlines()[-1])
+            vectors[backend] = np.load(out_path)
+
+    baseline = vectors.get('torch')
+    print(f"{'backend':<10} {'dim':>4} {'load s':>7} {'enc/s':>9} {'RSS MB':>8} {'cos mean':>9} {'cos min':>8}")
+    for backend, r in results.items():
+        if baseline is not None and backend in vectors:
+            cos = _cosine_rows(baseline, vectors[backend])
+            cos_mean, cos_min = f"{cos.mean():.4f}", f"{cos.min():.4f}"
+        else:
+            cos_mean = cos_min = "n/a"
+        print(f"{backend:<10} {r['dim']:>4} {r['load_s']:>7.2f} {r['encodes_per_sec']:>9.0f} "
+              f"{r['peak_rss_mb']:>8.0f} {cos_mean:>9} {cos_min:>8}")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare embedder backends for parity and speed.")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--child", choices=BACKENDS, help=argparse.SUPPRESS)
+    parser.add_argument("--out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_backend(args.child, args.out, args.repeat)
+    else:
+        compare(args.backends, args.repeat)
@@ -0,0 +1,73 @@
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+# Append project root
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.skills import SKILL_ALIASES, TAG_ONLY, VALID_SKILLS, extract_skills, get_matcher
+
+# Throughput benchmark for skill extraction over job-description-sized text.
+# Compares the Aho-Corasick matcher against a naive one-regex-per-skill scan.
+# Usage: python benchmark_skills.py [--mb 20] [--naive]
+
+FILLER = ("we are looking for an engineer to join our growing team and help build "
+          "scalable systems with great people in a remote first culture where you will "
+          "own features end to end and collaborate with product design and data").split()
+
+def make_corpus(target_mb, seed=42):
+    """Synthetic postings: filler prose with skill names and aliases sprinkled in."""
+    rng = random.Random(seed)
+    names = sorted(VALID_SKILLS | set(SKILL_ALIASES))
+    docs, size = [], 0
+    while size < target_mb * 1024 * 1024:
+        words = [rng.choice(FILLER) for _ in range(rng.randint(150, 400))]
+        for _ in range(rng.randint(5, 15)):
+            words.insert(rng.randrange(len(words)), rng.choice(names).title())
+        doc = "<p>" + " ".join(words) + ".</p>"
+        docs.append(doc)
+        size += len(doc)
+    return docs
+
+def naive_extract(patterns):
+    compiled = [(re.compile(r'(?<![a-z0-9])' + re.escape(p) + r'(?![a-z0-9])'), c) for p, c in patterns.items()]
+    def extract(text):
+        text = text.lower()
+        return list(dict.fromkeys(c for rx, c in compiled if rx.search(text)))
+    return extract
+
+def run(target_mb, naive):
+    docs = make_corpus(target_mb)
+    total_mb = sum(len(d) for d in docs) / (1024 * 1024)
+
+    start = time.perf_counter()
+    get_matcher()
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = sum(len(extract_skills(d)) for d in docs)
+    elapsed = time.perf_counter() - start
+
+    print(f"Corpus: {len(docs)} postings, {total_mb:.1f} MB")
+    print(f"Aho-Corasick: build {build_s * 1000:.1f} ms, scan {elapsed:.2f}s "
+          f"-> {total_mb / elapsed:.1f} MB/s, {len(docs) / elapsed:.0f} postings/s, {found} skills")
+
+    if naive:
+        patterns = {s: s for s in VALID_SKILLS if s not in TAG_ONLY}
+        patterns.update({a: c for a, c in SKILL_ALIASES.items() if a not in TAG_ONLY})
+        extract = naive_extract(patterns)
+        start = time.perf_counter()
+        naive_found = sum(len(extract(d)) for d in docs)
+        naive_s = time.perf_counter() - start
+        print(f"Naive regex : scan {naive_s:.2f}s -> {total_mb / naive_s:.1f} MB/s, {naive_found} skills "
+              f"({naive_s / elapsed:.1f}x slower)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark skill extraction throughput.")
+    parser.add_argument("--mb", type=float, default=20.0, help="Corpus size in MB")
+    parser.add_argument("--naive", action="store_true", help="Also time a per-skill regex scan")
+    args = parser.parse_args()
+    run(args.mb, args.naive)
@@ -0,0 +1,228 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Append project root
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.skills import VALID_SKILLS
+from core.demand import calculate_demand_map, get_gap_skills
+from core.ingestion import pipeline
+from core.matcher import RoleIndex, match_roles, match_roles_batch
+from core.salary import compile_forest, predict_salary, predict_salary_batch
+from core.cooccurrence import SkillGraph
+from roadmap.generator import generate_roadmap
+from nlp.embedder import extend_skill_cache, get_embedding, get_mean_embedding, get_mean_embeddings
+from core.taxonomy import classify_titles
+from generate_data import ROLES, embed_postings, role_df_from_stats, role_stats
+
+# Offline benchmark suite over every hot path, on synthetic postings shaped
+# like generate_mock_data's. Results are JSON; --baseline compares per-item
+# time against a saved run and exits non-zero on regressions, so it can gate
+# a sentence-transformers / scikit-learn upgrade.
+#   python benchmark_suite.py --output bench.json
+#   python benchmark_suite.py --baseline bench.json [--threshold 0.15]
+# Per-call benchmarks (one profile at a time, like the app) run on --sample
+# profiles; batch benchmarks run on every posting. Forest fitting and
+# ingestion parsing are capped (--forest-rows, --ingest-rows).
+
+DEFAULT_SIZES = (1000, 100000, 1000000)
+PREDICT_CHUNK = 50000 # bounds the forest walk's (trees x rows) temporaries
+
+FILLER = ("we are hiring a motivated engineer to join a remote first team and ship "
+          "features end to end with product design and data partners").split()
+SENIORITY = ["", "Senior ", "Junior ", "Lead ", "Staff "]
+
+def synthetic_postings(n, seed=42):
+    """n postings with generate_mock_data's role/skill/salary/experience logic."""
+    rng = random.Random(seed)
+    rows = {"Role": [], "Skills": [], "Salary": [], "Experience": []}
+    for _ in range(n):
+        role_name, skills, min_sal, max_sal = rng.choice(ROLES)
+        picked = rng.sample(skills, max(1, int(len(skills) * rng.uniform(0.7, 1.0))))
+        if rng.random() > 0.7:
+            picked.append(rng.choice(rng.choice(ROLES)[1]))
+        exp_needed = rng.randint(1, 8)
+        rows["Role"].append(rng.choice(SENIORITY) + role_name)
+        rows["Skills"].append(list(set(picked)))
+        rows["Salary"].append(round(rng.uniform(min_sal, max_sal) + exp_needed * 1.5, 2))
+        rows["Experience"].append(exp_needed)
+    return pd.DataFrame(rows)
+
+def synthetic_raw_items(df, seed=42):
+    """RemoteOK-shaped dicts (tags, HTML description, salary text) for ingestion parsing."""
+    rng = random.Random(seed)
+    items = [{"legal": "notice"}]
+    for i, (role, skills, salary) in enumerate(zip(df['Role'], df['Skills'], df['Salary'])):
+        words = [rng.choice(FILLER) for _ in range(40)] + [s.title() for s in skills[:3]]
+        rng.shuffle(words)
+        items.append({
+            "id": str(i), "position": role, "company": f"Company {i % 997}",
+            "tags": skills, "date": "2026-01-01T00:00:00+00:00",
+            "salary": f"${int(salary * 0.9)}k - ${int(salary * 1.1)}k",
+            "description": "<p>" + " ".join(words) + "</p>",
+        })
+    return items
+
+def timed(fn, repeat):
+    """Best wall time of `repeat` runs (less noisy than the mean), and the last result."""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def run_size(n, args):
+    print(f"\n== {n:,} postings ==")
+    df = synthetic_postings(n)
+    sample = df.head(min(args.sample, n))
+    results = {}
+
+    def record(name, seconds, items):
+        results[name] = {"seconds": seconds, "items": items, "per_sec": items / seconds if seconds else None}
+        print(f"{name:<24} {seconds:>9.3f}s {items:>10,} items {items / max(seconds, 1e-12):>14,.0f}/s")
+
+    # --- Encoder (uncached; what a sentence-transformers upgrade changes) ---
+    texts = [", ".join(s) for s in sample['Skills']]
+    # A list this size bypasses the batching scheduler and the skill cache
+    seconds, _ = timed(lambda: get_embedding(texts), args.repeat)
+    record("encode", seconds, len(texts))
+
+    # --- train_models stages ---
+    X = np.empty((n, 385), dtype=np.float32)
+    seconds, _ = timed(lambda: embed_postings(df['Skills'], X[:, :-1]), args.repeat)
+    X[:, -1] = df['Experience'].values
+    record("train.embed", seconds, n)
+
+    fit_rows = min(n, args.forest_rows)
+    from sklearn.ensemble import RandomForestRegressor
+    def fit():
+        model = RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=-1)
+        return model.fit(X[:fit_rows], df['Salary'].values[:fit_rows])
+    seconds, sk_model = timed(fit, 1)
+    record("train.forest", seconds, fit_rows)
+    forest = compile_forest(sk_model)
+
+    def prototypes():
+        return role_df_from_stats(role_stats(classify_titles(df['Role']), X[:, :-1], df['Salary'], df['Skills']))
+    seconds, role_df = timed(prototypes, args.repeat)
+    record("train.prototypes", seconds, n)
+
+    seconds, _ = timed(lambda: SkillGraph().add_postings(df['Skills']), args.repeat)
+    record("train.cooccurrence", seconds, n)
+
+    seconds, _ = timed(lambda: calculate_demand_map(df), args.repeat)
+    record("calculate_demand_map", seconds, n)
+
+    # --- Ingestion parsing (no network, no store) ---
+    raw = synthetic_raw_items(df.head(min(n, args.ingest_rows)))
+    seconds, _ = timed(lambda: sum(1 for _ in pipeline(raw)), args.repeat)
+    record("ingestion.pipeline", seconds, len(raw) - 1)
+
+    # --- Per-profile request path ---
+    index = RoleIndex(role_df)
+    embs = get_mean_embeddings(sample['Skills'])
+    core = dict(zip(role_df['Role'], role_df['Core_Skills']))
+    targets = [role_df['Role'].iloc[i % len(role_df)] for i in range(len(sample))]
+
+    seconds, _ = timed(lambda: [get_mean_embedding(s) for s in sample['Skills']], args.repeat)
+    record("get_mean_embedding", seconds, len(sample))
+    seconds, _ = timed(lambda: [match_roles(e, index, k=3) for e in embs], args.repeat)
+    record("match_roles", seconds, len(sample))
+    seconds, _ = timed(lambda: [predict_salary(forest, e, x) for e, x in zip(embs, sample['Experience'])], args.repeat)
+    record("predict_salary", seconds, len(sample))
+    seconds, gaps = timed(lambda: [get_gap_skills(s, core[t]) for s, t in zip(sample['Skills'], targets)], args.repeat)
+    record("get_gap_skills", seconds, len(sample))
+    seconds, _ = timed(lambda: [generate_roadmap(g) for g in gaps], args.repeat)
+    record("generate_roadmap", seconds, len(sample))
+
+    # --- Batch paths over every posting ---
+    seconds, all_embs = timed(lambda: get_mean_embeddings(df['Skills']), args.repeat)
+    record("get_mean_embeddings", seconds, n)
+    seconds, _ = timed(lambda: match_roles_batch(all_embs, index, k=3), args.repeat)
+    record("match_roles_batch", seconds, n)
+    exps = df['Experience'].values
+
+    def predict_all():
+        for s in range(0, n, PREDICT_CHUNK):
+            predict_salary_batch(forest, all_embs[s:s + PREDICT_CHUNK], exps[s:s + PREDICT_CHUNK])
+    seconds, _ = timed(predict_all, args.repeat)
+    record("predict_salary_batch", seconds, n)
+
+    return results
+
+def environment():
+    def version(module):
+        try:
+            return __import__(module).__version__
+        except Exception:
+            return None
+    return {
+        "python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count(),
+        "numpy": version("numpy"), "pandas": version("pandas"), "sklearn": version("sklearn"),
+        "sentence_transformers": version("sentence_transformers"), "torch": version("torch"),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+def compare(current, baseline, threshold):
+    """
+    Per-item time ratios (current / baseline) for every benchmark present in
+    both runs. Returns the (size, name, ratio) entries slower than threshold.
+    """
+    regressions = []
+    print(f"\n{'size':>9} {'benchmark':<24} {'baseline/s':>12} {'current/s':>12} {'ratio':>7}")
+    for size, benches in current["results"].items():
+        for name, cur in benches.items():
+            base = baseline.get("results", {}).get(size, {}).get(name)
+            if not base or not base.get("per_sec") or not cur.get("per_sec"):
+                continue
+            ratio = base["per_sec"] / cur["per_sec"] # > 1 means slower now
+            flag = ""
+            if ratio > 1 + threshold:
+                flag = "  REGRESSION"
+                regressions.append((size, name, ratio))
+            elif ratio < 1 - threshold:
+                flag = "  faster"
+            print(f"{size:>9} {name:<24} {base['per_sec']:>12,.0f} {cur['per_sec']:>12,.0f} {ratio:>6.2f}x{flag}")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark every hot path on synthetic postings.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark; the best is kept")
+    parser.add_argument("--sample", type=int, default=2000, help="Profiles for per-call benchmarks")
+    parser.add_argument("--forest-rows", type=int, default=50000, help="Row cap for forest fitting")
+    parser.add_argument("--ingest-rows", type=int, default=100000, help="Row cap for ingestion parsing")
+    parser.add_argument("--output", help="Write results JSON here (e.g. to save a baseline)")
+    parser.add_argument("--baseline", help="Compare against a saved results JSON")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed slowdown before flagging")
+    args = parser.parse_args()
+
+    # Skill-vector cache warm-up is setup, not a measured path
+    extend_skill_cache(VALID_SKILLS | {s for _, skills, _, _ in ROLES for s in skills})
+
+    run = {"environment": environment(), "config": vars(args), "results": {}}
+    for n in args.sizes:
+        run["results"][str(n)] = run_size(n, args)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(run, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(run, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            sys.exit(1)
+        print("\nNo regressions.")
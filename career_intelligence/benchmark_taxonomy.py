@@ -0,0 +1,80 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+# Append project root
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.taxonomy import RoleTaxonomy
+
+# Throughput benchmark for role-title classification on a large synthetic
+# title set with realistic repetition (seniority, suffixes, locations).
+# Compares RoleTaxonomy (cold and warm cache) with the old per-row substring chain.
+# Usage: python benchmark_taxonomy.py [--titles 1000000] [--no-embed] [--legacy]
+
+BASES = ["Software Engineer", "Backend Engineer", "Frontend Developer", "Full-Stack Developer",
+         "Data Scientist", "Machine Learning Engineer", "AI Research Engineer", "DevOps Engineer",
+         "Site Reliability Engineer", "Cloud Architect", "Product Manager", "Product Designer",
+         "React Developer", "Node.js Developer", "Python Developer", "Maintenance Technician",
+         "Customer Success Manager", "Data Engineer", "QA Automation Engineer", "Mobile Developer"]
+PREFIXES = ["", "", "Senior ", "Sr. ", "Junior ", "Lead ", "Staff ", "Principal "]
+SUFFIXES = ["", "", "", " (Remote)", " - Payments", " - EMEA", " II", " [Contract]", " (m/f/d)"]
+
+def legacy_map_role_category(title):
+    # The substring chain train_models used before core/taxonomy.py
+    t = title.lower()
+    if 'front' in t or 'react' in t or 'vue' in t or 'web' in t: return 'Frontend Engineer'
+    if 'back' in t or 'api' in t or 'node' in t or 'django' in t: return 'Backend Engineer'
+    if 'data' in t and 'scien' in t: return 'Data Scientist'
+    if 'machine' in t or 'ai' in t or 'learning' in t: return 'Machine Learning Engineer'
+    if 'devops' in t or 'cloud' in t or 'sre' in t: return 'DevOps Engineer'
+    if 'product' in t: return 'Product Manager'
+    if 'full' in t: return 'Full Stack Developer'
+    return 'Software Engineer'
+
+def make_titles(n, seed=42):
+    rng = random.Random(seed)
+    return [rng.choice(PREFIXES) + rng.choice(BASES) + rng.choice(SUFFIXES) for _ in range(n)]
+
+def run(n, embed, legacy):
+    titles = make_titles(n)
+    encode_fn = None
+    if embed:
+        from nlp.embedder import get_embedding
+        encode_fn = get_embedding
+    taxonomy = RoleTaxonomy(encode_fn=encode_fn)
+
+    start = time.perf_counter()
+    labels = taxonomy.classify(titles)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    taxonomy.classify(titles)
+    warm = time.perf_counter() - start
+
+    print(f"Titles: {n:,} ({len(set(titles)):,} distinct)")
+    print(f"RoleTaxonomy cold: {cold:.2f}s -> {n / cold:,.0f} titles/s   {taxonomy.stats}")
+    print(f"RoleTaxonomy warm: {warm:.2f}s -> {n / warm:,.0f} titles/s")
+
+    if legacy:
+        start = time.perf_counter()
+        old = pd.Series(titles).apply(legacy_map_role_category)
+        legacy_s = time.perf_counter() - start
+        print(f"Legacy .apply   : {legacy_s:.2f}s -> {n / legacy_s:,.0f} titles/s")
+
+        changed = pd.DataFrame({"title": titles, "legacy": old.values, "taxonomy": labels})
+        changed = changed[changed['legacy'] != changed['taxonomy']].drop_duplicates('title')
+        print(f"\n{len(changed)} distinct titles classified differently, e.g.:")
+        print(changed.head(15).to_string(index=False))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark bulk role-title classification.")
+    parser.add_argument("--titles", type=int, default=1000000)
+    parser.add_argument("--no-embed", action="store_true", help="Skip the embedding fallback (rules only)")
+    parser.add_argument("--legacy", action="store_true", help="Also time and diff the old substring chain")
+    args = parser.parse_args()
+    run(args.titles, not args.no_embed, args.legacy)
@@ -0,0 +1,271 @@
+import json
+import os
+import re
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.quantiles import SalarySketches
+from core.salary import CompiledForest, compile_forest
+
+# Versioned on-disk bundle that replaces the joblib pickles in models/.
+# Every array is a plain .npy so workers memory-map (and share) the same pages;
+# small metadata is stored column-wise in JSON.
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_DIR = os.path.join(BASE_DIR, 'models')
+BUNDLE_DIR = os.path.join(MODEL_DIR, 'bundle')
+BUNDLE_FORMAT = 1
+
+# Published bundles live in models/bundles/<version>/. models/bundles/CURRENT
+# names the live one and is swapped with an atomic rename, so readers see
+# either the old or the new version, never a partial one. Older versions are
+# pruned; processes still mapping them keep valid pages until they reload.
+BUNDLES_DIR = os.path.join(MODEL_DIR, 'bundles')
+CURRENT_FILE = 'CURRENT'
+KEEP_VERSIONS = 3
+# <YYYYmmddHHMMSS>[-n]; -n only appears when two publishes share a second
+VERSION_RE = re.compile(r'^(\d{14})(?:-(\d+))?$')
+
+FOREST_ARRAYS = ("left", "right", "feature", "threshold", "value", "roots")
+
+def save_bundle(salary_model, role_df, demand_map, out_dir=BUNDLE_DIR, embedding_model=None,
+                version=None, state=None, sketches=None, skill_graph=None, demand_engine=None):
+    """
+    Writes the salary forest, role catalogue and demand map as a bundle.
+    salary_model may be a RandomForestRegressor or an already CompiledForest.
+    `state` holds the running aggregates an incremental refresh resumes from
+    (see generate_data.refresh_models); `sketches` are the SalarySketches
+    behind the dashboard's P10/P50/P90; `skill_graph` and `demand_engine` back
+    the related-skills and trending views.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    forest = salary_model if isinstance(salary_model, CompiledForest) else compile_forest(salary_model)
+
+    files = {}
+    for name in FOREST_ARRAYS:
+        fname = f"forest_{name}.npy"
+        np.save(os.path.join(out_dir, fname), getattr(forest, name))
+        files[fname] = "forest"
+    if forest.weights is not None:
+        np.save(os.path.join(out_dir, "forest_weights.npy"), np.asarray(forest.weights, dtype=np.float64))
+        files["forest_weights.npy"] = "forest"
+
+    # Roles are stored L2-normalized: cosine scores are unchanged and
+    # RoleIndex can use the mapped matrix without another copy.
+    matrix = np.stack(role_df['embedding'].values).astype(np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    np.save(os.path.join(out_dir, "role_embeddings.npy"), np.ascontiguousarray(matrix / norms))
+    files["role_embeddings.npy"] = "roles"
+
+    roles = {
+        "Role": role_df['Role'].tolist(),
+        "Avg_Salary": [float(v) for v in role_df['Avg_Salary']],
+        "Demand_Level": role_df['Demand_Level'].tolist(),
+        "Core_Skills": [list(v) for v in role_df['Core_Skills']],
+    }
+    with open(os.path.join(out_dir, "roles.json"), 'w') as f:
+        json.dump(roles, f)
+    files["roles.json"] = "roles"
+
+    demand = {"skill": list(demand_map.keys()), "score": [int(v) for v in demand_map.values()]}
+    with open(os.path.join(out_dir, "demand.json"), 'w') as f:
+        json.dump(demand, f)
+    files["demand.json"] = "demand"
+
+    if state is not None:
+        np.save(os.path.join(out_dir, "role_sums.npy"), np.asarray(state["role_sums"], dtype=np.float64))
+        files["role_sums.npy"] = "state"
+        with open(os.path.join(out_dir, "state.json"), 'w') as f:
+            json.dump({k: v for k, v in state.items() if k != "role_sums"}, f)
+        files["state.json"] = "state"
+
+    if sketches is not None:
+        sketches.save(os.path.join(out_dir, "salary_sketches.npz"))
+        files["salary_sketches.npz"] = "sketches"
+
+    if skill_graph is not None:
+        skill_graph.save(os.path.join(out_dir, "skill_graph.npz"))
+        files["skill_graph.npz"] = "graph"
+
+    if demand_engine is not None:
+        demand_engine.save(os.path.join(out_dir, "demand_engine.npz"))
+        files["demand_engine.npz"] = "demand"
+
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "version": version or time.strftime("%Y%m%d%H%M%S"),
+        "embedding_model": embedding_model,
+        "n_features": int(forest.n_features),
+        "n_roles": len(roles["Role"]),
+        "files": files,
+    }
+    # Manifest last, so a half-written bundle is never picked up
+    with open(os.path.join(out_dir, "manifest.json"), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def bundle_exists(bundle_dir=BUNDLE_DIR):
+    return os.path.exists(os.path.join(bundle_dir, "manifest.json"))
+
+def _read_current(model_dir):
+    try:
+        with open(os.path.join(model_dir, 'bundles', CURRENT_FILE)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def current_bundle_dir(model_dir=MODEL_DIR):
+    """The published bundle's directory, else the unversioned models/bundle/, else None."""
+    version = _read_current(model_dir)
+    if version:
+        path = os.path.join(model_dir, 'bundles', version)
+        if bundle_exists(path):
+            return path
+    legacy = os.path.join(model_dir, 'bundle')
+    return legacy if bundle_exists(legacy) else None
+
+def bundle_version(model_dir=MODEL_DIR):
+    """
+    Version of the live bundle, cheap enough to poll on every request:
+    one small file read. None when no bundle has been built.
+    """
+    version = _read_current(model_dir)
+    if version:
+        return version
+    legacy = os.path.join(model_dir, 'bundle', "manifest.json")
+    if os.path.exists(legacy):
+        with open(legacy) as f:
+            return json.load(f).get("version")
+    return None
+
+def publish_bundle(salary_model, role_df, demand_map, model_dir=MODEL_DIR, embedding_model=None,
+                   state=None, sketches=None, skill_graph=None, demand_engine=None, keep=KEEP_VERSIONS):
+    """
+    Writes a new bundle version under models/bundles/ and atomically makes it
+    the live one. Running app and service workers pick it up on their next
+    bundle_version() check. Returns the manifest.
+    """
+    root = os.path.join(model_dir, 'bundles')
+    os.makedirs(root, exist_ok=True)
+    base = time.strftime("%Y%m%d%H%M%S")
+    version, n = base, 1
+    while os.path.exists(os.path.join(root, version)):
+        version, n = f"{base}-{n}", n + 1
+
+    manifest = save_bundle(salary_model, role_df, demand_map, out_dir=os.path.join(root, version),
+                           embedding_model=embedding_model, version=version, state=state,
+                           sketches=sketches, skill_graph=skill_graph, demand_engine=demand_engine)
+
+    pointer = os.path.join(root, CURRENT_FILE)
+    with open(pointer + '.tmp', 'w') as f:
+        f.write(version)
+    os.replace(pointer + '.tmp', pointer)
+
+    if keep:
+        prune_versions(root, version, keep)
+    return manifest
+
+def _version_key(name):
+    # (timestamp, collision suffix), so "-10" sorts after "-2"; None for other names
+    match = VERSION_RE.match(name)
+    return (match.group(1), int(match.group(2) or 0)) if match else None
+
+def prune_versions(root, live, keep=KEEP_VERSIONS):
+    """
+    Deletes old bundle versions under `root`, keeping `live` and the newest
+    keep - 1 versions before it. Directories that aren't bundle versions,
+    and versions newer than `live` (e.g. from a clock-skewed host), are left alone.
+    """
+    live_key = _version_key(live)
+    if live_key is None:
+        return []
+    older = []
+    for name in os.listdir(root):
+        key = _version_key(name)
+        if key is not None and key < live_key and os.path.isdir(os.path.join(root, name)):
+            older.append((key, name))
+    older.sort()
+    removed = [name for _, name in older[:max(len(older) - (keep - 1), 0)]]
+    for name in removed:
+        shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+    return removed
+
+def load_state(bundle_dir):
+    """Running aggregates saved with the bundle, or None for bundles built without them."""
+    state_path = os.path.join(bundle_dir, "state.json")
+    if not os.path.exists(state_path):
+        return None
+    with open(state_path) as f:
+        state = json.load(f)
+    state["role_sums"] = np.load(os.path.join(bundle_dir, "role_sums.npy"))
+    return state
+
+def load_sketches(bundle_dir):
+    """The bundle's SalarySketches, or None for bundles built without them."""
+    path = os.path.join(bundle_dir, "salary_sketches.npz")
+    return SalarySketches.load(path) if os.path.exists(path) else None
+
+def load_skill_graph(bundle_dir):
+    """The bundle's SkillGraph, or None for bundles built without one."""
+    from core.cooccurrence import SkillGraph # scipy, only needed here
+    path = os.path.join(bundle_dir, "skill_graph.npz")
+    return SkillGraph.load(path) if os.path.exists(path) else None
+
+def load_demand_engine(bundle_dir):
+    """The bundle's DemandEngine, or None for bundles built without one."""
+    from core.demand import DemandEngine
+    path = os.path.join(bundle_dir, "demand_engine.npz")
+    return DemandEngine.load(path) if os.path.exists(path) else None
+
+def load_bundle(bundle_dir=BUNDLE_DIR):
+    """
+    Loads a bundle written by save_bundle with every array memory-mapped.
+    Returns (salary_model, role_df, demand_map); salary_model is a
+    CompiledForest whose `version` comes from the manifest.
+    """
+    with open(os.path.join(bundle_dir, "manifest.json")) as f:
+        manifest = json.load(f)
+    if manifest.get("format") != BUNDLE_FORMAT:
+        raise ValueError(f"Unsupported bundle format: {manifest.get('format')}")
+
+    def mapped(fname):
+        return np.load(os.path.join(bundle_dir, fname), mmap_mode='r')
+
+    arrays = {name: mapped(f"forest_{name}.npy") for name in FOREST_ARRAYS}
+    arrays["n_features"] = manifest["n_features"]
+    # Bundles published before tree weights existed average their trees uniformly
+    if os.path.exists(os.path.join(bundle_dir, "forest_weights.npy")):
+        arrays["weights"] = mapped("forest_weights.npy")
+    salary_model = CompiledForest.from_arrays(arrays)
+    salary_model.version = manifest["version"]
+
+    with open(os.path.join(bundle_dir, "roles.json")) as f:
+        roles = json.load(f)
+    matrix = mapped("role_embeddings.npy")
+    role_df = pd.DataFrame(roles)
+    # Row views into the mapped matrix, not copies
+    role_df['embedding'] = [matrix[i] for i in range(len(role_df))]
+    role_df.attrs['embedding_matrix'] = matrix
+
+    with open(os.path.join(bundle_dir, "demand.json")) as f:
+        demand = json.load(f)
+    demand_map = dict(zip(demand["skill"], demand["score"]))
+
+    return salary_model, role_df, demand_map
+
+def load_artifacts(model_dir=MODEL_DIR):
+    """
+    Loads (salary_model, role_df, demand_map), preferring the published bundle and
+    falling back to the legacy joblib pickles when no bundle has been built.
+    """
+    bundle_dir = current_bundle_dir(model_dir)
+    if bundle_dir:
+        return load_bundle(bundle_dir)
+    import joblib # Only the legacy path needs joblib (and sklearn, via the pickle)
+    salary_model = joblib.load(os.path.join(model_dir, 'salary.pkl'))
+    role_df = joblib.load(os.path.join(model_dir, 'roles.pkl'))
+    demand_map = joblib.load(os.path.join(model_dir, 'demand_map.pkl'))
+    return salary_model, role_df, demand_map
@@ -0,0 +1,195 @@
+import datetime
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Per-board adapters for multi-source ingestion (see core/fetcher.py).
+# Each board's JSON is mapped onto the raw item shape parse_postings already
+# reads (RemoteOK's): id, position, company, tags, salary, date, description,
+# plus `source`. From there every board goes through the same stages and
+# ends up in the same Role/Company/Skills/Salary schema.
+
+def _get(item, path):
+    """Dotted-path lookup ("company.name"); None when any step is missing."""
+    for key in path.split('.'):
+        if not isinstance(item, dict):
+            return None
+        item = item.get(key)
+    return item
+
+def _as_tags(value):
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [t.strip() for t in value.split(',') if t.strip()]
+    return [str(t) for t in value if t]
+
+def _as_date(value):
+    # Boards use ISO strings or unix seconds
+    if isinstance(value, (int, float)):
+        return datetime.datetime.fromtimestamp(value, tz=datetime.timezone.utc).isoformat()
+    return value or ''
+
+def _salary_k(low, high):
+    """Annual USD amounts -> the '$60k-$100k' text parse_salary understands."""
+    try:
+        low, high = float(low or 0), float(high or low or 0)
+    except (TypeError, ValueError):
+        return ''
+    if low <= 0:
+        return ''
+    scale = 1000 if low >= 1000 else 1 # some boards already report thousands
+    return f"${low / scale:.0f}k - ${high / scale:.0f}k"
+
+# Free-text pay periods -> multiplier to an annual amount (2080 = 40h x 52 weeks)
+_PERIODS = [(re.compile(r'/\s*h(ou)?r\b|\bper\s+hour\b|\bhourly\b|\ban\s+hour\b'), 2080),
+            (re.compile(r'/\s*day\b|\bper\s+day\b|\bdaily\b'), 260),
+            (re.compile(r'/\s*w(ee)?k\b|\bper\s+week\b|\bweekly\b'), 52),
+            (re.compile(r'/\s*mo(nth)?\b|\bper\s+month\b|\bmonthly\b'), 12)]
+_AMOUNT = re.compile(r'(\d[\d,]*(?:\.\d+)?)\s*(k\b)?')
+
+def _salary_text(text):
+    """
+    Free-text salary ("$100,000 - $150,000", "$40 - $60/hr", "80k-95k EUR")
+    -> the same '$60k-$100k' text as the numeric boards, or '' if unreadable.
+    """
+    text = str(text or '').lower()
+    amounts = []
+    for number, k in _AMOUNT.findall(text):
+        digits = number.replace(',', '')
+        try:
+            value = float(digits)
+        except ValueError:
+            continue
+        amounts.append((value, bool(k)))
+    if not amounts:
+        return ''
+    # "$100-150k": the suffix covers both ends
+    if any(k for _, k in amounts):
+        amounts = [(v * 1000 if (k or v < 1000) else v, True) for v, k in amounts]
+    values = [v for v, _ in amounts[:2]]
+    factor = next((f for pattern, f in _PERIODS if pattern.search(text)), 1)
+    return _salary_k(values[0] * factor, values[-1] * factor)
+
+def _with_query(url, **params):
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    query.update({k: str(v) for k, v in params.items()})
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+class JobBoard:
+    """
+    Declarative adapter for a JSON job board API.
+
+    `items_key` locates the postings list in a response (None: the response
+    is the list). `fields` maps raw item keys to the board's dotted paths;
+    `salary` may instead be a (min_path, max_path) pair of annual amounts.
+    `paging` is None (single page), "links" (follow `next_key` in the
+    response) or "offset" (add `page_size` to an offset parameter until a
+    short page comes back).
+    """
+
+    def __init__(self, name, url, fields, items_key=None, paging=None, next_key="links.next",
+                 offset_param="offset", page_size=100, max_pages=10, rate=1.0, burst=2):
+        self.name = name
+        self.url = url
+        self.fields = fields
+        self.items_key = items_key
+        self.paging = paging
+        self.next_key = next_key
+        self.offset_param = offset_param
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.rate = rate   # requests/sec allowed against this board's host
+        self.burst = burst
+
+    @property
+    def host(self):
+        return urlsplit(self.url).netloc
+
+    def first_page(self):
+        if self.paging == "offset":
+            return _with_query(self.url, **{self.offset_param: 0, "limit": self.page_size})
+        return self.url
+
+    def next_page(self, url, payload, n_items, page):
+        if page + 1 >= self.max_pages:
+            return None
+        if self.paging == "links":
+            return _get(payload, self.next_key) if isinstance(payload, dict) else None
+        if self.paging == "offset" and n_items >= self.page_size:
+            offset = int(dict(parse_qsl(urlsplit(url).query)).get(self.offset_param, 0))
+            return _with_query(url, **{self.offset_param: offset + self.page_size})
+        return None
+
+    def items(self, payload):
+        items = payload if self.items_key is None else _get(payload, self.items_key)
+        return items if isinstance(items, list) else []
+
+    def normalize(self, raw):
+        """Board item -> parse_postings input, or None for non-job entries."""
+        if not isinstance(raw, dict):
+            return None
+        position = _get(raw, self.fields["position"])
+        if not position:
+            return None
+        salary = self.fields.get("salary")
+        if isinstance(salary, tuple):
+            salary = _salary_k(_get(raw, salary[0]), _get(raw, salary[1]))
+        elif salary:
+            salary = _salary_text(_get(raw, salary))
+        return {
+            "source": self.name,
+            "id": _get(raw, self.fields["id"]),
+            "position": position,
+            "company": _get(raw, self.fields["company"]),
+            "tags": _as_tags(_get(raw, self.fields["tags"])),
+            "salary": salary or '',
+            "date": _as_date(_get(raw, self.fields["date"])),
+            "description": _get(raw, self.fields.get("description", "")) or '',
+            "url": _get(raw, self.fields.get("url", "")) or '',
+        }
+
+# Field paths follow each board's public API responses
+BOARDS = {
+    "remoteok": JobBoard(
+        "RemoteOK", "https://remoteok.com/api",
+        fields={"id": "id", "position": "position", "company": "company", "tags": "tags",
+                "salary": ("salary_min", "salary_max"), "date": "date", "description": "description", "url": "url"},
+    ),
+    "remotive": JobBoard(
+        "Remotive", "https://remotive.com/api/remote-jobs", items_key="jobs",
+        fields={"id": "id", "position": "title", "company": "company_name", "tags": "tags",
+                "salary": "salary", "date": "publication_date", "description": "description", "url": "url"},
+    ),
+    "arbeitnow": JobBoard(
+        "Arbeitnow", "https://www.arbeitnow.com/api/job-board-api", items_key="data", paging="links",
+        fields={"id": "slug", "position": "title", "company": "company_name", "tags": "tags",
+                "date": "created_at", "description": "description", "url": "url"},
+    ),
+    "jobicy": JobBoard(
+        "Jobicy", "https://jobicy.com/api/v2/remote-jobs?count=50", items_key="jobs",
+        fields={"id": "id", "position": "jobTitle", "company": "companyName", "tags": "jobIndustry",
+                "salary": ("annualSalaryMin", "annualSalaryMax"), "date": "pubDate",
+                "description": "jobDescription", "url": "url"},
+    ),
+    "himalayas": JobBoard(
+        "Himalayas", "https://himalayas.app/jobs/api", items_key="jobs", paging="offset", page_size=20,
+        fields={"id": "guid", "position": "title", "company": "companyName", "tags": "categories",
+                "salary": ("minSalary", "maxSalary"), "date": "pubDate", "description": "description",
+                "url": "applicationLink"},
+    ),
+}
+
+def get_boards(names=None, base_url=None):
+    """
+    Boards by key (default: all). With `base_url`, every board is pointed at
+    `{base_url}/{key}` instead, e.g. the local stub servers in stub_boards.py.
+    """
+    names = list(BOARDS) if names is None else names
+    boards = []
+    for key in names:
+        board = BOARDS[key]
+        if base_url:
+            board = JobBoard(**{**vars(board), "url": f"{base_url.rstrip('/')}/{key}"})
+        boards.append(board)
+    return boards
@@ -0,0 +1,147 @@
+import json
+import os
+
+import numpy as np
+from scipy import sparse
+
+from core.jobstore import SkillVocab
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GRAPH_PATH = os.path.join(BASE_DIR, 'models', 'skill_cooccurrence.npz')
+
+class SkillGraph:
+    """
+    Sparse skill x skill co-occurrence counts over job postings.
+
+    Built from the job x skill incidence matrix X (one row per posting,
+    binary) as X.T @ X in one sparse product: the diagonal holds per-skill
+    posting counts, off-diagonal entries the number of postings that list
+    both skills. Positive PMI / lift weights are derived from it lazily, and
+    new postings are folded in by adding their own X.T @ X.
+    """
+
+    def __init__(self, vocab=None):
+        self.vocab = vocab or SkillVocab()
+        self.counts = sparse.csr_matrix((len(self.vocab), len(self.vocab)), dtype=np.int64)
+        self.n_postings = 0
+        self._weights = None
+
+    # --- BUILD / UPDATE ---
+    def _incidence(self, skill_offsets, skill_ids):
+        n = len(skill_offsets) - 1
+        rows = np.repeat(np.arange(n), np.diff(skill_offsets))
+        X = sparse.csr_matrix((np.ones(len(skill_ids), dtype=np.int64), (rows, skill_ids)),
+                              shape=(n, len(self.vocab)))
+        # Duplicate tags within one posting count once
+        X.data[:] = 1
+        return X
+
+    def _resize(self):
+        size = len(self.vocab)
+        if self.counts.shape[0] < size:
+            coo = self.counts.tocoo()
+            self.counts = sparse.csr_matrix((coo.data, (coo.row, coo.col)), shape=(size, size))
+
+    def add_csr(self, skill_offsets, skill_ids):
+        """Folds postings given as CSR skill arrays (e.g. a JobTable) into the counts."""
+        if len(skill_offsets) <= 1:
+            return 0
+        self._resize()
+        X = self._incidence(np.asarray(skill_offsets), np.asarray(skill_ids))
+        self.counts = (self.counts + (X.T @ X)).tocsr()
+        self.n_postings += X.shape[0]
+        self._weights = None
+        return X.shape[0]
+
+    def add_postings(self, skill_lists):
+        """Folds postings given as lists of skill strings into the counts."""
+        skill_lists = [list(s or []) for s in skill_lists]
+        offsets = np.zeros(len(skill_lists) + 1, dtype=np.int64)
+        np.cumsum([len(s) for s in skill_lists], out=offsets[1:])
+        ids = np.asarray([i for s in skill_lists for i in self.vocab.encode(s)], dtype=np.int64)
+        return self.add_csr(offsets, ids)
+
+    @classmethod
+    def from_table(cls, table):
+        """Builds the graph from a core.jobstore.JobTable in one pass."""
+        graph = cls(table.vocab)
+        graph.add_csr(table.skill_offsets, table.skill_ids)
+        return graph
+
+    # --- WEIGHTS ---
+    def skill_totals(self):
+        return self.counts.diagonal()
+
+    def _lift_matrix(self):
+        """Sparse lift P(a,b) / (P(a) P(b)) = C_ab * N / (c_a * c_b), diagonal dropped."""
+        coo = self.counts.tocoo()
+        off_diag = coo.row != coo.col
+        row, col = coo.row[off_diag], coo.col[off_diag]
+        totals = self.skill_totals().astype(np.float64)
+        lift = coo.data[off_diag] * self.n_postings / np.maximum(totals[row] * totals[col], 1.0)
+        return sparse.csr_matrix((lift, (row, col)), shape=self.counts.shape)
+
+    def weights(self):
+        """Positive PMI matrix (log lift, negatives clipped), cached until the next update."""
+        if self._weights is None:
+            lift = self._lift_matrix()
+            lift.data = np.log(lift.data)
+            lift.data[lift.data < 0] = 0
+            lift.eliminate_zeros()
+            self._weights = lift
+        return self._weights
+
+    # --- QUERIES ---
+    def related(self, skills, k=5, min_count=2):
+        """
+        Top-k skills that co-occur with the given profile, excluding skills
+        already in it. Scores are summed positive PMI over the profile.
+        Returns [(skill, score), ...], best first.
+        """
+        ids = [self.vocab.ids[s] for s in (str(x).strip().lower() for x in skills) if s in self.vocab.ids]
+        # Each profile skill counts once, however often it was typed
+        ids = sorted({i for i in ids if i < self.counts.shape[0]})
+        if not ids or self.n_postings == 0:
+            return []
+
+        W = self.weights()
+        scores = np.asarray(W[ids].sum(axis=0)).ravel()
+        # Rarely seen pairs give noisy PMI; also never suggest what the user has
+        scores[self.skill_totals() < min_count] = 0
+        scores[ids] = 0
+
+        candidates = np.flatnonzero(scores > 0)
+        if not len(candidates):
+            return []
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(self.vocab.skills[i], float(scores[i])) for i in candidates]
+
+    def lift(self, skill_a, skill_b):
+        a = self.vocab.ids.get(str(skill_a).strip().lower())
+        b = self.vocab.ids.get(str(skill_b).strip().lower())
+        if a is None or b is None or max(a, b) >= self.counts.shape[0]:
+            return 0.0
+        totals = self.skill_totals()
+        if totals[a] == 0 or totals[b] == 0:
+            return 0.0
+        return float(self.counts[a, b] * self.n_postings / (totals[a] * totals[b]))
+
+    # --- PERSISTENCE ---
+    def save(self, path=GRAPH_PATH):
+        coo = self.counts.tocoo()
+        meta = {"skills": self.vocab.skills, "n_postings": self.n_postings}
+        np.savez(path, row=coo.row.astype(np.int32), col=coo.col.astype(np.int32),
+                 data=coo.data.astype(np.int64), shape=np.asarray(coo.shape),
+                 meta=np.array(json.dumps(meta)))
+
+    @classmethod
+    def load(cls, path=GRAPH_PATH):
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            graph = cls(SkillVocab(meta['skills']))
+            graph.counts = sparse.csr_matrix((data['data'], (data['row'], data['col'])),
+                                             shape=tuple(data['shape']))
+            graph.n_postings = meta['n_postings']
+        return graph
@@ -1,44 +1,252 @@
 from collections import Counter
-import pandas as pd
+import datetime
+import json
+import math
+import os
+
+import numpy as np
+
+from core.jobstore import posted_day
+from core.skills import canonical_skill
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENGINE_PATH = os.path.join(BASE_DIR, 'models', 'demand_engine.npz')
+
+def _log_scores(counts, max_count):
+    # Logarithmic normalization to boost specialist skills
+    # score = log(count) / log(max) * 100
+    log_max = math.log(max_count + 1)
+    return {skill: int((math.log(count + 1) / log_max) * 100) for skill, count in counts.items()}
+
+def skill_counts(df):
+    """Counter of postings per skill; the raw totals behind calculate_demand_map."""
+    # Assuming df['Skills'] is list of strings
+    return Counter(s for sublist in df['Skills'] for s in sublist)
+
+def demand_map_from_counts(counts):
+    """
+    Demand scores from running per-skill totals, so an incremental refresh
+    can add a delta Counter and rescore without re-reading every posting.
+    """
+    counts = {s: c for s, c in counts.items() if c > 0}
+    if not counts:
+        return {}
+    return _log_scores(counts, max(counts.values()))
 
 def calculate_demand_map(df):
     """
     Calculates demand score (0-100) for each skill based on frequency in dataset.
     Returns Dictionary {skill_lower: score}
     """
-    # Flatten all skills
-    # Assuming df['Skills'] is list of strings
-    all_skills = [s for sublist in df['Skills'] for s in sublist]
-    counts = Counter(all_skills)
-    
-    if not counts:
-        return {}
-        
-    max_count = counts.most_common(1)[0][1]
-    
-    import math
-    demand_map = {}
-    if not counts:
-        return {}
-        
-    max_count = counts.most_common(1)[0][1]
-    log_max = math.log(max_count + 1)
-    
-    for skill, count in counts.items():
-        # Logarithmic normalization to boost specialist skills
-        # score = log(count) / log(max) * 100
-        log_val = math.log(count + 1)
-        score = int((log_val / log_max) * 100)
-        demand_map[skill] = score
-        
-    return demand_map
+    return demand_map_from_counts(skill_counts(df))
+
+class DemandEngine:
+    """
+    Incrementally maintained, time-windowed skill demand.
+
+    Per-skill daily counts live in a ring buffer covering `horizon` days.
+    Running totals for each window in WINDOWS and an exponentially decayed
+    count are updated as postings arrive or days roll over, so adding a batch
+    costs O(batch) and score/trend lookups are O(1) dict + array reads.
+    """
+
+    WINDOWS = (7, 30, 90)
+
+    def __init__(self, horizon=90, half_life=14.0, capacity=256):
+        self.horizon = max(horizon, max(self.WINDOWS))
+        self.half_life = half_life
+        self.skills = []
+        self.ids = {}
+        self.daily = np.zeros((capacity, self.horizon), dtype=np.int64)
+        self.totals = {w: np.zeros(capacity, dtype=np.int64) for w in self.WINDOWS}
+        self.decayed = np.zeros(capacity, dtype=np.float64)
+        self.day = None # ordinal of the newest day seen
+        self._max = {}  # window -> max count, invalidated on update
+
+    # --- UPDATES ---
+    def _skill_id(self, skill):
+        key = str(skill).strip().lower()
+        sid = self.ids.get(key)
+        if sid is None:
+            sid = len(self.skills)
+            if sid == len(self.decayed):
+                self._grow()
+            self.ids[key] = sid
+            self.skills.append(key)
+        return sid
+
+    def _grow(self):
+        extra = len(self.decayed)
+        self.daily = np.vstack([self.daily, np.zeros((extra, self.horizon), dtype=np.int64)])
+        for w in self.WINDOWS:
+            self.totals[w] = np.concatenate([self.totals[w], np.zeros(extra, dtype=np.int64)])
+        self.decayed = np.concatenate([self.decayed, np.zeros(extra)])
+
+    def _advance(self, day):
+        """Rolls the ring buffer forward so `day` is the newest day."""
+        if self.day is None:
+            self.day = day
+            return
+        steps = day - self.day
+        if steps <= 0:
+            return
+        if steps >= self.horizon:
+            self.daily[:] = 0
+            for w in self.WINDOWS:
+                self.totals[w][:] = 0
+        else:
+            for d in range(self.day + 1, day + 1):
+                # Day d - w drops out of window w
+                for w in self.WINDOWS:
+                    self.totals[w] -= self.daily[:, (d - w) % self.horizon]
+                self.daily[:, d % self.horizon] = 0
+        self.decayed *= 0.5 ** (steps / self.half_life)
+        self.day = day
+        self._max.clear()
+
+    def add(self, skills, day=None, count=1):
+        """Records one posting's skills on `day` (date, ISO/RFC 2822 string, epoch timestamp or ordinal)."""
+        day = _to_ordinal(day)
+        if self.day is None or day > self.day:
+            self._advance(day)
+        age = self.day - day
+        if age >= self.horizon:
+            return
+
+        col = day % self.horizon
+        weight = count * 0.5 ** (age / self.half_life)
+        for skill in set(skills):
+            sid = self._skill_id(skill)
+            self.daily[sid, col] += count
+            for w in self.WINDOWS:
+                if age < w:
+                    self.totals[w][sid] += count
+            self.decayed[sid] += weight
+        self._max.clear()
+
+    def add_batch(self, postings):
+        """
+        Adds (skills, day) pairs or posting dicts with 'Skills' and 'Posted'
+        (falling back to the store's ingestion 'Date').
+        """
+        n = 0
+        for post in postings:
+            if isinstance(post, dict):
+                self.add(post.get('Skills') or [], post.get('Posted') or post.get('Date'))
+            else:
+                self.add(*post)
+            n += 1
+        return n
+
+    @classmethod
+    def from_store(cls, store, **kwargs):
+        """Rebuilds the engine from every posting in a JobStore, by posting date."""
+        engine = cls(**kwargs)
+        table = store.scan()
+        posted = np.asarray(table.columns['Posted']).tolist()
+        stored = table.date.tolist() if table.date is not None else [None] * len(table)
+        # Oldest first, so the ring buffer only ever rolls forward
+        days = [_to_ordinal(p or d) for p, d in zip(posted, stored)]
+        skill_lists = table.skill_lists()
+        for i in sorted(range(len(days)), key=days.__getitem__):
+            engine.add(skill_lists[i], days[i])
+        return engine
+
+    def roll_to(self, day=None):
+        """Advances to `day` (default today) with no new postings, expiring old counts."""
+        day = _to_ordinal(day)
+        if self.day is None or day > self.day:
+            self._advance(day)
+
+    # --- LOOKUPS ---
+    def count(self, skill, window=30):
+        sid = self.ids.get(str(skill).strip().lower())
+        return 0 if sid is None else int(self.totals[window][sid])
+
+    def _window_max(self, window):
+        if window not in self._max:
+            n = len(self.skills)
+            self._max[window] = int(self.totals[window][:n].max()) if n else 0
+        return self._max[window]
+
+    def score(self, skill, window=30, default=None):
+        """Demand score 0-100 over the window, on calculate_demand_map's log scale."""
+        max_count = self._window_max(window)
+        c = self.count(skill, window)
+        if max_count == 0 or c == 0:
+            return default
+        return int(math.log(c + 1) / math.log(max_count + 1) * 100)
+
+    def trend(self, skill, short=7, long=30):
+        """
+        Relative change of the short-window daily rate vs the long-window rate,
+        e.g. 0.25 means the skill is posted 25% more often lately.
+        """
+        long_count = self.count(skill, long)
+        if long_count == 0:
+            return 0.0
+        return (self.count(skill, short) / short) / (long_count / long) - 1.0
+
+    def decay_score(self, skill):
+        """Exponentially decayed posting count (half-life in days)."""
+        sid = self.ids.get(str(skill).strip().lower())
+        return 0.0 if sid is None else float(self.decayed[sid])
+
+    def demand_map(self, window=30):
+        """{skill: score} over the window, same shape as calculate_demand_map."""
+        n = len(self.skills)
+        counts = {self.skills[i]: int(c) for i, c in enumerate(self.totals[window][:n]) if c > 0}
+        if not counts:
+            return {}
+        return _log_scores(counts, max(counts.values()))
+
+    # --- PERSISTENCE ---
+    def save(self, path=ENGINE_PATH):
+        n = len(self.skills)
+        meta = {"skills": self.skills, "day": self.day, "horizon": self.horizon, "half_life": self.half_life}
+        np.savez(path, daily=self.daily[:n], decayed=self.decayed[:n],
+                 **{f"total_{w}": self.totals[w][:n] for w in self.WINDOWS},
+                 meta=np.array(json.dumps(meta)))
+
+    @classmethod
+    def load(cls, path=ENGINE_PATH):
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            engine = cls(horizon=meta['horizon'], half_life=meta['half_life'], capacity=max(len(meta['skills']), 1))
+            n = len(meta['skills'])
+            engine.skills = meta['skills']
+            engine.ids = {s: i for i, s in enumerate(engine.skills)}
+            engine.day = meta['day']
+            engine.daily[:n] = data['daily']
+            engine.decayed[:n] = data['decayed']
+            for w in cls.WINDOWS:
+                engine.totals[w][:n] = data[f"total_{w}"]
+        return engine
+
+# Ints in this range are taken as day ordinals (1970-01-01 .. 2100-01-01);
+# anything larger is a unix timestamp
+_ORDINAL_RANGE = (datetime.date(1970, 1, 1).toordinal(), datetime.date(2100, 1, 1).toordinal())
+
+def _to_ordinal(day):
+    if day is None or day == '':
+        return datetime.date.today().toordinal()
+    if isinstance(day, (int, np.integer)) and _ORDINAL_RANGE[0] <= day <= _ORDINAL_RANGE[1]:
+        return int(day)
+    if isinstance(day, datetime.datetime):
+        return day.date().toordinal()
+    if isinstance(day, datetime.date):
+        return day.toordinal()
+    # ISO strings, epoch seconds/ms and RFC 2822 pubDates, as stored in the JobStore
+    iso = posted_day(day)
+    return datetime.date.fromisoformat(iso).toordinal() if iso else datetime.date.today().toordinal()
 
 def get_gap_skills(user_skills, target_role_skills):
     """
     Identify missing skills.
     """
-    user_set = set(k.lower() for k in user_skills)
-    target_set = set(k.lower() for k in target_role_skills)
-    
+    # Free-text aliases ("ReactJS") match the whitelist names roles use ("react")
+    user_set = set(canonical_skill(k) for k in user_skills)
+    target_set = set(canonical_skill(k) for k in target_role_skills)
+
     missing = list(target_set - user_set)
     return missing
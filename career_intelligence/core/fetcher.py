@@ -0,0 +1,125 @@
+import asyncio
+import random
+import time
+
+import aiohttp
+
+from core.boards import get_boards
+from core.ingestion import USER_AGENT, run_ingestion
+from core.jobstore import JobStore
+
+# Concurrent multi-source ingestion.
+# Every board is fetched on its own task over one shared aiohttp session:
+#   - connection pool: keep-alive connections, capped per host
+#   - rate limits: one token bucket per host, shared by all its boards
+#   - retries: timeouts, connection errors, 429 and 5xx, with exponential
+#     backoff + jitter (Retry-After honoured), and bodies that aren't valid
+#     JSON (a cut-off response or a proxy's HTML error page)
+# A board's postings are written through run_ingestion as soon as it
+# finishes, so a slow or failing board never holds the others back.
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens/sec, at most `burst` saved up."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class FetchError(Exception):
+    pass
+
+def _backoff(attempt, base, cap=30.0):
+    return min(cap, base * (2 ** attempt)) * random.uniform(0.5, 1.0)
+
+async def fetch_json(session, url, bucket, retries=3, backoff=0.5):
+    """GET `url` as JSON, rate limited by `bucket`, retrying transient failures."""
+    for attempt in range(retries + 1):
+        await bucket.acquire()
+        try:
+            async with session.get(url) as resp:
+                if resp.status in RETRY_STATUSES and attempt < retries:
+                    retry_after = resp.headers.get("Retry-After", "")
+                    delay = float(retry_after) if retry_after.isdigit() else _backoff(attempt, backoff)
+                    await asyncio.sleep(delay)
+                    continue
+                if resp.status >= 400:
+                    raise FetchError(f"HTTP {resp.status} from {url}")
+                return await resp.json(content_type=None)
+        # ValueError: the body didn't decode as JSON
+        except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError, ValueError) as e:
+            if attempt >= retries:
+                raise FetchError(f"{type(e).__name__} fetching {url}") from e
+            await asyncio.sleep(_backoff(attempt, backoff))
+    raise FetchError(f"Gave up on {url}")
+
+async def fetch_board(session, board, bucket, retries=3, backoff=0.5):
+    """All pages of one board, normalized to parse_postings input."""
+    items, url, page = [], board.first_page(), 0
+    while url:
+        payload = await fetch_json(session, url, bucket, retries, backoff)
+        raw = board.items(payload)
+        items.extend(i for i in (board.normalize(r) for r in raw) if i is not None)
+        url = board.next_page(url, payload, len(raw), page)
+        page += 1
+    return items
+
+async def ingest_boards(boards, store=None, demand=None, graph=None, per_host=4,
+                        timeout=30.0, retries=3, backoff=0.5):
+    """
+    Fetches every board concurrently and ingests each one as it completes.
+    Returns {board name: {"fetched", "written", "seconds", "error"}}.
+    """
+    store = store or JobStore()
+    buckets = {}
+    for board in boards:
+        # Boards on one host share its limit; the strictest configured rate wins
+        bucket = buckets.get(board.host)
+        if bucket is None or board.rate < bucket.rate:
+            buckets[board.host] = TokenBucket(board.rate, board.burst)
+
+    connector = aiohttp.TCPConnector(limit_per_host=per_host, ttl_dns_cache=300)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    loop = asyncio.get_running_loop()
+    report = {}
+
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout,
+                                     headers={"User-Agent": USER_AGENT}) as session:
+        async def run(board):
+            start = time.perf_counter()
+            try:
+                items = await fetch_board(session, board, buckets[board.host], retries, backoff)
+                return board, items, None, time.perf_counter() - start
+            except Exception as e:
+                return board, [], e, time.perf_counter() - start
+
+        for done in asyncio.as_completed([run(b) for b in boards]):
+            board, items, error, seconds = await done
+            written = 0
+            if items:
+                # The store isn't thread-safe, but sinks run one at a time here
+                written = await loop.run_in_executor(None, run_ingestion, items, store, demand, graph)
+            report[board.name] = {"fetched": len(items), "written": written,
+                                  "seconds": round(seconds, 3), "error": str(error) if error else None}
+            status = f"failed: {error}" if error else f"{len(items)} fetched, {written} new"
+            print(f"[{board.name}] {status} ({seconds:.2f}s)")
+    return report
+
+def run_multi_source_ingestion(names=None, store=None, demand=None, graph=None, base_url=None, **options):
+    """Sync entry point: ingest the named boards (default: all) concurrently."""
+    return asyncio.run(ingest_boards(get_boards(names, base_url), store, demand, graph, **options))
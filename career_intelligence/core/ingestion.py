@@ -1,68 +1,214 @@
-from core.skills import filter_skills
+import hashlib
+import json
+import random
+import re
 
-def fetch_remoteok_jobs():
+import pandas as pd
+import requests
+
+from core.jobstore import JobStore
+from core.skills import extract_skills, filter_skills
+
+REMOTEOK_URL = "https://remoteok.com/api"
+USER_AGENT = "Mozilla/5.0 (compatible; CareerIntelligence/1.0)"
+
+# Ingestion is a chain of generator stages:
+#   source -> parse_postings -> clean_skills -> normalize_salaries -> dedupe -> sink
+# Each stage consumes and yields one posting at a time, so memory stays flat and
+# the sink only ever sees postings it has not stored before.
+
+STREAM_CHUNK = 64 * 1024
+
+# --- SOURCES ---
+def iter_json_array(chunks):
     """
-    Fetches live jobs from RemoteOK API.
+    Yields the elements of a top-level JSON array from an iterable of text
+    chunks, decoding each element as soon as it is complete. Only the current
+    element is buffered, never the whole document.
     """
-    url = "https://remoteok.com/api"
+    decoder = json.JSONDecoder()
+    buf, pos, started = '', 0, False
+    for chunk in chunks:
+        buf += chunk
+        while True:
+            while pos < len(buf) and buf[pos] in ' \t\r\n,':
+                pos += 1
+            if pos >= len(buf):
+                break
+            if not started:
+                if buf[pos] != '[':
+                    raise ValueError("Expected a JSON array")
+                started, pos = True, pos + 1
+                continue
+            if buf[pos] == ']':
+                return
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                break # Element continues in the next chunk
+            if end == len(buf) and not isinstance(item, (dict, list, str)):
+                break # A number may continue in the next chunk
+            yield item
+            pos = end
+        buf, pos = buf[pos:], 0
+    if buf.strip():
+        raise ValueError("Truncated or malformed JSON array")
+
+def remoteok_source(url=REMOTEOK_URL, session=None, timeout=30):
+    """Yields raw posting dicts from the RemoteOK API as the response streams in."""
     print(f"Fetching live data from {url}...")
-    
-    try:
-        resp = requests.get(url, headers={"User-Agent": USER_AGENT})
+    http = session or requests
+    with http.get(url, headers={"User-Agent": USER_AGENT}, timeout=timeout, stream=True) as resp:
         resp.raise_for_status()
-        data = resp.json()
-    except Exception as e:
-        print(f"Error fetching API: {e}")
-        return pd.DataFrame() 
-    
-    job_list = []
-    
-    # Skip the first element
-    for item in data[1:]:
-        title = item.get('position', 'Unknown Role')
-        company = item.get('company', 'Unknown Company')
-        tags = item.get('tags', [])
-        
-        # Salary parsing
-        salary_str = item.get('salary', '') 
-        min_sal, max_sal = parse_salary(salary_str)
-        
+        resp.encoding = resp.encoding or 'utf-8'
+        yield from iter_json_array(resp.iter_content(chunk_size=STREAM_CHUNK, decode_unicode=True))
+
+def file_source(path):
+    """
+    Yields raw posting dicts from a local file, standing in for RemoteOK.
+    Accepts a JSON array (an API snapshot) or JSON lines.
+    """
+    with open(path) as f:
+        head = f.read(1)
+        while head and head.isspace():
+            head = f.read(1)
+        f.seek(0)
+        if head == '[':
+            yield from iter_json_array(iter(lambda: f.read(STREAM_CHUNK), ''))
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+# --- STAGES ---
+def posting_id(item):
+    """Stable ID for a posting: source + API id when present, else a content hash."""
+    if item.get('id') not in (None, ''):
+        return f"{item.get('source', 'RemoteOK').lower()}:{item['id']}"
+    key = "|".join(str(item.get(k, '')) for k in ('company', 'position', 'url', 'date'))
+    return "hash:" + hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+def parse_postings(items):
+    for item in items:
+        # RemoteOK's first element is a legal notice, not a job
+        if not isinstance(item, dict) or 'position' not in item:
+            continue
+        yield {
+            "Job_ID": posting_id(item),
+            "Role": item.get('position') or 'Unknown Role',
+            "Company": item.get('company') or 'Unknown Company',
+            "Tags": item.get('tags') or [],
+            "Salary_Raw": item.get('salary', ''),
+            "Posted": item.get('date', ''),
+            "Description": item.get('description') or '',
+            "Source": item.get('source', 'RemoteOK'),
+        }
+
+def clean_skills(postings):
+    for post in postings:
+        # Tags through the whitelist + alias table ("ReactJS" -> react, "k8s" -> kubernetes)
+        valid_skills = filter_skills(post.pop('Tags'))
+
+        # Then anything named in the title or body, in one Aho-Corasick pass each.
+        # Bodies are dropped afterwards; only the extracted skills are stored.
+        description = post.pop('Description')
+        for skill in extract_skills(post['Role']) + extract_skills(description):
+            if skill not in valid_skills:
+                valid_skills.append(skill)
+
+        post['Skills'] = valid_skills
+        yield post
+
+def normalize_salaries(postings):
+    for post in postings:
+        min_sal, max_sal = parse_salary(post.pop('Salary_Raw'))
+
         # SALARY NORMALIZATION (Critical Fix)
-        # RemoteOK gives USD (e.g., 60-120k).
+        # Boards give USD (e.g., 60-120k).
         # We need realistic Indian LPA.
-        # Direct conversion is too high (80 LPA). 
+        # Direct conversion is too high (80 LPA).
         # We apply a "PPP / Market Correction Factor" of ~0.25
         # e.g., $100k USD -> 25 LPA INR (High end Indian salary).
-        
         if min_sal > 0:
             min_sal = min_sal * 0.25
             max_sal = max_sal * 0.25
         else:
             # Fallback imputation
-            min_sal, max_sal = estimate_salary_fallback(title)
-
-        # Clean Skills using Whitelist
-        cleaned_tags = [t.lower() for t in tags]
-        valid_skills = filter_skills(cleaned_tags)
-        
-        # If no valid skills found, try extracting from title? Or just skip/keep empty.
-        # Let's keep empty to urge data quality via valid_skills
-        if not valid_skills:
-            # Heuristic: Add 'python' if in title
-            if 'python' in title.lower(): valid_skills.append('python')
-            if 'data' in title.lower(): valid_skills.append('sql')
-
-        job_list.append({
-            "Role": title,
-            "Company": company,
-            "Skills": valid_skills,
+            min_sal, max_sal = estimate_salary_fallback(post['Role'])
+
+        post.update({
             "Salary": (min_sal + max_sal) / 2, # Avg
             "Min_Salary": min_sal,
             "Max_Salary": max_sal,
-            "Experience": random.randint(1, 6), 
-            "Source": "RemoteOK"
+            # Boards don't state experience: a placeholder for the salary model's
+            # feature, flagged so salary sketches leave it out of experience bands
+            "Experience": random.randint(1, 6),
+            "Experience_Imputed": True,
         })
-        
+        yield post
+
+def dedupe(postings, seen_ids):
+    """Drops postings whose Job_ID is in `seen_ids` (updated as we go)."""
+    for post in postings:
+        if post['Job_ID'] in seen_ids:
+            continue
+        seen_ids.add(post['Job_ID'])
+        yield post
+
+def track_demand(postings, engine):
+    """Pass-through stage feeding each new posting into a DemandEngine."""
+    for post in postings:
+        engine.add(post['Skills'], post.get('Posted'))
+        yield post
+
+def track_cooccurrence(postings, graph, batch_size=1000):
+    """Pass-through stage folding new postings into a SkillGraph in batches."""
+    batch = []
+    for post in postings:
+        batch.append(post['Skills'])
+        if len(batch) >= batch_size:
+            graph.add_postings(batch)
+            batch = []
+        yield post
+    if batch:
+        graph.add_postings(batch)
+
+def pipeline(items):
+    """Source items -> normalized posting dicts (no dedupe)."""
+    return normalize_salaries(clean_skills(parse_postings(items)))
+
+# --- SINK ---
+# Postings land in the typed, columnar JobStore (core/jobstore.py), which
+# also owns the checkpoint of stored Job_IDs.
+
+def run_ingestion(source, store=None, demand=None, graph=None):
+    """
+    Streams `source` through the pipeline into `store`, skipping postings
+    already recorded in the store's checkpoint. Returns the number of new rows.
+    When a DemandEngine / SkillGraph is given, only the new postings are added to it.
+    """
+    store = store or JobStore()
+    seen_ids = store.load_seen_ids()
+    postings = dedupe(pipeline(source), seen_ids)
+    if demand is not None:
+        postings = track_demand(postings, demand)
+    if graph is not None:
+        postings = track_cooccurrence(postings, graph)
+    written = store.append(postings)
+    print(f"Ingested {written} new postings ({len(seen_ids)} known).")
+    return written
+
+def fetch_remoteok_jobs():
+    """
+    Fetches live jobs from RemoteOK API.
+    One-shot DataFrame of the current feed; see run_ingestion for incremental refreshes.
+    """
+    try:
+        job_list = list(pipeline(remoteok_source()))
+    except Exception as e:
+        print(f"Error fetching API: {e}")
+        return pd.DataFrame()
+
     print(f"Successfully processed {len(job_list)} live jobs.")
     return pd.DataFrame(job_list)
 
@@ -72,7 +218,7 @@ def parse_salary(salary_str):
     """
     if not salary_str:
         return 0, 0
-    clean = re.sub(r'[^\d\-]', '', salary_str)
+    clean = re.sub(r'[^\d\-]', '', str(salary_str))
     try:
         if '-' in clean:
             parts = clean.split('-')
@@ -0,0 +1,368 @@
+import ast
+import datetime
+import email.utils
+import json
+import os
+import shutil
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from core.skills import VALID_SKILLS
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STORE_DIR = os.path.join(BASE_DIR, 'data', 'jobs')
+
+# Typed, columnar job store.
+# Layout: data/jobs/source=<src>/date=<YYYY-MM-DD>/part-<ts>/<column>.npy
+# Scalar columns are plain typed .npy arrays (memory-mapped on read). Skills are
+# dictionary-encoded against a shared vocabulary (the VALID_SKILLS whitelist
+# first, then any other skill seen) and stored CSR-style: skill_ids holds every
+# posting's IDs back to back and skill_offsets[i]:skill_offsets[i+1] is row i.
+# source/date are directory keys, so filters on them prune whole partitions
+# before any file is opened.
+# Why .npy rather than Parquet (pyarrow is installed, for batch_score output):
+# columns are memory-mapped zero-copy with np.load, the CSR skill arrays feed
+# np.bincount directly with no Arrow list conversion, and a part is published
+# by renaming its directory, so readers never see a half-written part.
+
+COLUMNS = [
+    # (DataFrame column, file stem, dtype, default)
+    ("Job_ID", "job_id", str, ""),
+    ("Role", "role", str, "Unknown Role"),
+    ("Company", "company", str, ""),
+    ("Salary", "salary", np.float32, np.nan),
+    ("Min_Salary", "min_salary", np.float32, np.nan),
+    ("Max_Salary", "max_salary", np.float32, np.nan),
+    ("Experience", "experience", np.int16, 0),
+    # True when the board gave no experience and ingestion filled in a placeholder;
+    # parts written before the column existed are assumed imputed
+    ("Experience_Imputed", "experience_imputed", np.bool_, True),
+    # Posting date as 'YYYY-MM-DD' ('' when the board gave none); the partition
+    # date is when it was ingested
+    ("Posted", "posted", str, ""),
+]
+
+def posted_day(value):
+    """ISO timestamps, epoch seconds/ms or RFC 2822 pubDates -> 'YYYY-MM-DD', else ''."""
+    if value is None or value == '' or (isinstance(value, float) and np.isnan(value)):
+        return ''
+    text = str(value).strip()
+    if isinstance(value, (int, float, np.integer, np.floating)) or text.isdigit():
+        seconds = float(text)
+        if seconds > 1e11: # Milliseconds
+            seconds /= 1000
+        return datetime.datetime.fromtimestamp(seconds, datetime.timezone.utc).date().isoformat()
+    try:
+        return datetime.date.fromisoformat(text[:10]).isoformat()
+    except ValueError:
+        pass
+    try:
+        return email.utils.parsedate_to_datetime(text).date().isoformat()
+    except (TypeError, ValueError):
+        return ''
+
+# Per-column normalization applied when records are written
+CONVERTERS = {"Posted": posted_day}
+
+def read_legacy_csv(path):
+    """A legacy jobs.csv as a DataFrame, with its stringified Skills lists parsed."""
+    df = pd.read_csv(path)
+    df['Skills'] = [ast.literal_eval(s) if isinstance(s, str) else [] for s in df['Skills']]
+    return df
+
+def _or_default(value, default):
+    # Missing values arrive as None (dicts) or NaN (DataFrame rows)
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return default
+    return value
+
+class SkillVocab:
+    """Skill text <-> integer ID mapping, persisted as vocab.json in the store."""
+
+    def __init__(self, skills=None):
+        self.skills = list(skills) if skills is not None else sorted(VALID_SKILLS)
+        self.ids = {s: i for i, s in enumerate(self.skills)}
+
+    def __len__(self):
+        return len(self.skills)
+
+    def encode(self, skills):
+        out = []
+        for s in skills:
+            key = str(s).strip().lower()
+            if key not in self.ids:
+                self.ids[key] = len(self.skills)
+                self.skills.append(key)
+            out.append(self.ids[key])
+        return out
+
+    def decode(self, ids):
+        return [self.skills[i] for i in ids]
+
+    @classmethod
+    def load(cls, path):
+        if not os.path.exists(path):
+            return cls()
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def save(self, path):
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.skills, f)
+        os.replace(tmp, path)
+
+class JobTable:
+    """
+    In-memory columnar view of some postings.
+    `columns` maps DataFrame column names to arrays; skills are CSR arrays.
+    """
+
+    def __init__(self, columns, skill_offsets, skill_ids, vocab, source=None, date=None):
+        self.columns = columns
+        self.skill_offsets = skill_offsets
+        self.skill_ids = skill_ids
+        self.vocab = vocab
+        self.source = source
+        self.date = date
+
+    def __len__(self):
+        return len(self.skill_offsets) - 1
+
+    @classmethod
+    def empty(cls, vocab):
+        columns = {name: np.empty(0, dtype=dtype if dtype is not str else 'U1') for name, _, dtype, _ in COLUMNS}
+        return cls(columns, np.zeros(1, dtype=np.int64), np.empty(0, dtype=np.int32), vocab,
+                   np.empty(0, dtype='U1'), np.empty(0, dtype='U1'))
+
+    @classmethod
+    def from_records(cls, records, vocab):
+        """Builds a table from posting dicts / DataFrame rows with a 'Skills' list."""
+        records = list(records)
+        columns = {}
+        for name, _, dtype, default in COLUMNS:
+            values = [_or_default(r.get(name), default) for r in records]
+            if name in CONVERTERS:
+                values = [CONVERTERS[name](v) for v in values]
+            columns[name] = np.array(values, dtype=dtype) if values else np.empty(0, dtype=dtype if dtype is not str else 'U1')
+
+        lengths = np.fromiter((len(r.get('Skills') or []) for r in records), dtype=np.int64, count=len(records))
+        offsets = np.zeros(len(records) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        ids = [i for r in records for i in vocab.encode(r.get('Skills') or [])]
+        return cls(columns, offsets, np.asarray(ids, dtype=np.int32), vocab)
+
+    @classmethod
+    def concat(cls, tables, vocab):
+        tables = [t for t in tables if len(t)]
+        if not tables:
+            return cls.empty(vocab)
+        columns = {name: np.concatenate([t.columns[name] for t in tables]) for name, _, _, _ in COLUMNS}
+        offsets = [np.zeros(1, dtype=np.int64)]
+        base = 0
+        for t in tables:
+            offsets.append(np.asarray(t.skill_offsets[1:]) + base)
+            base += int(t.skill_offsets[-1])
+        source = np.concatenate([np.full(len(t), t.source) for t in tables])
+        date = np.concatenate([np.full(len(t), t.date) for t in tables])
+        return cls(columns, np.concatenate(offsets), np.concatenate([t.skill_ids for t in tables]),
+                   vocab, source, date)
+
+    def take(self, rows):
+        """A new table with only the given row indices (or boolean mask)."""
+        rows = np.flatnonzero(rows) if np.asarray(rows).dtype == bool else np.asarray(rows, dtype=np.int64)
+        starts = np.asarray(self.skill_offsets[:-1])[rows]
+        lengths = np.asarray(self.skill_offsets[1:])[rows] - starts
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        # Gather every kept row's skill IDs in one fancy-indexing pass
+        gather = np.arange(offsets[-1]) - np.repeat(offsets[:-1], lengths) + np.repeat(starts, lengths)
+        columns = {name: np.asarray(arr)[rows] for name, arr in self.columns.items()}
+        source = self.source[rows] if self.source is not None and len(self.source) == len(self) else self.source
+        date = self.date[rows] if self.date is not None and len(self.date) == len(self) else self.date
+        return JobTable(columns, offsets, np.asarray(self.skill_ids)[gather], self.vocab, source, date)
+
+    def skill_counts(self):
+        """Postings per skill ID in one vectorized pass (np.bincount)."""
+        return np.bincount(self.skill_ids, minlength=len(self.vocab))
+
+    def skill_count_map(self):
+        counts = self.skill_counts()
+        return {self.vocab.skills[i]: int(counts[i]) for i in np.flatnonzero(counts)}
+
+    def skill_lists(self):
+        ids = self.skill_ids.tolist()
+        offsets = self.skill_offsets.tolist()
+        skills = self.vocab.skills
+        return [[skills[i] for i in ids[a:b]] for a, b in zip(offsets[:-1], offsets[1:])]
+
+    def to_frame(self):
+        df = pd.DataFrame({name: np.asarray(arr) for name, arr in self.columns.items()})
+        df['Skills'] = self.skill_lists()
+        if self.source is not None and len(self.source) == len(df):
+            df['Source'] = self.source
+            df['Date'] = self.date
+        return df
+
+class JobStore:
+    """
+    Partitioned columnar store for job postings.
+    Also the ingestion sink: `append` takes the posting stream from
+    core.ingestion and keeps an append-only log of every stored Job_ID.
+    """
+
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+        self.vocab_path = os.path.join(root, 'vocab.json')
+        self.checkpoint_path = os.path.join(root, '_checkpoint.json')
+        self.seen_path = os.path.join(root, '_seen_ids.txt')
+        self.vocab = SkillVocab.load(self.vocab_path)
+
+    # --- WRITE ---
+    def write_partition(self, records, source, date=None):
+        """Writes postings (dicts or a DataFrame) as one new part. Returns rows written."""
+        if isinstance(records, pd.DataFrame):
+            records = records.to_dict('records')
+        table = JobTable.from_records(records, self.vocab)
+        if not len(table):
+            return 0
+
+        date = date or time.strftime('%Y-%m-%d')
+        part = os.path.join(self.root, f"source={source}", f"date={date}",
+                            f"part-{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}")
+        tmp = part + '.tmp'
+        os.makedirs(tmp, exist_ok=True)
+        for name, stem, _, _ in COLUMNS:
+            np.save(os.path.join(tmp, f"{stem}.npy"), table.columns[name])
+        np.save(os.path.join(tmp, "skill_offsets.npy"), table.skill_offsets)
+        np.save(os.path.join(tmp, "skill_ids.npy"), table.skill_ids)
+        # Vocab first: a visible part must never reference unknown skill IDs
+        self.vocab.save(self.vocab_path)
+        os.replace(tmp, part)
+        return len(table)
+
+    def drop_source(self, source):
+        path = os.path.join(self.root, f"source={source}")
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+
+    def load_checkpoint(self):
+        if not os.path.exists(self.checkpoint_path):
+            return {"last_run": None, "total": 0}
+        with open(self.checkpoint_path) as f:
+            return json.load(f)
+
+    def load_seen_ids(self):
+        """Every Job_ID already stored: the ID log plus any list left in an older checkpoint."""
+        seen = set(self.load_checkpoint().get("seen_ids", []))
+        if os.path.exists(self.seen_path):
+            with open(self.seen_path) as f:
+                seen.update(line.rstrip('\n') for line in f if line.strip())
+        return seen
+
+    def _save_checkpoint(self, checkpoint):
+        tmp = self.checkpoint_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp, self.checkpoint_path)
+
+    def append(self, postings):
+        """
+        Ingestion sink: writes the (already deduped) posting stream, one part
+        per source, then logs the new Job_IDs and advances the checkpoint.
+        Returns rows written.
+        """
+        by_source = {}
+        for post in postings:
+            by_source.setdefault(post.get('Source', 'unknown'), []).append(post)
+
+        written = 0
+        for source, rows in by_source.items():
+            written += self.write_partition(rows, source)
+
+        # IDs only after the parts are in place. Only this run's IDs are
+        # appended, so a run costs O(new postings), not O(corpus); an ID list
+        # from an older checkpoint moves into the log once.
+        checkpoint = self.load_checkpoint()
+        new_ids = checkpoint.pop("seen_ids", []) + [p['Job_ID'] for rows in by_source.values() for p in rows]
+        os.makedirs(self.root, exist_ok=True)
+        if new_ids:
+            with open(self.seen_path, 'a') as f:
+                f.writelines(f"{job_id}\n" for job_id in new_ids)
+        checkpoint.update({
+            "last_run": time.strftime("%Y%m%d%H%M%S"),
+            "total": checkpoint.get("total", 0) + written,
+        })
+        self._save_checkpoint(checkpoint)
+        return written
+
+    # --- READ ---
+    def partitions(self, sources=None, date_from=None, date_to=None):
+        """
+        Part directories matching the filters, as (source, date, path).
+        Dates are ISO strings, so range checks are plain string comparisons.
+        """
+        if not os.path.isdir(self.root):
+            return []
+        found = []
+        for src_dir in sorted(os.listdir(self.root)):
+            if not src_dir.startswith('source='):
+                continue
+            source = src_dir[len('source='):]
+            if sources is not None and source not in sources:
+                continue
+            for date_dir in sorted(os.listdir(os.path.join(self.root, src_dir))):
+                if not date_dir.startswith('date='):
+                    continue
+                date = date_dir[len('date='):]
+                if (date_from and date < date_from) or (date_to and date > date_to):
+                    continue
+                base = os.path.join(self.root, src_dir, date_dir)
+                for part in sorted(os.listdir(base)):
+                    if part.startswith('part-') and not part.endswith('.tmp'):
+                        found.append((source, date, os.path.join(base, part)))
+        return found
+
+    def _read_part(self, source, date, path):
+        def load(stem):
+            return np.load(os.path.join(path, f"{stem}.npy"), mmap_mode='r')
+        offsets = load("skill_offsets")
+        columns = {}
+        for name, stem, dtype, default in COLUMNS:
+            if os.path.exists(os.path.join(path, f"{stem}.npy")):
+                columns[name] = load(stem)
+            else:
+                # Parts written before the column existed
+                columns[name] = np.full(len(offsets) - 1, default, dtype=dtype if dtype is not str else 'U1')
+        return JobTable(columns, offsets, load("skill_ids"), self.vocab, source, date)
+
+    def read_parts(self, parts):
+        """Reads the given (source, date, path) parts into one JobTable."""
+        return JobTable.concat([self._read_part(*p) for p in parts], self.vocab)
+
+    def scan(self, sources=None, date_from=None, date_to=None, posted_from=None, posted_to=None):
+        """
+        Reads every matching part into one JobTable. date_* prune partitions by
+        ingestion day; posted_* then filter rows by posting date (ISO strings,
+        inclusive; rows without a posting date are dropped by either filter).
+        """
+        table = self.read_parts(self.partitions(sources, date_from, date_to))
+        if posted_from is None and posted_to is None:
+            return table
+        posted = np.asarray(table.columns['Posted'])
+        keep = posted != ''
+        if posted_from:
+            keep &= posted >= posted_from
+        if posted_to:
+            keep &= posted <= posted_to
+        return table.take(keep)
+
+    def read_all(self, **filters):
+        return self.scan(**filters).to_frame()
+
+    def import_csv(self, path, source='legacy', date=None):
+        """One-time migration of a legacy jobs.csv with stringified Skills lists."""
+        return self.write_partition(read_legacy_csv(path), source, date)
@@ -1,45 +1,156 @@
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
-import joblib
-import pandas as pd
-import os
 
 # To match roles, we need Pre-computed Role Embeddings.
 # For this implementation, we will compare User Skill Vector vs (Job Role Vectors)
 
-def match_roles(user_embedding, role_df):
+# Above this many roles, RoleIndex switches from exact search to the IVF backend
+ANN_THRESHOLD = 20000
+
+def _normalize_rows(matrix):
+    """L2-normalizes rows; zero rows stay zero (same as sklearn's cosine_similarity)."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+def _top_k(scores, k):
+    """Row-wise top-k column indices of a 2D score matrix, best first."""
+    k = min(k, scores.shape[1])
+    if k == 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64)
+    if k < scores.shape[1]:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        part = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+    order = np.argsort(-np.take_along_axis(scores, part, axis=1), axis=1, kind='stable')
+    return np.take_along_axis(part, order, axis=1)
+
+class IVFIndex:
+    """
+    Inverted-file approximate nearest-neighbour index over unit vectors.
+    Roles are bucketed by k-means centroid; a query only scores the roles
+    in its `n_probe` closest buckets.
+    """
+
+    def __init__(self, matrix, n_lists=None, n_probe=8, n_iter=10, seed=42):
+        self.matrix = matrix
+        n = len(matrix)
+        self.n_lists = n_lists or max(1, int(np.sqrt(n)))
+        self.n_probe = min(n_probe, self.n_lists)
+
+        rng = np.random.default_rng(seed)
+        centroids = matrix[rng.choice(n, self.n_lists, replace=False)].copy()
+        for _ in range(n_iter):
+            assign = np.argmax(matrix @ centroids.T, axis=1)
+            for c in range(self.n_lists):
+                members = matrix[assign == c]
+                if len(members):
+                    centroids[c] = members.mean(axis=0)
+            centroids = _normalize_rows(centroids)
+
+        assign = np.argmax(matrix @ centroids.T, axis=1)
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self.lists = [np.flatnonzero(assign == c) for c in range(self.n_lists)]
+
+    def search(self, queries, k):
+        probes = _top_k(queries @ self.centroids.T, self.n_probe)
+        idx = np.full((len(queries), k), -1, dtype=np.int64)
+        scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        for i, q in enumerate(queries):
+            candidates = np.concatenate([self.lists[c] for c in probes[i]])
+            cand_scores = (self.matrix[candidates] @ q)[None, :]
+            best = _top_k(cand_scores, k)[0]
+            idx[i, :len(best)] = candidates[best]
+            scores[i, :len(best)] = cand_scores[0, best]
+        return idx, scores
+
+class RoleIndex:
+    """
+    Role catalogue prepared once at load time for repeated matching.
+    Holds a contiguous, pre-normalized float32 matrix so a query is a single
+    dot product plus np.argpartition instead of a DataFrame copy and full sort.
+    """
+
+    def __init__(self, role_df, ann_threshold=ANN_THRESHOLD, n_probe=8):
+        self.role_df = role_df.reset_index(drop=True)
+        self.roles = self.role_df['Role'].tolist()
+        self.avg_salary = self.role_df['Avg_Salary'].tolist()
+        self.demand = self.role_df['Demand_Level'].tolist()
+        self._positions = {r: i for i, r in enumerate(self.roles)}
+
+        # Bundles (core.artifacts) attach their mapped, pre-normalized matrix,
+        # which is used as-is so worker processes share its pages
+        mapped = role_df.attrs.get('embedding_matrix')
+        if mapped is not None and len(mapped) == len(self.roles):
+            self.matrix = mapped
+        else:
+            matrix = np.stack(self.role_df['embedding'].values).astype(np.float32)
+            self.matrix = np.ascontiguousarray(_normalize_rows(matrix))
+
+        self.ann = None
+        if len(self.roles) >= ann_threshold:
+            self.ann = IVFIndex(self.matrix, n_probe=n_probe)
+
+    def __len__(self):
+        return len(self.roles)
+
+    def search(self, user_embeddings, k=3):
+        """
+        Top-k roles for a batch of user vectors (m, 384) or a single (384,).
+        Returns (indices, scores), each (m, k), best match first.
+        """
+        queries = np.atleast_2d(np.asarray(user_embeddings, dtype=np.float32))
+        queries = _normalize_rows(queries)
+        if self.ann is not None:
+            return self.ann.search(queries, k)
+        scores = queries @ self.matrix.T
+        idx = _top_k(scores, k)
+        return idx, np.take_along_axis(scores, idx, axis=1)
+
+    def score(self, user_embedding, role_name):
+        """Cosine similarity between one user vector and a named role, or None."""
+        pos = self._positions.get(role_name)
+        if pos is None:
+            return None
+        query = _normalize_rows(np.atleast_2d(np.asarray(user_embedding, dtype=np.float32)))[0]
+        return float(self.matrix[pos] @ query)
+
+    def to_matches(self, idx, scores):
+        """Converts one row of search() output into match_roles() dicts."""
+        output = []
+        for i, s in zip(idx, scores):
+            if i < 0:
+                continue
+            output.append({
+                "role": self.roles[i],
+                "match_pct": int(s * 100),
+                "avg_salary": self.avg_salary[i],
+                "demand": self.demand[i]
+            })
+        return output
+
+def match_roles(user_embedding, role_df, k=3):
     """
     Compare user_embedding (1D array) against all roles in role_df.
-    role_df should have 'role' and 'embedding' columns.
-    
+    role_df can be a prebuilt RoleIndex (preferred) or a DataFrame with
+    'Role' and 'embedding' columns, which is indexed on the fly.
+
     Returns top 3 roles with match % and salary data.
     """
-    if user_embedding is None or role_df is None or role_df.empty:
+    if user_embedding is None or role_df is None or len(role_df) == 0:
         return []
-    
-    # Stack embeddings
-    role_matrix = np.stack(role_df['embedding'].values)
-    
-    # Reshape user_embedding for sklearn (1, n_features)
-    user_vec_reshaped = user_embedding.reshape(1, -1)
-    
-    # Compute Cosine Similarity
-    sim_scores = cosine_similarity(user_vec_reshaped, role_matrix)[0]
-    
-    # Add to temporary DF to sort
-    results = role_df.copy()
-    results['match_score'] = sim_scores
-    
-    # Get top 3
-    top_matches = results.sort_values('match_score', ascending=False).head(3)
-    
-    output = []
-    for _, row in top_matches.iterrows():
-        output.append({
-            "role": row['Role'],
-            "match_pct": int(row['match_score'] * 100),
-            "avg_salary": row['Avg_Salary'],
-            "demand": row['Demand_Level']
-        })
-        
-    return output
+
+    index = role_df if isinstance(role_df, RoleIndex) else RoleIndex(role_df)
+    idx, scores = index.search(user_embedding, k)
+    return index.to_matches(idx[0], scores[0])
+
+def match_roles_batch(user_embeddings, index, k=3):
+    """
+    Batch version of match_roles: one matrix multiply for all user vectors.
+    Returns a list (one entry per user) of match dicts.
+    """
+    if index is None or len(index) == 0 or len(user_embeddings) == 0:
+        return [[] for _ in range(len(user_embeddings))]
+    if not isinstance(index, RoleIndex):
+        index = RoleIndex(index)
+    idx, scores = index.search(user_embeddings, k)
+    return [index.to_matches(i, s) for i, s in zip(idx, scores)]
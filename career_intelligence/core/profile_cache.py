@@ -0,0 +1,148 @@
+import threading
+import time
+from collections import OrderedDict
+
+from core.skills import canonical_skill
+from core.tracing import span
+from roadmap.generator import generate_roadmap
+
+# Experience buckets (upper bounds, inclusive) used in profile signatures.
+# Gap and roadmap don't depend on experience today, but the bucket keeps the
+# signature stable if experience-aware roadmaps are added.
+EXPERIENCE_BUCKETS = (1, 4, 7, 11)
+
+def experience_bucket(years):
+    for i, upper in enumerate(EXPERIENCE_BUCKETS):
+        if years <= upper:
+            return i
+    return len(EXPERIENCE_BUCKETS)
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry TTL and hit/miss/eviction counters."""
+
+    def __init__(self, max_size=4096, ttl=3600.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict() # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, fn):
+        value = self.get(key)
+        if value is None:
+            value = fn()
+            self.put(key, value)
+        return value
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data), "hits": self.hits, "misses": self.misses,
+            "evictions": self.evictions, "hit_rate": self.hits / total if total else 0.0,
+        }
+
+class GapEngine:
+    """
+    Role gap + roadmap analysis over skill bitsets, with a result cache.
+
+    Every role's Core_Skills is encoded once as a Python int bitset over a
+    shared skill vocabulary, so a gap is `role_bits & ~user_bits`. Results are
+    cached by profile signature: (sorted skill IDs, experience bucket, target
+    role, artifact version).
+    """
+
+    def __init__(self, role_df, version=None, cache=None):
+        self.version = version
+        self.cache = cache or TTLCache()
+        self.skills = []
+        self.ids = {}
+        self.role_bits = {}
+        for role, core in zip(role_df['Role'], role_df['Core_Skills']):
+            self.role_bits[role] = self.encode(core, grow=True)[1]
+
+    def _key(self, skill):
+        # Same normalization as get_gap_skills: aliases map to the whitelist name
+        return canonical_skill(skill)
+
+    def encode(self, skills, grow=False):
+        """Returns (sorted skill IDs, bitset). Unknown skills are skipped unless grow."""
+        ids = set()
+        for s in skills:
+            key = self._key(s)
+            sid = self.ids.get(key)
+            if sid is None:
+                if not grow:
+                    continue
+                sid = self.ids[key] = len(self.skills)
+                self.skills.append(key)
+            ids.add(sid)
+        bits = 0
+        for sid in ids:
+            bits |= 1 << sid
+        return tuple(sorted(ids)), bits
+
+    def decode(self, bits):
+        out = []
+        while bits:
+            low = bits & -bits
+            out.append(self.skills[low.bit_length() - 1])
+            bits ^= low
+        return out
+
+    def signature(self, user_skills, experience, target_role):
+        # Skills outside every role's Core_Skills can't change a gap, so they
+        # are left out and near-identical profiles share one entry
+        ids, _ = self.encode(user_skills)
+        return (ids, experience_bucket(experience), target_role, self.version)
+
+    def gap(self, user_skills, target_role):
+        """Missing skills for the role, via bitwise AND-NOT. None if role unknown."""
+        role_bits = self.role_bits.get(target_role)
+        if role_bits is None:
+            return None
+        _, user_bits = self.encode(user_skills)
+        return self.decode(role_bits & ~user_bits)
+
+    def analyze(self, user_skills, experience, target_role):
+        """
+        Cached {gap_skills, roadmap} for a profile and target role, or None if
+        the role is unknown. Each call gets its own copy, so callers may mutate it.
+        (Target-role similarity depends on every skill through the embedding,
+        so it stays with RoleIndex.score, which is a single dot product.)
+        """
+        if target_role not in self.role_bits:
+            return None
+        key = self.signature(user_skills, experience, target_role)
+
+        def compute():
+            with span("get_gap_skills"):
+                gap_skills = self.gap(user_skills, target_role)
+            with span("generate_roadmap"):
+                roadmap = generate_roadmap(gap_skills)
+            return {"gap_skills": gap_skills, "roadmap": roadmap}
+
+        result = self.cache.get_or_compute(key, compute)
+        return {"gap_skills": list(result["gap_skills"]),
+                "roadmap": {month: list(skills) for month, skills in result["roadmap"].items()}}
@@ -0,0 +1,42 @@
+import resource
+import sys
+import time
+from contextlib import contextmanager
+
+# Wall-time + peak-memory reporting for offline jobs (training, rebuilds).
+
+def peak_rss_mb(children=False):
+    """Peak resident set size of this process (or of its finished children) in MB."""
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is KB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+class StageTimer:
+    """
+    Times named stages of a job and records peak RSS after each one.
+    Use as `with timer.stage("embed"): ...`, then `timer.report()`.
+    """
+
+    def __init__(self):
+        self.stages = [] # (name, seconds, peak MB, peak child MB)
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            peak, child = peak_rss_mb(), peak_rss_mb(children=True)
+            self.stages.append((name, elapsed, peak, child))
+            print(f"[{name}] {elapsed:.2f}s (peak RSS {peak:.0f} MB, workers {child:.0f} MB)")
+
+    def total(self):
+        return sum(s[1] for s in self.stages)
+
+    def report(self):
+        print(f"{'stage':<16} {'wall s':>8} {'peak MB':>8} {'workers MB':>11}")
+        for name, elapsed, peak, child in self.stages:
+            print(f"{name:<16} {elapsed:>8.2f} {peak:>8.0f} {child:>11.0f}")
+        print(f"{'total':<16} {self.total():>8.2f}")
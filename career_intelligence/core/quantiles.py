@@ -0,0 +1,185 @@
+import json
+import math
+
+import numpy as np
+
+# Streaming salary distributions.
+# A TDigest summarizes any number of salaries in ~compression/2 weighted
+# centroids: clusters are tiny near the tails and wide around the median, so
+# P10/P90 stay accurate. Digests merge by pooling centroids, so per-board
+# shards, per-day batches or bundle versions combine without the raw values.
+# SalarySketches keeps one digest per role category, skill, experience band
+# and role x band, and caches P10/P50/P90 per key for O(1) lookups.
+
+DEFAULT_COMPRESSION = 200
+PERCENTILES = (0.1, 0.5, 0.9)
+# Buffered values per digest before they are folded into the centroids
+_BUFFER_FACTOR = 5
+
+# (upper bound in years, inclusive; label)
+EXPERIENCE_BANDS = ((2, "0-2"), (5, "3-5"), (9, "6-9"), (math.inf, "10+"))
+
+def experience_band(years):
+    for upper, label in EXPERIENCE_BANDS:
+        if years <= upper:
+            return label
+    return EXPERIENCE_BANDS[-1][1]
+
+class TDigest:
+    """Mergeable quantile sketch (merging t-digest, k1 scale function)."""
+
+    def __init__(self, compression=DEFAULT_COMPRESSION):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = math.inf
+        self.max = -math.inf
+        self._buffer = [] # (means, weights) pairs not yet compressed
+        self._buffered = 0
+
+    @property
+    def count(self):
+        return float(self.weights.sum()) + sum(float(w.sum()) for _, w in self._buffer)
+
+    def add(self, values):
+        values = np.atleast_1d(np.asarray(values, dtype=np.float64))
+        values = values[np.isfinite(values)]
+        if not len(values):
+            return
+        self._push(values, np.ones(len(values)), values.min(), values.max())
+
+    def merge(self, other):
+        """Folds `other` into this digest; `other` is left unchanged."""
+        other._compress()
+        if len(other.weights):
+            self._push(other.means, other.weights, other.min, other.max)
+
+    def _push(self, means, weights, lo, hi):
+        self._buffer.append((means, weights))
+        self._buffered += len(means)
+        self.min = min(self.min, float(lo))
+        self.max = max(self.max, float(hi))
+        if self._buffered >= _BUFFER_FACTOR * self.compression:
+            self._compress()
+
+    def _compress(self):
+        if not self._buffer:
+            return
+        means = np.concatenate([self.means] + [m for m, _ in self._buffer])
+        weights = np.concatenate([self.weights] + [w for _, w in self._buffer])
+        self._buffer, self._buffered = [], 0
+
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        q = (np.cumsum(weights) - weights / 2) / weights.sum()
+        # Centroids sharing one unit of k(q) are combined: no Python loop,
+        # and the number of clusters stays bounded by compression / 2
+        k = np.floor(self.compression / (2 * np.pi) * (np.arcsin(2 * q - 1) + np.pi / 2)).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, k[1:] != k[:-1]])
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def quantile(self, q):
+        """Value at quantile q (scalar or array), interpolated between centroids."""
+        self._compress()
+        if not len(self.weights):
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else math.nan
+        positions = (np.cumsum(self.weights) - self.weights / 2) / self.weights.sum()
+        return np.interp(q, np.r_[0.0, positions, 1.0], np.r_[self.min, self.means, self.max])
+
+class SalarySketches:
+    """
+    Salary digests keyed by (dimension, value):
+      ("role", category), ("skill", skill), ("band", "3-5"), ("role_band", "Data Scientist|3-5")
+    """
+
+    def __init__(self, compression=DEFAULT_COMPRESSION):
+        self.compression = compression
+        self.digests = {}
+        self._summary = None
+
+    def __len__(self):
+        return len(self.digests)
+
+    def _digest(self, key):
+        digest = self.digests.get(key)
+        if digest is None:
+            digest = self.digests[key] = TDigest(self.compression)
+        return digest
+
+    def add_postings(self, categories, skill_lists, salaries, experience):
+        """
+        Adds one salary per posting under its role, each of its skills and, when
+        its experience is known (not None/NaN), its band and role x band.
+        """
+        groups = {}
+        for category, skills, salary, years in zip(categories, skill_lists, salaries, experience):
+            if not salary > 0: # Also drops NaN
+                continue
+            keys = [("role", category)]
+            if years is not None and years == years:
+                band = experience_band(years)
+                keys.extend([("band", band), ("role_band", f"{category}|{band}")])
+            keys.extend(("skill", s.lower()) for s in set(skills))
+            for key in keys:
+                groups.setdefault(key, []).append(salary)
+        # One vectorized add per key instead of one per posting
+        for key, values in groups.items():
+            self._digest(key).add(values)
+        self._summary = None
+
+    def merge(self, other):
+        """Folds another SalarySketches (a shard or a time window) into this one."""
+        for key, digest in other.digests.items():
+            self._digest(key).merge(digest)
+        self._summary = None
+        return self
+
+    def summary(self):
+        """{key: (p10, p50, p90, count)}, computed once per change."""
+        if self._summary is None:
+            self._summary = {key: tuple(float(v) for v in d.quantile(PERCENTILES)) + (int(d.count),)
+                             for key, d in self.digests.items()}
+        return self._summary
+
+    def percentiles(self, dimension, value):
+        """(p10, p50, p90, count) for e.g. ("role", "Data Scientist"), or None if unseen."""
+        if dimension == "skill":
+            value = value.lower()
+        return self.summary().get((dimension, value))
+
+    def quantile(self, dimension, value, q):
+        """Any other quantile straight from the digest."""
+        digest = self.digests.get((dimension, value.lower() if dimension == "skill" else value))
+        return digest.quantile(q) if digest is not None else None
+
+    # --- PERSISTENCE ---
+    def save(self, path):
+        keys = sorted(self.digests)
+        for key in keys:
+            self.digests[key]._compress()
+        sizes = [len(self.digests[k].weights) for k in keys]
+        meta = {"compression": self.compression, "keys": [list(k) for k in keys],
+                "summary": [list(self.summary()[k]) for k in keys]}
+        np.savez(path,
+                 means=np.concatenate([self.digests[k].means for k in keys]) if keys else np.empty(0),
+                 weights=np.concatenate([self.digests[k].weights for k in keys]) if keys else np.empty(0),
+                 offsets=np.concatenate(([0], np.cumsum(sizes))).astype(np.int64),
+                 bounds=np.asarray([(self.digests[k].min, self.digests[k].max) for k in keys]).reshape(-1, 2),
+                 meta=np.array(json.dumps(meta)))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            sketches = cls(meta['compression'])
+            # npz members are re-read on every access, so fetch each once
+            means, weights, offsets, bounds = data['means'], data['weights'], data['offsets'], data['bounds']
+        for i, key in enumerate(meta['keys']):
+            digest = TDigest(sketches.compression)
+            digest.means = means[offsets[i]:offsets[i + 1]]
+            digest.weights = weights[offsets[i]:offsets[i + 1]]
+            digest.min, digest.max = (float(v) for v in bounds[i])
+            sketches.digests[tuple(key)] = digest
+        sketches._summary = {tuple(k): tuple(s[:3]) + (int(s[3]),) for k, s in zip(meta['keys'], meta['summary'])}
+        return sketches
@@ -1,27 +1,235 @@
+import hashlib
 import joblib
 import numpy as np
 import os
+import threading
+from collections import OrderedDict
+
+from core.tracing import record_cache
+
+# Experience sweep used by the salary trajectory chart
+TRAJECTORY_YEARS = np.arange(0, 16)
+_TRAJECTORY_CACHE_SIZE = 1024
+_trajectory_cache = OrderedDict()
+# Streamlit sessions run on separate threads
+_trajectory_lock = threading.Lock()
+
+class CompiledForest:
+    """
+    A fitted RandomForestRegressor flattened into contiguous NumPy node arrays.
+    All trees share one set of arrays; `roots` holds each tree's first node.
+    Prediction walks every (tree, row) pair one level at a time, so the cost
+    is max_depth vectorized steps instead of sklearn's per-call overhead.
+    Node values are float64 like sklearn's, so outputs match model.predict.
+    `weights` (one per tree, optional) turn the mean over trees into a
+    weighted mean; appended forests use it so each batch of trees counts in
+    proportion to the rows it was fitted on.
+    """
+
+    def __init__(self, left, right, feature, threshold, value, roots, n_features, weights=None):
+        self.left = left
+        self.right = right
+        self.feature = feature
+        self.threshold = threshold
+        self.value = value
+        self.roots = roots
+        self.n_features = n_features
+        self.weights = weights
+
+    @classmethod
+    def from_sklearn(cls, model, n_rows=None):
+        """With `n_rows` (the training set size), each tree is weighted n_rows / n_trees."""
+        lefts, rights, features, thresholds, values, roots = [], [], [], [], [], []
+        offset = 0
+        for est in model.estimators_:
+            tree = est.tree_
+            is_leaf = tree.children_left == -1
+            # Re-base child pointers into the shared arrays; leaves point at themselves
+            node_ids = np.arange(tree.node_count) + offset
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left + offset))
+            rights.append(np.where(is_leaf, node_ids, tree.children_right + offset))
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            values.append(tree.value[:, 0, 0])
+            roots.append(offset)
+            offset += tree.node_count
+
+        return cls(
+            left=np.concatenate(lefts).astype(np.int32),
+            right=np.concatenate(rights).astype(np.int32),
+            feature=np.concatenate(features).astype(np.int32),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            value=np.concatenate(values).astype(np.float64),
+            roots=np.asarray(roots, dtype=np.int32),
+            n_features=model.n_features_in_,
+            weights=np.full(len(roots), n_rows / len(roots)) if n_rows else None,
+        )
+
+    def to_arrays(self):
+        arrays = {
+            "left": self.left, "right": self.right, "feature": self.feature,
+            "threshold": self.threshold, "value": self.value, "roots": self.roots,
+            "n_features": np.asarray(self.n_features),
+        }
+        if self.weights is not None:
+            arrays["weights"] = self.weights
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        return cls(
+            left=arrays["left"], right=arrays["right"], feature=arrays["feature"],
+            threshold=arrays["threshold"], value=arrays["value"], roots=arrays["roots"],
+            n_features=int(arrays["n_features"]), weights=arrays.get("weights"),
+        )
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def append(self, other):
+        """
+        New forest with `other`'s trees added after this one's, like sklearn's
+        warm_start adding estimators. Both forests need tree weights (see
+        from_sklearn), otherwise a small batch of trees fitted on a few new
+        rows would count as much as the trees fitted on the whole corpus.
+        """
+        if self.weights is None or other.weights is None:
+            raise ValueError("append needs per-tree weights on both forests")
+        offset = len(self.value)
+        return CompiledForest(
+            left=np.concatenate([self.left, other.left + offset]).astype(np.int32),
+            right=np.concatenate([self.right, other.right + offset]).astype(np.int32),
+            feature=np.concatenate([self.feature, other.feature]),
+            threshold=np.concatenate([self.threshold, other.threshold]),
+            value=np.concatenate([self.value, other.value]),
+            roots=np.concatenate([self.roots, other.roots + offset]).astype(np.int32),
+            n_features=self.n_features,
+            weights=np.concatenate([self.weights, other.weights]).astype(np.float64),
+        )
+
+    def predict(self, X):
+        # sklearn compares float32 features against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        n = X.shape[0]
+        rows = np.broadcast_to(np.arange(n), (len(self.roots), n))
+        nodes = np.repeat(self.roots[:, None], n, axis=1)
+
+        while True:
+            nxt = np.where(
+                X[rows, self.feature[nodes]] <= self.threshold[nodes],
+                self.left[nodes],
+                self.right[nodes],
+            )
+            # Leaves point at themselves, so the walk ends when nothing moves
+            if np.array_equal(nxt, nodes):
+                break
+            nodes = nxt
+
+        if self.weights is None:
+            return self.value[nodes].mean(axis=0)
+        return self.weights @ self.value[nodes] / self.weights.sum()
+
+def compile_forest(model, n_rows=None):
+    """Flattens a RandomForestRegressor into a CompiledForest (trees weighted by n_rows if given)."""
+    return CompiledForest.from_sklearn(model, n_rows=n_rows)
+
+def build_features(user_embeddings, experience_years, out=None):
+    """
+    Writes [Emb_0, ..., Emb_383, Experience] rows into one (n, 385) buffer.
+    Pass `out` to reuse a preallocated buffer across calls.
+    """
+    user_embeddings = np.atleast_2d(user_embeddings)
+    n, dim = user_embeddings.shape
+    if out is None or out.shape[0] < n or out.shape[1] != dim + 1:
+        out = np.empty((n, dim + 1), dtype=np.float32)
+    out = out[:n]
+    out[:, :dim] = user_embeddings
+    out[:, dim] = experience_years
+    return out
 
 def predict_salary(model, user_embedding, experience_years):
     """
     Predicts salary range based on user embedding + experience.
-    Model is expected to be a RandomForestRegressor.
+    Model is expected to be a RandomForestRegressor or a CompiledForest.
     Input Feature Vector: [Emb_0, ..., Emb_383, Experience]
     """
     if model is None:
         return (0, 0)
-        
-    # Create feature vector
-    # embedding is (384,), need to append experience
-    features = np.append(user_embedding, experience_years)
-    
-    # Reshape for prediction (1, 385)
-    features = features.reshape(1, -1)
-    
+
+    # Single (1, 385) row through the same path as the batch predictor
+    features = build_features(user_embedding, experience_years)
+
     predicted_avg = model.predict(features)[0]
-    
+
     # Create a nice range +/- 15%
     low = predicted_avg * 0.85
     high = predicted_avg * 1.15
-    
+
     return round(low, 1), round(high, 1)
+
+def predict_salary_batch(model, user_embeddings, experience_years, out=None):
+    """
+    Batch version of predict_salary for many profiles at once.
+    user_embeddings: (n, 384) matrix, experience_years: length-n vector.
+    Returns (low, high) arrays with the same +/- 15% band, one model call total.
+    """
+    n = len(user_embeddings)
+    if model is None or n == 0:
+        return np.zeros(n), np.zeros(n)
+
+    features = build_features(user_embeddings, np.asarray(experience_years, dtype=np.float32), out=out)
+    predicted_avg = model.predict(features)
+
+    low = np.round(predicted_avg * 0.85, 1)
+    high = np.round(predicted_avg * 1.15, 1)
+    return low, high
+
+def _model_version(model):
+    """
+    Bundle-loaded models carry an explicit version. Anything else is identified
+    by a hash of its compiled node arrays (computed once, kept on the model):
+    id() could be reused by a different model after garbage collection.
+    """
+    version = getattr(model, 'version', None)
+    if version:
+        return version
+    digest = getattr(model, '_content_hash', None)
+    if digest is None:
+        forest = model if isinstance(model, CompiledForest) else compile_forest(model)
+        h = hashlib.sha1()
+        for array in forest.to_arrays().values():
+            h.update(np.ascontiguousarray(array).tobytes())
+        digest = model._content_hash = h.hexdigest()
+    return digest
+
+def salary_trajectory(model, user_embedding, experience_levels=TRAJECTORY_YEARS):
+    """
+    Predicted salary range for one profile across many experience levels.
+    The whole sweep is a single batched prediction (one row per level), and
+    results are cached per (profile vector hash, model version).
+    Returns (years, low, high) arrays.
+    """
+    years = np.asarray(experience_levels, dtype=np.float32)
+    if model is None:
+        return years, np.zeros(len(years)), np.zeros(len(years))
+
+    vec = np.ascontiguousarray(user_embedding, dtype=np.float32)
+    key = (hashlib.sha1(vec.tobytes()).hexdigest(), _model_version(model), years.tobytes())
+    with _trajectory_lock:
+        cached = _trajectory_cache.get(key)
+        if cached is not None:
+            _trajectory_cache.move_to_end(key)
+    record_cache("salary_trajectory", hits=cached is not None, misses=cached is None)
+    if cached is not None:
+        return cached
+
+    embeddings = np.broadcast_to(vec, (len(years), vec.shape[-1]))
+    low, high = predict_salary_batch(model, embeddings, years)
+    result = (years, low, high)
+
+    with _trajectory_lock:
+        _trajectory_cache[key] = result
+        if len(_trajectory_cache) > _TRAJECTORY_CACHE_SIZE:
+            _trajectory_cache.popitem(last=False)
+    return result
@@ -1,26 +1,172 @@
+import re
+from collections import deque
+
 # Comprehensive Tech Skill Whitelist to filter out noise
 VALID_SKILLS = {
     # Languages
     "python", "java", "c++", "c#", "javascript", "typescript", "golang", "rust", "swift", "kotlin", "php", "ruby", "scala", "r", "c",
-    
+
     # Frameworks & Libraries
-    "react", "angular", "vue", "next.js", "node.js", "django", "flask", "fastapi", "spring boot", "ruby on rails", "laravel", 
+    "react", "angular", "vue", "next.js", "node.js", "django", "flask", "fastapi", "spring boot", "ruby on rails", "laravel",
     "tensorflow", "pytorch", "scikit-learn", "keras", "pandas", "numpy", "matplotlib", "seaborn", "nltk", "spacy", "opencv",
     "express.js", "graphql", "redux", "jquery", "bootstrap", "tailwind",
-    
+
     # Data & Databases
-    "sql", "mysql", "postgresql", "mongodb", "redis", "elasticsearch", "cassandra", "dynamodb", "oracle", "sql server", 
+    "sql", "mysql", "postgresql", "mongodb", "redis", "elasticsearch", "cassandra", "dynamodb", "oracle", "sql server",
     "firebase", "snowflake", "bigquery", "redshift", "spark", "hadoop", "kafka", "airflow", "tableau", "power bi", "looker",
-    
+
     # DevOps & Cloud
     "aws", "azure", "gcp", "docker", "kubernetes", "jenkins", "gitlab ci", "github actions", "circleci", "terraform", "ansible",
     "linux", "bash", "git", "nginx", "apache", "prometheus", "grafana", "elk stack", "splunk", "datadog",
-    
+
     # Algorithms & Others
     "machine learning", "deep learning", "nlp", "computer vision", "data structures", "algorithms", "system design",
     "microservices", "rest api", "soap", "agile", "scrum", "jira"
 }
 
+# Alternate spellings / abbreviations -> canonical whitelist entry
+SKILL_ALIASES = {
+    # Languages
+    "py": "python", "python3": "python", "js": "javascript", "es6": "javascript", "ecmascript": "javascript",
+    "ts": "typescript", "go": "golang", "cpp": "c++", "csharp": "c#", "c sharp": "c#",
+    # Frameworks & Libraries
+    "reactjs": "react", "react.js": "react", "react js": "react", "angularjs": "angular", "angular.js": "angular",
+    "vuejs": "vue", "vue.js": "vue", "nextjs": "next.js", "next": "next.js",
+    "node": "node.js", "nodejs": "node.js", "node js": "node.js", "express": "express.js", "expressjs": "express.js",
+    "spring": "spring boot", "springboot": "spring boot", "rails": "ruby on rails", "ror": "ruby on rails",
+    "tf": "tensorflow", "torch": "pytorch", "sklearn": "scikit-learn", "scikit learn": "scikit-learn",
+    "open cv": "opencv", "tailwindcss": "tailwind", "tailwind css": "tailwind",
+    # Data & Databases
+    "postgres": "postgresql", "psql": "postgresql", "mongo": "mongodb", "elastic": "elasticsearch",
+    "elastic search": "elasticsearch", "dynamo": "dynamodb", "mssql": "sql server", "ms sql": "sql server",
+    "apache spark": "spark", "pyspark": "spark", "apache kafka": "kafka", "apache airflow": "airflow", "powerbi": "power bi",
+    # DevOps & Cloud
+    "amazon web services": "aws", "microsoft azure": "azure", "google cloud": "gcp", "google cloud platform": "gcp",
+    "k8s": "kubernetes", "kube": "kubernetes", "gitlab-ci": "gitlab ci", "gh actions": "github actions",
+    "shell": "bash", "shell scripting": "bash", "elk": "elk stack",
+    # Algorithms & Others
+    "ml": "machine learning", "dl": "deep learning", "natural language processing": "nlp", "cv": "computer vision",
+    "rest": "rest api", "restful": "rest api", "restful api": "rest api", "restful apis": "rest api", "rest apis": "rest api",
+    "micro services": "microservices", "microservice": "microservices",
+}
+
+# Too ambiguous to pick out of free text; still accepted as explicit tags
+TAG_ONLY = {"c", "r", "go", "ts", "tf", "cv", "ml", "dl", "py", "js", "next", "rest", "spring", "shell",
+            "express", "node", "elastic", "kube", "oracle", "apache", "swift", "rust", "git", "soap", "spark"}
+
+def normalize_skill(text):
+    """Canonical whitelist name for a skill or alias, or None if unknown."""
+    key = " ".join(str(text).lower().split())
+    if key in VALID_SKILLS:
+        return key
+    return SKILL_ALIASES.get(key)
+
+def canonical_skill(text):
+    """Whitelist name for known skills and aliases ("ReactJS" -> react), else the lowercased text."""
+    return normalize_skill(text) or " ".join(str(text).lower().split())
+
 def filter_skills(skill_list):
-    """Returns only valid technical skills from a list."""
-    return [s for s in skill_list if s.lower() in VALID_SKILLS]
+    """Returns only valid technical skills from a list, mapped through aliases and deduped."""
+    out = []
+    for s in skill_list:
+        canon = normalize_skill(s)
+        if canon is not None and canon not in out:
+            out.append(canon)
+    return out
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over every skill name and alias.
+    `extract` scans text in one linear pass regardless of how many patterns
+    exist, keeping matches that sit on word boundaries. Overlapping matches
+    resolve to the longest one ("apache spark" beats "spark").
+    """
+
+    def __init__(self, patterns):
+        # patterns: {surface form (lowercase): canonical skill}
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [None] # pattern ending exactly at this state: (length, canonical)
+        for surface, canon in patterns.items():
+            self._add(surface, canon)
+        self._build_links()
+
+    def _add(self, surface, canon):
+        state = 0
+        for ch in surface:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(None)
+            state = nxt
+        self._out[state] = (len(surface), canon)
+
+    def _build_links(self):
+        # BFS, so a state's fail target (always shallower) is finished before it
+        goto, fail = self._goto, self._fail
+        self._outputs = [[] for _ in goto]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            own = [self._out[state]] if self._out[state] else []
+            self._outputs[state] = own + self._outputs[fail[state]]
+            for ch, nxt in goto[state].items():
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                queue.append(nxt)
+
+    def extract(self, text):
+        """Canonical skills found in `text`, in order of first appearance."""
+        text = text.lower()
+        n = len(text)
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        spans = []
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, canon in outputs[state]:
+                start = i - length + 1
+                # Word boundaries on both sides
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if i + 1 < n and text[i + 1].isalnum():
+                    continue
+                spans.append((start, i + 1, canon))
+
+        # Longest match wins where spans overlap
+        spans.sort(key=lambda s: (s[0], -(s[1] - s[0])))
+        found = []
+        end = -1
+        for start, stop, canon in spans:
+            if start < end:
+                continue
+            end = stop
+            if canon not in found:
+                found.append(canon)
+        return found
+
+_default_matcher = None
+
+def get_matcher():
+    """Shared matcher over the whitelist + aliases, minus ambiguous short forms."""
+    global _default_matcher
+    if _default_matcher is None:
+        patterns = {s: s for s in VALID_SKILLS if s not in TAG_ONLY}
+        patterns.update({a: c for a, c in SKILL_ALIASES.items() if a not in TAG_ONLY})
+        _default_matcher = SkillMatcher(patterns)
+    return _default_matcher
+
+_TAG_RE = re.compile(r'<[^>]+>')
+
+def extract_skills(text):
+    """Canonical skills mentioned in a title or job description (HTML allowed)."""
+    if not text:
+        return []
+    return get_matcher().extract(_TAG_RE.sub(' ', text))
@@ -0,0 +1,70 @@
+import threading
+import time
+
+# Startup timing registry + background warm-up.
+# The app records how long its imports took and hands slow loaders (encoder,
+# model artifacts) to a WarmUp thread right after boot, so the first
+# "Generate Insights" click doesn't pay for them.
+
+_timings = {}
+_lock = threading.Lock()
+
+def record_timing(name, seconds):
+    with _lock:
+        _timings[name] = seconds
+
+def startup_report():
+    """Returns {step: seconds} for everything recorded so far."""
+    with _lock:
+        return dict(_timings)
+
+def format_report(report=None):
+    report = startup_report() if report is None else report
+    return ", ".join(f"{k}={v * 1000:.0f}ms" for k, v in report.items())
+
+class WarmUp:
+    """
+    Runs named loader callables on a daemon thread, in order.
+    `result(name)` blocks until that loader has finished and returns its value
+    (re-raising its exception, if any).
+    """
+
+    def __init__(self, tasks):
+        self._tasks = list(tasks.items())
+        self._results = {}
+        self._errors = {}
+        self._done = {name: threading.Event() for name, _ in self._tasks}
+        self._thread = threading.Thread(target=self._run, name="warmup", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        for name, fn in self._tasks:
+            start = time.perf_counter()
+            try:
+                self._results[name] = fn()
+            except Exception as e:
+                self._errors[name] = e
+                print(f"Warm-up step '{name}' failed: {e}")
+            finally:
+                record_timing(f"warmup.{name}", time.perf_counter() - start)
+                self._done[name].set()
+        print(f"Warm-up finished: {format_report()}")
+
+    def is_ready(self, name=None):
+        if name is None:
+            return all(e.is_set() for e in self._done.values())
+        return self._done[name].is_set()
+
+    def result(self, name, timeout=None):
+        if not self._done[name].wait(timeout):
+            raise TimeoutError(f"Warm-up step '{name}' still running")
+        if name in self._errors:
+            raise self._errors[name]
+        return self._results.get(name)
+
+def start_warmup(tasks):
+    """Creates and starts a WarmUp for {name: callable}."""
+    return WarmUp(tasks).start()
@@ -0,0 +1,157 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Role taxonomy: raw job titles -> the role categories used for prototypes.
+# Titles are normalized (case, punctuation, seniority and boilerplate
+# stripped), then classified once per distinct normalized title:
+#   1. keyword rules on whole words / bigrams, in priority order
+#   2. titles no rule claims: one batched encode + nearest category centroid
+# Real corpora repeat titles heavily, so bulk classification is a factorize,
+# a pass over the distinct titles (memoized across calls) and a gather.
+
+DEFAULT_CATEGORY = 'Software Engineer'
+
+# Priority order: the first category with a matching phrase wins
+# ("Full Stack React Developer" is full stack, not frontend)
+RULES = [
+    ('Full Stack Developer', ["full stack", "fullstack"]),
+    ('Data Scientist', ["data scientist", "data science"]),
+    ('Machine Learning Engineer', ["machine learning", "ml", "ai", "deep learning", "mlops", "nlp",
+                                   "computer vision", "llm", "genai"]),
+    ('DevOps Engineer', ["devops", "sre", "site reliability", "cloud", "platform engineer",
+                         "infrastructure", "kubernetes"]),
+    ('Frontend Engineer', ["frontend", "front end", "react", "vue", "angular", "web developer", "ui engineer"]),
+    ('Backend Engineer', ["backend", "back end", "api", "node", "nodejs", "django", "server side"]),
+    ('Product Manager', ["product manager", "product owner", "head of product", "product lead"]),
+]
+
+# Short descriptions embedded once into per-category centroids for the fallback
+CATEGORY_DESCRIPTIONS = {
+    'Frontend Engineer': ["frontend engineer", "web ui developer", "javascript user interface engineer"],
+    'Backend Engineer': ["backend engineer", "server side developer", "api and database engineer"],
+    'Machine Learning Engineer': ["machine learning engineer", "artificial intelligence engineer", "deep learning researcher"],
+    'Data Scientist': ["data scientist", "statistician", "data analyst building predictive models"],
+    'DevOps Engineer': ["devops engineer", "site reliability engineer", "cloud infrastructure engineer"],
+    'Product Manager': ["product manager", "product owner", "product strategy lead"],
+    'Full Stack Developer': ["full stack developer", "frontend and backend web developer"],
+    DEFAULT_CATEGORY: ["software engineer", "software developer", "programmer"],
+}
+# Below this cosine similarity the fallback gives up and uses DEFAULT_CATEGORY
+MIN_SIMILARITY = 0.35
+
+# "lead" is kept: it's part of role phrases like "product lead"
+_SENIORITY = {"senior", "sr", "junior", "jr", "staff", "principal", "intern", "mid", "level",
+              "i", "ii", "iii", "iv", "entry", "associate"}
+_BOILERPLATE = re.compile(r'\([^)]*\)|\[[^\]]*\]|\b(remote|hybrid|onsite|m/f/d|w/m/d|f/m/d)\b')
+_NON_WORD = re.compile(r'[^a-z0-9+#]+')
+
+def _words(text):
+    return " ".join(w for w in _NON_WORD.split(text) if w and w not in _SENIORITY)
+
+def normalize_title(title):
+    """'Sr. Full-Stack Developer (Remote)' -> 'full stack developer'."""
+    t = _BOILERPLATE.sub(' ', str(title).lower())
+    # "Backend Engineer - Payments": the team/location suffix isn't the role, but in
+    # "Senior Engineer - Frontend" it is, so it's only dropped when the head matches a rule
+    head, sep, _ = t.partition(' - ')
+    if sep and _rule_category(_words(head)):
+        t = head
+    return _words(t)
+
+def _rule_category(normalized):
+    tokens = normalized.split()
+    grams = set(tokens)
+    grams.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    grams.update(f"{a} {b} {c}" for a, b, c in zip(tokens, tokens[1:], tokens[2:]))
+    for category, phrases in RULES:
+        if any(p in grams for p in phrases):
+            return category
+    return None
+
+class RoleTaxonomy:
+    """
+    Bulk title classifier with a memo of distinct normalized titles.
+    `encode_fn(list_of_str) -> (n, d) array` powers the nearest-centroid
+    fallback; without it unmatched titles get DEFAULT_CATEGORY.
+    """
+
+    def __init__(self, encode_fn=None, max_cache=500000):
+        self.encode_fn = encode_fn
+        self.max_cache = max_cache
+        self._cache = {}
+        self._centroids = None
+        self._centroid_names = list(CATEGORY_DESCRIPTIONS)
+        self.stats = {"rule": 0, "centroid": 0, "default": 0, "cache_hits": 0}
+
+    def _centroid_matrix(self):
+        if self._centroids is None:
+            phrases = [p for name in self._centroid_names for p in CATEGORY_DESCRIPTIONS[name]]
+            vectors = np.asarray(self.encode_fn(phrases), dtype=np.float32)
+            sizes = [len(CATEGORY_DESCRIPTIONS[name]) for name in self._centroid_names]
+            starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+            centroids = np.add.reduceat(vectors, starts, axis=0)
+            self._centroids = centroids / np.linalg.norm(centroids, axis=1, keepdims=True)
+        return self._centroids
+
+    def _nearest(self, titles):
+        vectors = np.asarray(self.encode_fn(titles), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        scores = (vectors / norms) @ self._centroid_matrix().T
+        best = np.argmax(scores, axis=1)
+        return [self._centroid_names[b] if scores[i, b] >= MIN_SIMILARITY else None
+                for i, b in enumerate(best)]
+
+    def _classify_distinct(self, titles):
+        # Bounded memo: start over rather than evict piecemeal
+        if len(self._cache) + len(titles) > self.max_cache:
+            self._cache.clear()
+        todo = [t for t in titles if t not in self._cache]
+        self.stats["cache_hits"] += len(titles) - len(todo)
+
+        unmatched = []
+        for t in todo:
+            category = _rule_category(t) if t else DEFAULT_CATEGORY
+            if category is None:
+                unmatched.append(t)
+            else:
+                self._cache[t] = category
+                self.stats["rule"] += 1
+
+        if unmatched:
+            # One encoder call for every title the rules couldn't place
+            nearest = self._nearest(unmatched) if self.encode_fn else [None] * len(unmatched)
+            for t, category in zip(unmatched, nearest):
+                self._cache[t] = category or DEFAULT_CATEGORY
+                self.stats["centroid" if category else "default"] += 1
+
+        return np.array([self._cache[t] for t in titles], dtype=object)
+
+    def classify(self, titles):
+        """Categories for an iterable of raw titles, as an object array aligned with the input."""
+        titles = pd.Series(list(titles), dtype=object).fillna('')
+        if titles.empty:
+            return np.array([], dtype=object)
+        codes, raw_unique = pd.factorize(titles)
+        norm_codes, norm_unique = pd.factorize(pd.Series([normalize_title(t) for t in raw_unique]))
+        labels = self._classify_distinct(list(norm_unique))
+        return labels[norm_codes][codes]
+
+    def classify_one(self, title):
+        return self.classify([title])[0]
+
+_default_taxonomy = None
+
+def get_taxonomy():
+    """Shared taxonomy using the app's embedder for the fallback."""
+    global _default_taxonomy
+    if _default_taxonomy is None:
+        from nlp.embedder import get_embedding
+        _default_taxonomy = RoleTaxonomy(encode_fn=get_embedding)
+    return _default_taxonomy
+
+def classify_titles(titles):
+    """Bulk replacement for the old per-row map_role_category."""
+    return get_taxonomy().classify(titles)
@@ -0,0 +1,239 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Lightweight request-path tracing + metrics.
+# `span(name)` times a stage into a per-name latency histogram; spans opened
+# inside another span on the same thread are kept as that trace's breakdown,
+# and the most recent root traces are retained for inspection. Cache hit
+# rates are counted with record_cache(), and existing caches can expose their
+# own stats via register_source(). Everything is exported by snapshot(), a
+# local /metrics HTTP endpoint or a periodic JSON dump.
+#
+# Off unless CAREER_TRACING=1 (or enable() is called): a disabled span is a
+# shared no-op context manager, so instrumented code pays one flag check.
+#   CAREER_METRICS_PORT=9108  -> serve JSON at http://127.0.0.1:9108/metrics
+#   CAREER_METRICS_FILE=path  -> rewrite a JSON snapshot every 30 s
+
+# Latency histogram bucket upper bounds, in ms (the last bucket is open-ended)
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+RECENT_TRACES = 50
+
+_enabled = os.environ.get('CAREER_TRACING', '0') not in ('0', '', 'false')
+_lock = threading.Lock()
+_histograms = {}
+_caches = {}
+_sources = {}
+_traces = deque(maxlen=RECENT_TRACES)
+_local = threading.local()
+
+def enable(on=True):
+    global _enabled
+    _enabled = on
+
+def is_enabled():
+    return _enabled
+
+class Histogram:
+    """Fixed-bucket latency histogram with count, sum and max."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms):
+        i = 0
+        while i < len(BUCKETS_MS) and ms > BUCKETS_MS[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th observation (max for the open bucket)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                return BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": self.quantile(0.5), "p95_ms": self.quantile(0.95), "p99_ms": self.quantile(0.99),
+            "max_ms": self.max_ms,
+            "buckets": {("inf" if i == len(BUCKETS_MS) else str(BUCKETS_MS[i])): c
+                        for i, c in enumerate(self.counts) if c},
+        }
+
+def _observe(name, ms):
+    # Caller holds _lock
+    hist = _histograms.get(name)
+    if hist is None:
+        hist = _histograms[name] = Histogram()
+    hist.add(ms)
+
+def observe(name, ms):
+    """
+    Records a duration measured elsewhere. Use this instead of span() around
+    awaits: interleaved coroutines on one thread would tangle the span stack.
+    """
+    if not _enabled:
+        return
+    with _lock:
+        _observe(name, ms)
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NOOP = _NoopSpan()
+
+class _Span:
+    __slots__ = ("name", "start", "children")
+
+    def __init__(self, name):
+        self.name = name
+        self.children = []
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        ms = (time.perf_counter() - self.start) * 1000
+        stack = _local.stack
+        stack.pop()
+        with _lock:
+            _observe(self.name, ms)
+            if not stack:
+                _traces.append({"name": self.name, "at": time.strftime("%H:%M:%S"), "ms": round(ms, 3),
+                                "stages": self.children})
+        if stack:
+            stack[-1].children.append((self.name, round(ms, 3)))
+        return False
+
+def span(name):
+    """`with span("embed"):` times the block when tracing is enabled."""
+    return _Span(name) if _enabled else _NOOP
+
+def traced(name):
+    """Decorator form of span()."""
+    def wrap(fn):
+        def inner(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(name):
+                return fn(*args, **kwargs)
+        inner.__name__ = fn.__name__
+        inner.__doc__ = fn.__doc__
+        inner.__wrapped__ = fn
+        return inner
+    return wrap
+
+def record_cache(name, hits=0, misses=0):
+    """Adds cache hit/miss counts under `name`."""
+    if not _enabled:
+        return
+    with _lock:
+        entry = _caches.setdefault(name, [0, 0])
+        entry[0] += hits
+        entry[1] += misses
+
+def register_source(name, fn):
+    """Includes `fn()` (e.g. a cache's own stats()) in every snapshot."""
+    with _lock:
+        _sources[name] = fn
+
+def snapshot():
+    with _lock:
+        spans = {name: h.to_dict() for name, h in sorted(_histograms.items())}
+        caches = {name: {"hits": h, "misses": m, "hit_rate": h / (h + m) if h + m else 0.0}
+                  for name, (h, m) in sorted(_caches.items())}
+        traces = list(_traces)
+        sources = dict(_sources)
+    for name, fn in sources.items():
+        try:
+            caches[name] = fn()
+        except Exception as e:
+            caches[name] = {"error": str(e)}
+    return {"enabled": _enabled, "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "spans": spans,
+            "caches": caches, "recent_traces": traces}
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _caches.clear()
+        _traces.clear()
+
+# --- EXPORT ---
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = json.dumps(snapshot(), default=float).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass # Keep scrapes out of the app's console
+
+def start_metrics_server(port, host='127.0.0.1'):
+    """Serves snapshot() as JSON at http://host:port/metrics from a daemon thread."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    print(f"Metrics at http://{host}:{port}/metrics")
+    return server
+
+def start_json_dump(path, interval=30.0):
+    """Rewrites snapshot() to `path` every `interval` seconds from a daemon thread."""
+    def loop():
+        while True:
+            time.sleep(interval)
+            try:
+                with open(path + '.tmp', 'w') as f:
+                    json.dump(snapshot(), f, indent=2, default=float)
+                os.replace(path + '.tmp', path)
+            except OSError as e:
+                # Full disk, missing directory...: skip this dump, try again next interval
+                print(f"Metrics dump to {path} failed: {e}")
+    threading.Thread(target=loop, name="metrics-dump", daemon=True).start()
+
+def start_exporters_from_env():
+    """Starts whichever exporters CAREER_METRICS_PORT / CAREER_METRICS_FILE ask for."""
+    if not _enabled:
+        return
+    port = os.environ.get('CAREER_METRICS_PORT')
+    if port:
+        try:
+            start_metrics_server(int(port))
+        except OSError as e:
+            # Another app worker already owns the port
+            print(f"Metrics server not started: {e}")
+    path = os.environ.get('CAREER_METRICS_FILE')
+    if path:
+        start_json_dump(path)
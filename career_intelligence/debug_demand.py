@@ -1,17 +1,17 @@
-import joblib
 import os
-import pandas as pd
-from collections import Counter
+
+from core.artifacts import current_bundle_dir, load_artifacts
+from core.jobstore import JobStore, JobTable, read_legacy_csv
 
 # access local files
 base_dir = os.path.dirname(os.path.abspath(__file__))
-demand_map_path = os.path.join(base_dir, 'models', 'demand_map.pkl')
+model_dir = os.path.join(base_dir, 'models')
 jobs_csv_path = os.path.join(base_dir, 'data', 'jobs.csv')
 
-print(f"Checking demand map at: {demand_map_path}")
+print(f"Checking demand map in: {model_dir}")
 
-if os.path.exists(demand_map_path):
-    demand_map = joblib.load(demand_map_path)
+if current_bundle_dir(model_dir) or os.path.exists(os.path.join(model_dir, 'demand_map.pkl')):
+    _, _, demand_map = load_artifacts(model_dir)
     print("\n--- Demand Map (Sample) ---")
     # Sort by value
     sorted_demand = sorted(demand_map.items(), key=lambda x: x[1], reverse=True)
@@ -21,35 +21,23 @@ if os.path.exists(demand_map_path):
     print(f"\nScore for 'machine learning': {demand_map.get('machine learning', 'NOT FOUND')}")
     print(f"Score for 'python': {demand_map.get('python', 'NOT FOUND')}")
 
-if os.path.exists(jobs_csv_path):
-    print(f"\nChecking jobs data at: {jobs_csv_path}")
-    df = pd.read_csv(jobs_csv_path)
-    # Check simple counts
-    # Skills are stored as string representation of list in CSV, need to parse
-    # But wait, generate_data.py imports fetch_remoteok_jobs which saves it. 
-    # Or generate_mock_data saves it.
-    
-    # In generate_data.py: df.to_csv(..., index=False)
-    # The 'Skills' column might be a string literal of a list "['a', 'b']"
-    
-    import ast
-    try:
-        all_skills = []
-        for raw in df['Skills']:
-            # it might be a list if not saved to csv yet, but reading from csv makes it str
-            if isinstance(raw, str):
-                try:
-                    s_list = ast.literal_eval(raw)
-                    all_skills.extend([s.lower() for s in s_list])
-                except:
-                    pass
-        
-        counts = Counter(all_skills)
-        print("\n--- Raw Counts from CSV ---")
-        print(f"Total jobs: {len(df)}")
-        print(f"Python count: {counts['python']}")
-        print(f"Machine Learning count: {counts['machine learning']}")
-        if counts['python'] > 0:
-            print(f"Ratio ML/Python: {counts['machine learning'] / counts['python']:.2f}")
-    except Exception as e:
-        print(f"Error parsing CSV: {e}")
+store = JobStore()
+if store.partitions():
+    print(f"\nChecking job store at: {store.root}")
+    # Skills are dictionary-encoded IDs, so counting is one np.bincount
+    table = store.scan()
+elif os.path.exists(jobs_csv_path):
+    # Read-only: count the legacy CSV in memory (JobStore.import_csv migrates it)
+    print(f"\nJob store is empty; checking legacy jobs data at: {jobs_csv_path}")
+    table = JobTable.from_records(read_legacy_csv(jobs_csv_path).to_dict('records'), store.vocab)
+else:
+    table = None
+
+if table is not None:
+    counts = table.skill_count_map()
+    print("\n--- Raw Counts ---")
+    print(f"Total jobs: {len(table)}")
+    print(f"Python count: {counts.get('python', 0)}")
+    print(f"Machine Learning count: {counts.get('machine learning', 0)}")
+    if counts.get('python', 0) > 0:
+        print(f"Ratio ML/Python: {counts.get('machine learning', 0) / counts['python']:.2f}")
@@ -1,10 +1,17 @@
 import pandas as pd
 import numpy as np
-import joblib
+import argparse
 import os
 import random
+import time
 from sklearn.ensemble import RandomForestRegressor
-from nlp.embedder import get_mean_embedding
+from collections import Counter
+from core.artifacts import (current_bundle_dir, load_artifacts, load_skill_graph, load_sketches, load_state,
+                            publish_bundle)
+from core.salary import compile_forest
+from core.taxonomy import classify_titles
+from core.profiling import StageTimer
+from nlp.embedder import MODEL_NAME, extend_skill_cache, get_embedding, get_mean_embeddings
 
 # Setup Paths
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -14,6 +21,12 @@ MODEL_DIR = os.path.join(BASE_DIR, 'models')
 os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(MODEL_DIR, exist_ok=True)
 
+# Incremental refresh: trees fitted on each batch of new postings (weighted by
+# their row count), and the size at which the forest is refitted from scratch
+# on every consumed posting instead of growing further
+REFRESH_TREES = 10
+MAX_TREES = 300
+
 # Mock Data Config
 ROLES = [
     ("Frontend Engineer", ["react", "javascript", "html", "css", "typescript", "git", "redux"], 5.0, 18.0),
@@ -25,25 +38,42 @@ ROLES = [
     ("Full Stack Developer", ["react", "python", "node.js", "sql", "mongo", "aws", "git"], 6.0, 24.0)
 ]
 
-from core.ingestion import fetch_remoteok_jobs
+from core.boards import BOARDS
+from core.fetcher import run_multi_source_ingestion
+from core.cooccurrence import SkillGraph
+from core.demand import DemandEngine, ENGINE_PATH
+from core.jobstore import JobStore
+from core.quantiles import SalarySketches
+
+def ingest_live(store):
+    """
+    Appends live postings from every job board not already in data/jobs/ and
+    updates the demand engine. The engine at ENGINE_PATH is the ingestion-side
+    state; the app reads the copy published with each bundle. Salary sketches
+    are built from the stored parts by train_models / refresh_models.
+    """
+    engine = DemandEngine.load() if os.path.exists(ENGINE_PATH) else DemandEngine()
+    run_multi_source_ingestion(store=store, demand=engine)
+    engine.save()
 
 def generate_mock_data(n=300):
+    """
+    Returns (df, parts): the training postings and the JobStore part keys
+    they were read from, so the bundle records exactly what it consumed.
+    """
     # Try Live Data First
     try:
         print("Attempting to fetch Live Data...")
-        df_live = fetch_remoteok_jobs()
+        # Incremental: only postings not already in data/jobs/ are appended
+        store = JobStore()
+        ingest_live(store)
+        parts = store.partitions(sources=[b.name for b in BOARDS.values()])
+        df_live = store.read_parts(parts).to_frame()
         if not df_live.empty:
-            # We need to map live data columns to match what train_models expects
-            # Live Data cols: Role, Company, Skills, Salary, Min_Salary, Max_Salary, Experience, Source
+            # Stored cols: Job_ID, Role, Company, Skills, Salary, Min_Salary, Max_Salary, Experience, Source
             # Expected cols: Role, Skills, Salary, Experience
-            
-            # The ingestion script already normalizes it well.
-            # Let's just filter/select needed columns for CSV
-            df_final = df_live[['Role', 'Skills', 'Salary', 'Experience']]
-            
-            # Save Raw Data
-            df_final.to_csv(os.path.join(DATA_DIR, 'jobs.csv'), index=False)
-            return df_final
+            df_final = df_live[['Role', 'Skills', 'Salary', 'Experience', 'Experience_Imputed']].copy()
+            return df_final, _part_keys(store, parts)
     except Exception as e:
         print(f"Live data fetch failed: {e}. Falling back to mock.")
 
@@ -77,89 +107,313 @@ def generate_mock_data(n=300):
             "Role": role_name,
             "Skills": sample_skills, # List
             "Salary": round(salary, 2),
-            "Experience": exp_needed
+            "Experience": exp_needed,
+            "Experience_Imputed": False,
         })
         
     df = pd.DataFrame(data)
     
-    # Save Raw Data
-    df.to_csv(os.path.join(DATA_DIR, 'jobs.csv'), index=False)
-    return df
+    # Save Raw Data (mock postings are regenerated, so replace the previous set)
+    store = JobStore()
+    store.drop_source('mock')
+    store.write_partition(df, 'mock')
+    return df, _part_keys(store, store.partitions(sources=['mock']))
+
+def report_embedding_timing(df, sample=200):
+    """
+    Prints a timing comparison of the old per-row embedding path
+    (one encoder call per job) against the batched path on a sample.
+    """
+    subset = df['Skills'].head(sample)
+
+    start = time.perf_counter()
+    for skills in subset:
+        if skills:
+            np.mean(get_embedding(list(skills)), axis=0)
+    per_row = time.perf_counter() - start
+
+    start = time.perf_counter()
+    get_mean_embeddings(subset)
+    batched = time.perf_counter() - start
+
+    print(f"Embedding timing on {len(subset)} jobs:")
+    print(f"  per-row encode : {per_row:.3f}s ({per_row / max(len(subset), 1) * 1000:.2f} ms/job)")
+    print(f"  batched        : {batched:.3f}s ({batched / max(len(subset), 1) * 1000:.2f} ms/job)")
+    if batched > 0:
+        print(f"  speedup        : {per_row / batched:.1f}x")
+
+def embed_postings(skill_lists, out):
+    """
+    Writes each posting's mean skill embedding into `out` (n, 384), in place.
+    Encoding the corpus vocabulary is the serial stage (the encoder already
+    uses every core); the per-posting gather + segment mean that follows is
+    cheap vectorized NumPy, so it isn't worth a process pool.
+    """
+    skill_lists = [list(s) if s is not None else [] for s in skill_lists]
+    encoded = extend_skill_cache({s for sl in skill_lists for s in sl})
+    if encoded:
+        print(f"Encoded {encoded} new skills into the vector cache")
+    out[:] = get_mean_embeddings(skill_lists)
+    return out
+
+def role_stats(categories, embeddings, salaries, skills):
+    """
+    Per-category running aggregates: embedding sums, posting counts, salary
+    sums and the first posting's skills, from a single groupby over the
+    stacked embedding matrix (no per-group Python loop). Kept in the bundle
+    so a refresh can fold in new postings without the old ones.
+    """
+    codes, names = pd.factorize(pd.Series(categories), sort=True)
+    counts = np.bincount(codes, minlength=len(names))
+    sums = pd.DataFrame(embeddings).groupby(codes).sum().to_numpy(dtype=np.float64)
+    salary_sums = np.bincount(codes, weights=np.asarray(salaries, dtype=np.float64), minlength=len(names))
+    _, first = np.unique(codes, return_index=True)
+    skills = list(skills)
+    return {
+        "roles": list(names),
+        "role_sums": sums,
+        "counts": [int(c) for c in counts],
+        "salary_sums": [float(v) for v in salary_sums],
+        "core_skills": [list(skills[i]) for i in first],
+    }
+
+def merge_role_stats(old, new):
+    """Adds `new` aggregates into `old`; categories seen for the first time are appended."""
+    roles = list(old["roles"])
+    sums = np.array(old["role_sums"], dtype=np.float64)
+    counts, salary_sums = list(old["counts"]), list(old["salary_sums"])
+    core_skills = list(old["core_skills"])
+    position = {r: i for i, r in enumerate(roles)}
+
+    extra = [r for r in new["roles"] if r not in position]
+    if extra:
+        sums = np.vstack([sums, np.zeros((len(extra), sums.shape[1]))])
+    for r in extra:
+        position[r] = len(roles)
+        roles.append(r)
+        counts.append(0)
+        salary_sums.append(0.0)
+        core_skills.append(None)
+
+    for k, r in enumerate(new["roles"]):
+        i = position[r]
+        sums[i] += new["role_sums"][k]
+        counts[i] += new["counts"][k]
+        salary_sums[i] += new["salary_sums"][k]
+        if core_skills[i] is None:
+            core_skills[i] = new["core_skills"][k]
+    return {"roles": roles, "role_sums": sums, "counts": counts,
+            "salary_sums": salary_sums, "core_skills": core_skills}
 
-def train_models(df):
+def role_df_from_stats(stats):
+    """One row per category: mean embedding, average salary, demand level, core skills."""
+    counts = np.asarray(stats["counts"], dtype=np.float64)
+    return pd.DataFrame({
+        "Role": stats["roles"],
+        "embedding": list((np.asarray(stats["role_sums"]) / counts[:, None]).astype(np.float32)),
+        "Avg_Salary": np.round(np.asarray(stats["salary_sums"]) / counts, 1),
+        # Adjust thresholds for live data size (usually smaller than 300)
+        "Demand_Level": np.where(counts > 15, "High", "Medium"),
+        "Core_Skills": stats["core_skills"],
+    })
+
+def known_experience(df):
+    """Experience with imputed placeholders as NaN, so sketches skip their band."""
+    return df['Experience'].where(~df['Experience_Imputed'].astype(bool))
+
+def _live_demand_engine():
+    # Snapshot of the ingestion-side engine for the bundle; None on mock-only setups
+    return DemandEngine.load() if os.path.exists(ENGINE_PATH) else None
+
+def _part_keys(store, parts):
+    return [os.path.relpath(path, store.root) for _, _, path in parts]
+
+def train_models(df, timer=None, parts=None):
+    """
+    Full rebuild from `df`. `parts` are the JobStore part keys df was read
+    from; they are recorded so refresh_models only picks up newer ones.
+    """
+    timer = timer or StageTimer()
     print("Computing embeddings... (This involves downloading/loading model)")
     
     # 1. Compute Embeddings for each job row (Feature for Training)
-    # This might be slow for 300 rows if using CPU. It's okay for Setup.
-    # We map 'Skills' list -> Mean Vector
-    df['embedding'] = df['Skills'].apply(lambda x: get_mean_embedding(x))
-    
-    # 2. Train Salary Model
-    # X = [Embedding (384) + Experience (1)] -> 385 dims
-    print("Training Salary Model...")
-    
-    X_list = []
-    for _, row in df.iterrows():
-        # Concat embedding + exp
-        vec = np.append(row['embedding'], row['Experience'])
-        X_list.append(vec)
-        
-    X = np.array(X_list)
+    # X = [Embedding (384) + Experience (1)] -> 385 dims, filled in place:
+    # embeddings land straight in X's first 384 columns, no intermediate copies
+    X = np.empty((len(df), 385), dtype=np.float32)
+    with timer.stage("embed"):
+        embed_postings(df['Skills'], X[:, :-1])
+        X[:, -1] = df['Experience'].values
     y = df['Salary'].values
     
-    salary_model = RandomForestRegressor(n_estimators=100, random_state=42)
-    salary_model.fit(X, y)
-    
-    joblib.dump(salary_model, os.path.join(MODEL_DIR, 'salary.pkl'))
+    # 2. Train Salary Model on all cores
+    print("Training Salary Model...")
+    with timer.stage("forest"):
+        salary_model = RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=-1)
+        salary_model.fit(X, y)
     
     # 3. Create Role Prototypes for Matching
     print("Creating Role Prototypes...")
-    distinct_roles = []
+    with timer.stage("prototypes"):
+        # Titles -> role categories in bulk (rules, then embedding fallback)
+        df['Category'] = classify_titles(df['Role'])
+        stats = role_stats(df['Category'], X[:, :-1], df['Salary'], df['Skills'])
+        role_df = role_df_from_stats(stats)
+
+    # P10/P50/P90 per role, skill and experience band for the dashboard
+    with timer.stage("salary sketches"):
+        sketches = SalarySketches()
+        sketches.add_postings(df['Category'], df['Skills'], df['Salary'], known_experience(df))
     
-    # Map raw live titles to broader categories for cleaner aggregation
-    def map_role_category(title):
-        t = title.lower()
-        if 'front' in t or 'react' in t or 'vue' in t or 'web' in t: return 'Frontend Engineer'
-        if 'back' in t or 'api' in t or 'node' in t or 'django' in t: return 'Backend Engineer'
-        if 'data' in t and 'scien' in t: return 'Data Scientist'
-        if 'machine' in t or 'ai' in t or 'learning' in t: return 'Machine Learning Engineer'
-        if 'devops' in t or 'cloud' in t or 'sre' in t: return 'DevOps Engineer'
-        if 'product' in t: return 'Product Manager'
-        if 'full' in t: return 'Full Stack Developer'
-        return 'Software Engineer' # Default
-
-    df['Category'] = df['Role'].apply(map_role_category)
+    with timer.stage("demand"):
+        from core.demand import demand_map_from_counts, skill_counts
+        counts = skill_counts(df)
+        demand_map = demand_map_from_counts(counts)
     
-    grouped = df.groupby('Category')
-    from core.demand import calculate_demand_map
-    demand_map = calculate_demand_map(df)
+    # Skill co-occurrence graph for "what to learn next" (one sparse X.T @ X)
+    with timer.stage("cooccurrence"):
+        graph = SkillGraph()
+        graph.add_postings(df['Skills'])
     
-    for role_name, group in grouped:
-        # Mean of means
-        role_embedding = np.mean(np.stack(group['embedding'].values), axis=0)
-        avg_sal = group['Salary'].mean()
-        
-        # Demand Level
-        count = len(group)
-        # Adjust thresholds for live data size (usually smaller than 300)
-        demand_lvl = "High" if count > 15 else "Medium"
-        
-        distinct_roles.append({
-            "Role": role_name,
-            "embedding": role_embedding,
-            "Avg_Salary": round(avg_sal, 1),
-            "Demand_Level": demand_lvl,
-            "Core_Skills": group.iloc[0]['Skills'] 
-        })
-        
-    role_df = pd.DataFrame(distinct_roles)
-    joblib.dump(role_df, os.path.join(MODEL_DIR, 'roles.pkl'))
-    
-    # Save Demand Map
-    joblib.dump(demand_map, os.path.join(MODEL_DIR, 'demand_map.pkl'))
+    # Save forest, role catalogue and demand map as one mmap-friendly bundle,
+    # plus the running aggregates an incremental refresh resumes from
+    with timer.stage("save"):
+        state = dict(stats, skill_counts=dict(counts), parts=list(parts or []), n_postings=len(df))
+        manifest = publish_bundle(compile_forest(salary_model, n_rows=len(df)), role_df, demand_map,
+                                  embedding_model=MODEL_NAME, state=state, sketches=sketches,
+                                  skill_graph=graph, demand_engine=_live_demand_engine())
+    print(f"Published artifact bundle v{manifest['version']} ({manifest['n_roles']} roles)")
     
     print("All Models and Data Saved successfully.")
+    return timer
+
+def refit_forest(store, consumed, new_parts):
+    """
+    Fits a fresh 100-tree forest on every stored part the bundle has consumed
+    plus `new_parts`, so the refreshed trees don't pile up indefinitely.
+    """
+    keep = set(_part_keys(store, new_parts)) | consumed
+    stored = store.partitions()
+    parts = [p for p, key in zip(stored, _part_keys(store, stored)) if key in keep]
+    df = store.read_parts(parts).to_frame()[['Skills', 'Salary', 'Experience']]
+    print(f"Forest reached its tree cap; refitting on {len(df)} postings from {len(parts)} parts")
+    X = np.empty((len(df), 385), dtype=np.float32)
+    embed_postings(df['Skills'], X[:, :-1])
+    X[:, -1] = df['Experience'].values
+    model = RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=-1)
+    model.fit(X, df['Salary'].values)
+    return compile_forest(model, n_rows=len(df))
+
+def refresh_models(timer=None, new_trees=REFRESH_TREES, max_trees=MAX_TREES):
+    """
+    Incremental refresh from JobStore parts written since the live bundle:
+    - role prototypes: running embedding/salary sums and counts per category
+    - demand map: previous skill counts plus the new postings' counts
+    - skill vectors: only skills missing from the cache are encoded
+    - salary forest: `new_trees` trees fitted on the new rows are appended
+      (warm-start style), weighted by row count; once that would pass
+      `max_trees`, the forest is refitted on every consumed part instead
+    The result is published as a new bundle version; running app and service
+    workers switch to it without a restart. Returns the manifest, or None if
+    there was nothing to do.
+    """
+    timer = timer or StageTimer()
+    bundle_dir = current_bundle_dir()
+    state = load_state(bundle_dir) if bundle_dir else None
+    if state is None:
+        print("No refreshable bundle found; run a full rebuild first.")
+        return None
+
+    store = JobStore()
+    consumed = set(state["parts"])
+    # Mock postings are only replaced wholesale by a full rebuild
+    all_parts = [p for p in store.partitions() if p[0] != 'mock']
+    new_parts = [p for p, key in zip(all_parts, _part_keys(store, all_parts)) if key not in consumed]
+    if not new_parts:
+        print("No new postings since the live bundle.")
+        return None
+
+    with timer.stage("read new"):
+        df = store.read_parts(new_parts).to_frame()[['Role', 'Skills', 'Salary', 'Experience', 'Experience_Imputed']]
+    print(f"Refreshing with {len(df)} new postings from {len(new_parts)} parts")
+
+    salary_model, _, _ = load_artifacts()
+    with timer.stage("embed"):
+        X = np.empty((len(df), 385), dtype=np.float32)
+        embed_postings(df['Skills'], X[:, :-1])
+        X[:, -1] = df['Experience'].values
+
+    with timer.stage("forest"):
+        if salary_model.weights is None:
+            # Bundle from before tree weights: its trees share the rows it was built on
+            salary_model.weights = np.full(salary_model.n_trees, state["n_postings"] / salary_model.n_trees)
+        if salary_model.n_trees + new_trees <= max_trees:
+            update = RandomForestRegressor(n_estimators=new_trees, random_state=42, n_jobs=-1)
+            update.fit(X, df['Salary'].values)
+            salary_model = salary_model.append(compile_forest(update, n_rows=len(df)))
+        else:
+            salary_model = refit_forest(store, consumed, new_parts)
+
+    with timer.stage("prototypes"):
+        categories = classify_titles(df['Role'])
+        stats = merge_role_stats(state, role_stats(categories, X[:, :-1], df['Salary'], df['Skills']))
+        role_df = role_df_from_stats(stats)
+
+    # The live bundle's digests plus a digest of the new rows: the old
+    # postings' salaries are never re-read
+    with timer.stage("salary sketches"):
+        sketches = load_sketches(bundle_dir)
+        if sketches is None:
+            print("Live bundle has no salary sketches; they will cover new postings only until a full rebuild.")
+            sketches = SalarySketches()
+        new_sketches = SalarySketches(sketches.compression)
+        new_sketches.add_postings(categories, df['Skills'], df['Salary'], known_experience(df))
+        sketches.merge(new_sketches)
+
+    with timer.stage("demand"):
+        from core.demand import demand_map_from_counts, skill_counts
+        counts = Counter(state["skill_counts"])
+        counts.update(skill_counts(df))
+        demand_map = demand_map_from_counts(counts)
+
+    # Graph from the live bundle plus the new postings; bundles from before
+    # the graph was published start over from the new rows
+    with timer.stage("cooccurrence"):
+        graph = load_skill_graph(bundle_dir) or SkillGraph()
+        graph.add_postings(df['Skills'])
+
+    with timer.stage("save"):
+        state = dict(stats, skill_counts=dict(counts), parts=state["parts"] + _part_keys(store, new_parts),
+                     n_postings=state["n_postings"] + len(df))
+        manifest = publish_bundle(salary_model, role_df, demand_map, embedding_model=MODEL_NAME, state=state,
+                                  sketches=sketches, skill_graph=graph, demand_engine=_live_demand_engine())
+    print(f"Published artifact bundle v{manifest['version']} "
+          f"({manifest['n_roles']} roles, {salary_model.n_trees} trees)")
+    return manifest
 
 if __name__ == "__main__":
-    df = generate_mock_data(300)
-    train_models(df)
+    parser = argparse.ArgumentParser(description="Fetch/generate job data and rebuild all model artifacts.")
+    parser.add_argument("--timing", action="store_true", help="Compare per-row vs batched embedding first")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Fold only postings added since the live bundle into a new bundle version")
+    args = parser.parse_args()
+
+    from core.skills import VALID_SKILLS
+    timer = StageTimer()
+    with timer.stage("skill cache"):
+        # Only skills not cached from a previous run reach the encoder
+        print("Pre-warming skill vector cache...")
+        extend_skill_cache(VALID_SKILLS)
+    if args.incremental:
+        with timer.stage("ingest"):
+            try:
+                ingest_live(JobStore())
+            except Exception as e:
+                print(f"Live data fetch failed: {e}. Refreshing from stored postings only.")
+        refresh_models(timer=timer)
+    else:
+        with timer.stage("load data"):
+            df, parts = generate_mock_data(300)
+        if args.timing:
+            report_embedding_timing(df)
+        train_models(df, timer=timer, parts=parts)
+    timer.report()
@@ -0,0 +1,33 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+# Append project root
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.boards import BOARDS
+from core.fetcher import run_multi_source_ingestion
+from core.jobstore import JobStore, STORE_DIR
+
+# Hourly multi-board refresh: every board fetched concurrently, each ingested
+# into the JobStore as soon as it arrives. Point --base-url at stub_boards.py
+# (and --store at a scratch directory) to test without the network.
+# Usage: python ingest_boards.py [--sources remoteok remotive ...] [--base-url URL] [--store DIR]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest postings from every configured job board.")
+    parser.add_argument("--sources", nargs="*", choices=sorted(BOARDS), help="Board keys (default: all)")
+    parser.add_argument("--base-url", help="Serve every board from here instead (stub servers)")
+    parser.add_argument("--store", default=STORE_DIR, help="JobStore directory")
+    parser.add_argument("--per-host", type=int, default=4, help="Pooled connections per host")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--retries", type=int, default=3)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    report = run_multi_source_ingestion(args.sources, JobStore(args.store), base_url=args.base_url,
+                                        per_host=args.per_host, timeout=args.timeout, retries=args.retries)
+    print(json.dumps(report, indent=2))
+    print(f"Refresh finished in {time.perf_counter() - start:.2f}s")
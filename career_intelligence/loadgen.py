@@ -0,0 +1,95 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+# Append project root
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.skills import VALID_SKILLS
+from core.taxonomy import RULES
+
+# Load generator for service.py: N keep-alive connections firing random
+# profiles at one endpoint for a fixed duration, then throughput and latency
+# percentiles. Stdlib asyncio only, so it runs anywhere the service does.
+# Usage: python loadgen.py [--url http://127.0.0.1:8000] [--endpoint score] [--concurrency 64] [--duration 10]
+
+# role_df rows are taxonomy categories (the catch-all default may have no postings)
+ROLES = [category for category, _ in RULES]
+
+def random_profile(rng, skills):
+    return {
+        "skills": rng.sample(skills, rng.randint(2, 8)),
+        "experience": rng.randint(0, 15),
+        "target_role": rng.choice(ROLES),
+        "k": 3,
+    }
+
+async def _request(reader, writer, host, path, payload):
+    body = json.dumps(payload).encode()
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode('latin-1').partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+async def _client(host, port, path, deadline, seed, latencies, errors):
+    rng = random.Random(seed)
+    skills = sorted(VALID_SKILLS)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            status = await _request(reader, writer, host, path, random_profile(rng, skills))
+            if status == 200:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors.append(status)
+    finally:
+        writer.close()
+
+async def run(url, endpoint, concurrency, duration):
+    host, _, port = url.split("://", 1)[-1].rstrip("/").partition(":")
+    port = int(port or 80)
+    path = "/" + endpoint.lstrip("/")
+
+    latencies, errors = [], []
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*[
+        _client(host, port, path, deadline, seed, latencies, errors) for seed in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - start
+
+    print(f"{path}: {concurrency} connections, {elapsed:.1f}s")
+    print(f"Requests: {len(latencies)} ok, {len(errors)} errors -> {len(latencies) / elapsed:.0f} req/s")
+    if latencies:
+        ms = np.asarray(latencies) * 1000
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        print(f"Latency ms: p50 {p50:.1f}, p95 {p95:.1f}, p99 {p99:.1f}, max {ms.max():.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the scoring service.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoint", default="score", choices=["salary", "match", "gap", "roadmap", "score"])
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds")
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.endpoint, args.concurrency, args.duration))
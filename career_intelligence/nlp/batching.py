@@ -0,0 +1,152 @@
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+
+# Batch size histogram buckets (upper bounds, inclusive); the last catches the rest
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+class _Request:
+    __slots__ = ("texts", "future", "enqueued")
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.future = Future()
+        self.enqueued = time.monotonic()
+
+class EncodeBatcher:
+    """
+    Micro-batching scheduler in front of an encoder.
+
+    Callers on any thread `submit` a list of texts and get a Future back. A
+    single daemon thread drains the queue and flushes what is waiting as one
+    `encode_fn(texts)` call of at most `max_batch` texts (a single larger
+    request still goes alone), lingering up to `max_wait` seconds after the
+    first request for stragglers. The resulting rows are sliced back to each
+    caller's future.
+    `encode` skips the queue entirely when no other encode is in flight, so
+    an idle process pays no batching latency. Inline and batched calls share
+    one lock, so `encode_fn` never runs twice at once.
+    """
+
+    def __init__(self, encode_fn, max_batch=32, max_wait=0.005, history=1024):
+        self.encode_fn = encode_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._carry = None # request held back because it would overflow the last batch
+        self._thread = None
+        self._lock = threading.Lock()
+        self._encode_lock = threading.Lock()
+        self._active = 0 # encodes running or queued, direct or batched
+
+        # Metrics
+        self.pending = 0 # texts queued but not yet flushed
+        self.direct = 0 # encode() calls that ran inline
+        self.batches = 0
+        self.items = 0
+        self.histogram = {b: 0 for b in BATCH_BUCKETS + (float('inf'),)}
+        self._waits = deque(maxlen=history) # seconds from submit to flush, per request
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="encode-batcher", daemon=True)
+                    self._thread.start()
+
+    def submit(self, texts):
+        """Queues a list of texts; the Future resolves to an (len(texts), dim) array."""
+        self._ensure_started()
+        request = _Request(list(texts))
+        with self._lock:
+            self.pending += len(request.texts)
+        self._queue.put(request)
+        return request.future
+
+    def _call(self, texts):
+        with self._encode_lock:
+            return np.asarray(self.encode_fn(texts))
+
+    def encode(self, texts):
+        """Blocking encode; inline when idle, otherwise coalesced with the concurrent callers."""
+        with self._lock:
+            idle = self._active == 0
+            self._active += 1
+        try:
+            if idle:
+                with self._lock:
+                    self.direct += 1
+                return self._call(list(texts))
+            return self.submit(texts).result()
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def _collect(self):
+        first, self._carry = self._carry, None
+        if first is None:
+            first = self._queue.get()
+        batch, size = [first], len(first.texts)
+        deadline = first.enqueued + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if size + len(request.texts) > self.max_batch:
+                # Starts the next batch instead
+                self._carry = request
+                break
+            batch.append(request)
+            size += len(request.texts)
+        return batch, size
+
+    def _run(self):
+        while True:
+            batch, size = self._collect()
+            flushed = time.monotonic()
+            with self._lock:
+                self.pending -= size
+                self.batches += 1
+                self.items += size
+                bucket = next((b for b in BATCH_BUCKETS if size <= b), float('inf'))
+                self.histogram[bucket] += 1
+                self._waits.extend(flushed - r.enqueued for r in batch)
+
+            texts = [t for r in batch for t in r.texts]
+            try:
+                vectors = self._call(texts)
+            except Exception as e:
+                for r in batch:
+                    r.future.set_exception(e)
+                continue
+
+            start = 0
+            for r in batch:
+                r.future.set_result(vectors[start:start + len(r.texts)])
+                start += len(r.texts)
+
+    def stats(self):
+        """Queue depth, batch size histogram and submit-to-flush wait (ms)."""
+        with self._lock:
+            waits = np.asarray(self._waits, dtype=np.float64) * 1000
+            hist = {("inf" if b == float('inf') else str(b)): c for b, c in self.histogram.items()}
+            out = {
+                "queue_depth": self.pending,
+                "direct": self.direct,
+                "batches": self.batches,
+                "items": self.items,
+                "mean_batch": self.items / self.batches if self.batches else 0.0,
+                "batch_size_hist": hist,
+            }
+        if len(waits):
+            p50, p95, p99 = np.percentile(waits, [50, 95, 99])
+            out["wait_ms"] = {"p50": float(p50), "p95": float(p95), "p99": float(p99), "max": float(waits.max())}
+        else:
+            out["wait_ms"] = {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+        return out
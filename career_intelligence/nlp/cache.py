@@ -0,0 +1,157 @@
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from core.tracing import record_cache
+
+# Skill vectors live next to the trained models so they ship with them
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(BASE_DIR, 'models', 'skill_cache')
+
+def skill_key(text):
+    """Canonical cache key for a skill string."""
+    return str(text).strip().lower()
+
+class SkillVectorCache:
+    """
+    Two-level cache of per-skill embedding vectors.
+    Level 1: bounded in-process LRU for skills seen at runtime.
+    Level 2: read-only memory-mapped float32 matrix on disk, built once
+    (e.g. from the VALID_SKILLS whitelist) and versioned by model name.
+    """
+
+    def __init__(self, model_name, dim, max_size=4096, cache_dir=CACHE_DIR):
+        self.model_name = model_name
+        self.dim = dim
+        self.max_size = max_size
+        self.cache_dir = cache_dir
+        self._lru = OrderedDict()
+        self._index = None   # skill -> row in the on-disk matrix
+        self._matrix = None
+        # Guards the LRU and the disk index; encoder calls run outside it
+        self._lock = threading.Lock()
+
+    def _paths(self):
+        # One file pair per encoder so a model swap never serves stale vectors
+        tag = re.sub(r'[^A-Za-z0-9_.-]', '_', self.model_name)
+        base = os.path.join(self.cache_dir, tag)
+        return base + '.npy', base + '.json'
+
+    def _load_disk(self):
+        if self._index is not None:
+            return self._index
+        self._index = {}
+        matrix_path, vocab_path = self._paths()
+        if not (os.path.exists(matrix_path) and os.path.exists(vocab_path)):
+            return self._index
+        try:
+            with open(vocab_path) as f:
+                meta = json.load(f)
+            if meta.get('model') != self.model_name or meta.get('dim') != self.dim:
+                return self._index
+            matrix = np.load(matrix_path, mmap_mode='r')
+            if matrix.shape != (len(meta['skills']), self.dim):
+                return self._index
+            self._matrix = matrix
+            self._index = {s: i for i, s in enumerate(meta['skills'])}
+        except Exception as e:
+            print(f"Ignoring unreadable skill cache: {e}")
+            self._index = {}
+        return self._index
+
+    def _put(self, key, vec):
+        # Caller holds self._lock
+        self._lru[key] = vec
+        self._lru.move_to_end(key)
+        if len(self._lru) > self.max_size:
+            self._lru.popitem(last=False)
+
+    def get_many(self, skills, encode_fn):
+        """
+        Returns an (n, dim) float32 matrix of vectors for `skills`.
+        Misses are encoded in a single `encode_fn` call and kept in the LRU.
+        """
+        keys = [skill_key(s) for s in skills]
+        out = np.empty((len(keys), self.dim), dtype=np.float32)
+
+        missing = []
+        with self._lock:
+            index = self._load_disk()
+            for i, key in enumerate(keys):
+                vec = self._lru.get(key)
+                if vec is not None:
+                    self._lru.move_to_end(key)
+                    out[i] = vec
+                    continue
+                row = index.get(key)
+                if row is not None:
+                    out[i] = self._matrix[row]
+                    continue
+                missing.append(i)
+
+        record_cache("skill_vectors", hits=len(keys) - len(missing), misses=len(missing))
+        if missing:
+            unique = list(dict.fromkeys(keys[i] for i in missing))
+            vectors = np.asarray(encode_fn(unique), dtype=np.float32).reshape(len(unique), self.dim)
+            fresh = dict(zip(unique, vectors))
+            for i in missing:
+                out[i] = fresh[keys[i]]
+            with self._lock:
+                for key, vec in fresh.items():
+                    self._put(key, vec)
+
+        return out
+
+    def _write(self, vocab, matrix):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        matrix_path, vocab_path = self._paths()
+        # Write-then-rename, so processes still mapping the old file keep a valid view
+        np.save(matrix_path + '.tmp.npy', matrix)
+        with open(vocab_path + '.tmp', 'w') as f:
+            json.dump({"model": self.model_name, "dim": self.dim, "skills": vocab}, f)
+        os.replace(matrix_path + '.tmp.npy', matrix_path)
+        os.replace(vocab_path + '.tmp', vocab_path)
+
+        # Re-open from disk so this process uses the mmap like any other
+        with self._lock:
+            self._index = None
+            self._matrix = None
+            self._lru.clear()
+            self._load_disk()
+
+    def build(self, skills, encode_fn):
+        """
+        Encodes `skills` and writes them as the on-disk store.
+        Called at build time so runtime lookups never hit the encoder.
+        """
+        vocab = sorted(set(skill_key(s) for s in skills))
+        matrix = np.asarray(encode_fn(vocab), dtype=np.float32).reshape(len(vocab), self.dim)
+        self._write(vocab, matrix)
+        return len(vocab)
+
+    def extend(self, skills, encode_fn):
+        """
+        Adds only the skills missing from the on-disk store, keeping existing
+        rows as they are. Returns how many skills were encoded.
+        """
+        with self._lock:
+            index = self._load_disk()
+            matrix = self._matrix
+        new = sorted(set(skill_key(s) for s in skills) - set(index))
+        if not new:
+            return 0
+        vectors = np.asarray(encode_fn(new), dtype=np.float32).reshape(len(new), self.dim)
+        vocab = sorted(index, key=index.get) + new
+        old = np.asarray(matrix) if matrix is not None else np.empty((0, self.dim), dtype=np.float32)
+        self._write(vocab, np.vstack([old, vectors]))
+        return len(new)
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+            self._index = None
+            self._matrix = None
@@ -1,24 +1,103 @@
-from sentence_transformers import SentenceTransformer
+import os
+import threading
 import numpy as np
 
+from nlp.batching import EncodeBatcher
+from nlp.cache import SkillVectorCache, skill_key
+
 # Load a lightweight model for speed but good quality
 MODEL_NAME = 'all-MiniLM-L6-v2'
+EMBEDDING_DIM = 384 # 384 dim for MiniLM
+ENCODE_BATCH_SIZE = 256 # Large batches amortize per-call overhead on CPU
+
+# Inference backend, chosen by configuration:
+#   torch     - full-precision PyTorch (default)
+#   onnx      - ONNX Runtime export of the same weights
+#   onnx-int8 - dynamically int8-quantized ONNX export, smallest/fastest on CPU
+# The ONNX variants need `pip install sentence-transformers[onnx]`.
+BACKENDS = ('torch', 'onnx', 'onnx-int8')
+BACKEND = os.environ.get('CAREER_EMBEDDER_BACKEND', 'torch')
+# Quantized file inside the model repo; pick the one matching the CPU (avx2 / avx512 / arm64)
+QUANTIZED_ONNX_FILE = os.environ.get('CAREER_EMBEDDER_ONNX_FILE', 'onnx/model_quint8_avx2.onnx')
+
+# Small encode calls that overlap (Streamlit sessions, service workers) are
+# coalesced into batches of up to BATCH_MAX_SIZE texts. A call with no other
+# encode in flight runs immediately; otherwise the scheduler lingers up to
+# BATCH_MAX_WAIT_MS for more callers. The service already micro-batches its requests, so
+# it mostly hits the inline path. Set CAREER_EMBEDDER_BATCHING=0 to encode
+# every call directly.
+BATCHING = os.environ.get('CAREER_EMBEDDER_BATCHING', '1') != '0'
+BATCH_MAX_SIZE = int(os.environ.get('CAREER_EMBEDDER_BATCH_SIZE', 32))
+BATCH_MAX_WAIT_MS = float(os.environ.get('CAREER_EMBEDDER_BATCH_WAIT_MS', 5))
+
 _model = None
+_model_lock = threading.Lock()
+
+def cache_tag(backend=BACKEND):
+    # Quantized vectors differ slightly, so each backend gets its own skill cache
+    return MODEL_NAME if backend == 'torch' else f"{MODEL_NAME}-{backend}"
+
+# Skill vocabulary is small, so per-skill vectors are cached instead of re-encoded
+_skill_cache = SkillVectorCache(cache_tag(), EMBEDDING_DIM)
+
+def load_backend(backend=BACKEND):
+    """
+    Builds a SentenceTransformer for the given backend.
+    All backends return 384-d vectors and share the same encode() API.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown embedder backend '{backend}', expected one of {BACKENDS}")
+
+    # Imported lazily: sentence_transformers pulls in torch
+    from sentence_transformers import SentenceTransformer
+    if backend == 'torch':
+        return SentenceTransformer(MODEL_NAME)
+    if backend == 'onnx':
+        return SentenceTransformer(MODEL_NAME, backend='onnx')
+    return SentenceTransformer(MODEL_NAME, backend='onnx', model_kwargs={"file_name": QUANTIZED_ONNX_FILE})
 
 def get_model():
     global _model
     if _model is None:
-        _model = SentenceTransformer(MODEL_NAME)
+        # The app's warm-up thread and a user click may race here
+        with _model_lock:
+            if _model is None:
+                _model = load_backend(BACKEND)
     return _model
 
-def get_embedding(text):
+def warm_up():
+    """Loads the encoder and runs one tiny encode so the first request is hot."""
+    get_model().encode(["python"])
+
+def _encode_now(texts, batch_size=ENCODE_BATCH_SIZE):
+    return get_model().encode(texts, batch_size=batch_size)
+
+_batcher = EncodeBatcher(_encode_now, max_batch=BATCH_MAX_SIZE, max_wait=BATCH_MAX_WAIT_MS / 1000)
+
+def get_embedding(text, batch_size=ENCODE_BATCH_SIZE):
     """
     Returns a numpy array embedding for the given text.
     Text can be a single string or a list of strings.
+    Small calls that overlap another encode are batched together; calls that
+    already fill a batch (e.g. training) are encoded directly.
+    """
+    single = isinstance(text, str)
+    texts = [text] if single else list(text)
+    if not BATCHING or len(texts) >= BATCH_MAX_SIZE:
+        return _encode_now(text, batch_size=batch_size)
+    embeddings = _batcher.encode(texts)
+    return embeddings[0] if single else embeddings
+
+def encoder_stats():
+    """Batching scheduler metrics: queue depth, batch size histogram, wait times."""
+    return _batcher.stats()
+
+def get_skill_vectors(skills_list):
+    """
+    Returns an (n, 384) matrix with one cached vector per skill.
+    Only skills missing from the cache go through the encoder.
     """
-    model = get_model()
-    embeddings = model.encode(text)
-    return embeddings
+    return _skill_cache.get_many(skills_list, get_embedding)
 
 def get_mean_embedding(skills_list):
     """
@@ -26,10 +105,52 @@ def get_mean_embedding(skills_list):
     Use this to represent a User Profile or a Job Role based on its skills.
     """
     if not skills_list:
-        return np.zeros(384) # 384 dim for MiniLM
-    
+        return np.zeros(EMBEDDING_DIM)
+
     # We treat each skill as a phrase, get individual embeddings, then average them.
     # Alternatively, join them into one string "python, sql, aws".
     # Averaging individual tags usually captures multi-modal skills better than one sentence.
-    embeddings = get_embedding(skills_list)
+    embeddings = get_skill_vectors(skills_list)
     return np.mean(embeddings, axis=0)
+
+def get_mean_embeddings(skill_lists):
+    """
+    Vectorized get_mean_embedding over many skill lists (e.g. every job row).
+    Skills are deduped across all lists and encoded once; each row's mean is
+    then a segment sum over the gathered vectors via np.add.reduceat.
+    Returns an (n, 384) float32 matrix; empty lists map to zero vectors.
+    """
+    lists = [list(s) if s is not None else [] for s in skill_lists]
+    out = np.zeros((len(lists), EMBEDDING_DIM), dtype=np.float32)
+
+    lengths = np.array([len(s) for s in lists], dtype=np.int64)
+    if lengths.sum() == 0:
+        return out
+
+    keys = [skill_key(s) for sl in lists for s in sl]
+    vocab = list(dict.fromkeys(keys))
+    vocab_vectors = get_skill_vectors(vocab)
+    position = {k: i for i, k in enumerate(vocab)}
+    token_vectors = vocab_vectors[np.fromiter((position[k] for k in keys), dtype=np.int64, count=len(keys))]
+
+    # reduceat needs strictly valid start offsets, so skip empty rows
+    nonempty = lengths > 0
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))[nonempty]
+    sums = np.add.reduceat(token_vectors, starts, axis=0)
+    out[nonempty] = sums / lengths[nonempty, None]
+    return out
+
+def warm_skill_cache(skills):
+    """
+    Encodes the given skill vocabulary once and persists it to disk.
+    Run at build time (see generate_data.py) with the VALID_SKILLS whitelist.
+    """
+    return _skill_cache.build(skills, get_embedding)
+
+def extend_skill_cache(skills):
+    """
+    Encodes only the skills not yet in the on-disk cache and appends them.
+    Lets training pre-encode a corpus vocabulary once, so worker processes
+    (and incremental refreshes) only ever read cached vectors.
+    """
+    return _skill_cache.extend(skills, get_embedding)
@@ -0,0 +1,365 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Append project root
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from nlp.embedder import encoder_stats, get_mean_embeddings
+from core.artifacts import bundle_version, load_artifacts
+from core.matcher import RoleIndex, match_roles_batch
+from core.salary import predict_salary_batch
+from core.profile_cache import GapEngine
+from core.tracing import observe, snapshot, span, start_exporters_from_env
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_DIR = os.path.join(BASE_DIR, 'models')
+# How often a worker checks for a newly published bundle
+RELOAD_CHECK_SECONDS = 5.0
+
+# Headless JSON-over-HTTP scoring service (stdlib asyncio, no web framework).
+#   POST /salary   {"skills": [...] | "a, b", "experience": 3}
+#   POST /match    {"skills": ..., "k": 3}
+#   POST /gap      {"skills": ..., "target_role": "Data Scientist"}
+#   POST /roadmap  {"skills": ..., "target_role": "Data Scientist"}
+#   POST /score    all of the above in one response
+#   GET  /health   batching and cache counters
+#   GET  /metrics  per-stage latency histograms (with CAREER_TRACING=1)
+# Workers poll the published bundle version and swap in a new one (e.g. from
+# `generate_data.py --incremental`) without restarting.
+# Concurrent requests that need the encoder are micro-batched, so N in-flight
+# requests cost one get_mean_embeddings call, one forest prediction and one
+# role matrix multiply. Run several workers with --workers (SO_REUSEPORT).
+# Usage: python service.py [--port 8000] [--workers 1]
+
+class MicroBatcher:
+    """
+    Collects concurrent requests and runs them as one call to `fn(items)` on a
+    bounded thread pool. A batch is flushed when it reaches `max_batch` items
+    or `max_wait` seconds after its first item arrived. Up to `max_inflight`
+    batches run at once; while all are busy, new requests queue up and form
+    the next (larger) batch. `fn` may return an Exception in place of a result
+    to fail just that item.
+    """
+
+    def __init__(self, fn, executor, max_batch=64, max_wait=0.005, max_inflight=1):
+        self.fn = fn
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.max_inflight = max_inflight
+        self._queue = asyncio.Queue()
+        self._task = None
+        self._slots = None
+        self._inflight = set()
+        self.batches = 0
+        self.items = 0
+
+    def start(self):
+        self._slots = asyncio.Semaphore(self.max_inflight)
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, item):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Wait for a free slot first, so requests pile up into the next batch
+            await self._slots.acquire()
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            task = loop.create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch):
+        try:
+            items = [item for item, _ in batch]
+            try:
+                results = await asyncio.get_running_loop().run_in_executor(self.executor, self.fn, items)
+            except Exception as e:
+                results = [e] * len(batch)
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+            self.batches += 1
+            self.items += len(batch)
+        finally:
+            self._slots.release()
+
+def parse_skills(raw):
+    if isinstance(raw, str):
+        return [s.strip() for s in raw.split(',') if s.strip()]
+    if raw is not None and not isinstance(raw, list):
+        raise ValueError("skills must be a string or a list")
+    return [str(s).strip() for s in (raw or []) if str(s).strip()]
+
+def parse_request(payload):
+    """
+    Validates a POST body. Returns (skills, experience, target_role, k);
+    raises ValueError with a client-facing message on bad input.
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("request body must be a JSON object")
+    skills = parse_skills(payload.get("skills"))
+    try:
+        experience = float(payload.get("experience", 0) or 0)
+        k = int(payload.get("k", 3))
+    except (TypeError, ValueError):
+        raise ValueError("experience must be a number and k an integer")
+    if not np.isfinite(experience) or experience < 0:
+        raise ValueError("experience must be a non-negative number")
+    if k < 1:
+        raise ValueError("k must be at least 1")
+    target_role = payload.get("target_role")
+    if target_role is not None and not isinstance(target_role, str):
+        raise ValueError("target_role must be a string")
+    return skills, experience, target_role, k
+
+class ScoringService:
+    """Artifacts loaded once per worker process, plus the request handlers."""
+
+    def __init__(self, model_dir=MODEL_DIR, threads=4, max_batch=64, max_wait=0.005):
+        self.model_dir = model_dir
+        self._install(self._load())
+        self._checked = time.monotonic()
+        self._reloading = False
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="score")
+        # One slot is kept for bundle reloads
+        self.batcher = MicroBatcher(self._score_batch, self.executor, max_batch=max_batch,
+                                    max_wait=max_wait, max_inflight=max(1, threads - 1))
+
+    def _load(self):
+        salary_model, role_df, _ = load_artifacts(self.model_dir)
+        version = getattr(salary_model, 'version', None) or 'legacy'
+        return salary_model, role_df, RoleIndex(role_df), GapEngine(role_df, version=version), version
+
+    def _install(self, loaded):
+        self.salary_model, self.role_df, self.role_index, self.gap_engine, self.version = loaded
+
+    async def maybe_reload(self):
+        """Loads a newly published bundle off the event loop, then swaps it in."""
+        now = time.monotonic()
+        if self._reloading or now - self._checked < RELOAD_CHECK_SECONDS:
+            return
+        self._checked = now
+        live = bundle_version(self.model_dir)
+        if not live or live == self.version:
+            return
+        self._reloading = True
+        try:
+            loaded = await asyncio.get_running_loop().run_in_executor(self.executor, self._load)
+            self._install(loaded)
+            print(f"[pid {os.getpid()}] Switched to artifact bundle v{self.version}")
+        except Exception as e:
+            print(f"[pid {os.getpid()}] Bundle reload failed, keeping v{self.version}: {e}")
+        finally:
+            self._reloading = False
+
+    def _score_batch(self, items):
+        """
+        One encoder call, one forest call and one matrix multiply for the whole
+        batch. If the batch fails, items are retried one by one so a single bad
+        request only fails itself (its slot holds the Exception).
+        """
+        # One consistent artifact version for the whole batch, even mid-reload
+        salary_model, role_index = self.salary_model, self.role_index
+        try:
+            return self._score_items(items, salary_model, role_index)
+        except Exception:
+            if len(items) == 1:
+                raise
+        results = []
+        for it in items:
+            try:
+                results.extend(self._score_items([it], salary_model, role_index))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def _score_items(self, items, salary_model, role_index):
+        with span("service.batch"):
+            with span("get_mean_embeddings"):
+                embeddings = get_mean_embeddings([it["skills"] for it in items])
+            experience = np.array([it["experience"] for it in items], dtype=np.float32)
+            with span("predict_salary"):
+                low, high = predict_salary_batch(salary_model, embeddings, experience)
+            k = max(it["k"] for it in items)
+            with span("match_roles"):
+                matches = match_roles_batch(embeddings, role_index, k=k)
+        results = []
+        for i, it in enumerate(items):
+            result = {"salary": {"low": float(low[i]), "high": float(high[i])}, "matches": matches[i][:it["k"]]}
+            if it.get("target_role"):
+                score = role_index.score(embeddings[i], it["target_role"])
+                result["target_match_pct"] = int(score * 100) if score is not None else None
+            results.append(result)
+        return results
+
+    async def handle(self, method, path, body):
+        await self.maybe_reload()
+        if method == "GET" and path == "/health":
+            return 200, {
+                "status": "ok",
+                "version": self.version,
+                "roles": len(self.role_index),
+                "batches": self.batcher.batches,
+                "batched_items": self.batcher.items,
+                "gap_cache": self.gap_engine.cache.stats(),
+                "encoder": encoder_stats(),
+            }
+        if method == "GET" and path == "/metrics":
+            return 200, snapshot()
+        if method != "POST":
+            return 405, {"error": "method not allowed"}
+
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return 400, {"error": "invalid JSON"}
+        try:
+            skills, experience, target_role, k = parse_request(payload)
+        except ValueError as e:
+            return 400, {"error": str(e)}
+
+        if path in ("/gap", "/roadmap"):
+            if not target_role:
+                return 400, {"error": "target_role is required"}
+            analysis = self.gap_engine.analyze(skills, experience, target_role)
+            if analysis is None:
+                return 404, {"error": f"unknown target_role: {target_role}"}
+            if path == "/gap":
+                return 200, {"gap_skills": analysis["gap_skills"]}
+            return 200, {"roadmap": analysis["roadmap"]}
+
+        if path not in ("/salary", "/match", "/score"):
+            return 404, {"error": "not found"}
+        if path == "/score" and target_role and target_role not in self.gap_engine.role_bits:
+            return 404, {"error": f"unknown target_role: {target_role}"}
+
+        result = await self.batcher.submit({
+            "skills": skills, "experience": experience, "k": k,
+            "target_role": target_role if path == "/score" else None,
+        })
+        if path == "/salary":
+            return 200, result["salary"]
+        if path == "/match":
+            return 200, {"matches": result["matches"]}
+
+        response = dict(result)
+        if target_role:
+            response.update(self.gap_engine.analyze(skills, experience, target_role) or {})
+        return 200, response
+
+# --- HTTP/1.1 (keep-alive, Content-Length bodies only) ---
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+def _json_default(value):
+    # NumPy scalars from role_df columns
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+async def _serve_connection(service, reader, writer):
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            try:
+                method, path, version = request_line.decode('latin-1').split()
+            except ValueError:
+                break
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode('latin-1').partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get("content-length", 0) or 0)
+            body = await reader.readexactly(length) if length else b""
+
+            path = path.split("?")[0]
+            started = time.perf_counter()
+            try:
+                status, payload = await service.handle(method, path, body)
+            except Exception as e:
+                status, payload = 500, {"error": str(e)}
+            # Whole request including batch wait; handle() awaits, so no span() here
+            if status != 404:
+                observe(f"service{path}", (time.perf_counter() - started) * 1000)
+
+            data = json.dumps(payload, default=_json_default).encode()
+            keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+            writer.write(
+                f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+            )
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+async def serve(host, port, threads, max_batch, max_wait, reuse_port=False):
+    start = time.perf_counter()
+    service = ScoringService(threads=threads, max_batch=max_batch, max_wait=max_wait)
+    service.batcher.start()
+    start_exporters_from_env()
+    server = await asyncio.start_server(
+        lambda r, w: _serve_connection(service, r, w), host, port, reuse_port=reuse_port or None
+    )
+    print(f"[pid {os.getpid()}] Serving on http://{host}:{port} (loaded in {time.perf_counter() - start:.2f}s)")
+    async with server:
+        await server.serve_forever()
+
+def _run_worker(args, reuse_port):
+    asyncio.run(serve(args.host, args.port, args.threads, args.max_batch, args.max_wait / 1000, reuse_port))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless career intelligence scoring service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="Processes sharing the port via SO_REUSEPORT")
+    parser.add_argument("--threads", type=int, default=4, help="Encoder/forest threads per worker")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait", type=float, default=5.0, help="Batch deadline in ms")
+    args = parser.parse_args()
+
+    if args.workers <= 1:
+        _run_worker(args, reuse_port=False)
+    else:
+        import multiprocessing
+        procs = [multiprocessing.Process(target=_run_worker, args=(args, True)) for _ in range(args.workers)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
@@ -0,0 +1,129 @@
+import argparse
+import asyncio
+import os
+import random
+import sys
+
+from aiohttp import web
+
+# Append project root
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.boards import BOARDS
+
+# Local stand-ins for the job boards in core/boards.py, for exercising the
+# multi-source ingestion runner offline. Each board is served at /<key> in its
+# own response shape (same field paths the adapter reads), with configurable
+# latency, failure rate and pagination. --script replays fixed responses for a
+# board's first requests (a status code, or "bad" for a cut-off JSON body);
+# 429s carry a Retry-After header.
+#   python stub_boards.py --port 8081 --latency 0.2 --fail-rate 0.2 --slow remotive=3
+#   python stub_boards.py --script remotive=503,429 arbeitnow=bad
+#   python ingest_boards.py --base-url http://127.0.0.1:8081 --store /tmp/jobs
+
+TITLES = ["Senior Python Developer", "Frontend Engineer (React)", "Data Scientist", "DevOps Engineer",
+          "Machine Learning Engineer", "Backend Engineer - Go", "Full Stack Developer", "Product Manager"]
+TAGS = ["python", "react", "aws", "docker", "kubernetes", "sql", "typescript", "pytorch", "golang", "node.js"]
+
+def _set(item, path, value):
+    keys = path.split('.')
+    for key in keys[:-1]:
+        item = item.setdefault(key, {})
+    item[keys[-1]] = value
+
+def fake_item(board_key, n, rng):
+    """One posting in the board's own JSON shape."""
+    fields = BOARDS[board_key].fields
+    low = rng.randrange(40, 140) * 1000
+    item = {}
+    values = {
+        "id": f"{board_key}-{n}", "position": rng.choice(TITLES), "company": f"Stub Co {n % 50}",
+        "tags": rng.sample(TAGS, 3), "date": "2026-01-15T00:00:00+00:00",
+        "description": f"<p>Work with {rng.choice(TAGS)} and {rng.choice(TAGS)}.</p>",
+        "url": f"https://example.com/{board_key}/{n}",
+    }
+    for name, path in fields.items():
+        if name == "salary":
+            if isinstance(path, tuple):
+                _set(item, path[0], low)
+                _set(item, path[1], low + 30000)
+            else:
+                # Free text in the formats Remotive actually returns
+                _set(item, path, rng.choice([
+                    f"${low:,} - ${low + 30000:,}",
+                    f"${low // 1000}k - ${(low + 30000) // 1000}k",
+                    f"${low // 2080} - ${(low + 30000) // 2080}/hr",
+                    f"${low // 12:,} - ${(low + 30000) // 12:,} per month",
+                ]))
+        elif path:
+            _set(item, path, values[name])
+    return item
+
+def make_app(args):
+    rng = random.Random(args.seed)
+    slow = dict((k, float(v)) for k, v in (s.split('=') for s in args.slow))
+    script = {k: v.split(',') for k, v in (s.split('=') for s in args.script)}
+    stats = {key: {"requests": 0, "failures": 0} for key in BOARDS}
+
+    async def board(request):
+        key = request.match_info['key']
+        if key not in BOARDS:
+            raise web.HTTPNotFound()
+        stats[key]["requests"] += 1
+        await asyncio.sleep(slow.get(key, args.latency) * rng.uniform(0.5, 1.5))
+        scripted = script[key].pop(0) if script.get(key) else None
+        if scripted == "bad":
+            stats[key]["failures"] += 1
+            return web.Response(text='[{"id": "cut', content_type="application/json")
+        if scripted or rng.random() < args.fail_rate:
+            stats[key]["failures"] += 1
+            status = int(scripted) if scripted else rng.choice([429, 500, 503])
+            headers = {"Retry-After": str(args.retry_after)} if status == 429 else None
+            return web.json_response({"error": "stub failure"}, status=status, headers=headers)
+
+        b = BOARDS[key]
+        if b.paging == "offset":
+            page = int(request.query.get(b.offset_param, 0)) // b.page_size
+        else:
+            page = int(request.query.get("page", 0))
+        per_page = b.page_size if b.paging == "offset" else args.per_page
+        last = page >= args.pages - 1
+        # A short final page ends offset paging
+        count = per_page // 2 if (last and b.paging == "offset") else per_page
+        items = [fake_item(key, page * per_page + i, rng) for i in range(count)]
+        if key == "remoteok":
+            items.insert(0, {"legal": "stub"}) # RemoteOK leads with a notice
+
+        payload = items
+        if b.items_key:
+            payload = {}
+            _set(payload, b.items_key, items)
+        if b.paging == "links":
+            _set(payload, b.next_key, None if last else f"{request.url.with_query(page=page + 1)}")
+        return web.json_response(payload)
+
+    async def report(request):
+        return web.json_response(stats)
+
+    app = web.Application()
+    app.router.add_get('/_stats', report)
+    app.router.add_get('/{key}', board)
+    return app
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Stub job board APIs with latency and failures.")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.1, help="Mean response delay in seconds")
+    parser.add_argument("--fail-rate", type=float, default=0.1, help="Fraction of requests answered 429/5xx")
+    parser.add_argument("--slow", nargs="*", default=[], help="Per-board delay overrides, e.g. remotive=3")
+    parser.add_argument("--pages", type=int, default=3, help="Pages per paginated board")
+    parser.add_argument("--per-page", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--script", nargs="*", default=[],
+                        help="Responses for a board's first requests, e.g. remotive=503,429 jobicy=bad")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds on 429s")
+    return parser
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    web.run_app(make_app(args), host="127.0.0.1", port=args.port)
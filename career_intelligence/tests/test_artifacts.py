@@ -0,0 +1,29 @@
+import os
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+
+from core.artifacts import prune_versions
+
+def test_prune_orders_versions_by_timestamp_and_suffix(tmp_path):
+    names = ["20261001090000", "20261001090000-2", "20261001090000-10",
+             "20261001090000-11", "20261002000000", "notes", "backup-old"]
+    for name in names:
+        (tmp_path / name).mkdir()
+    (tmp_path / "CURRENT").write_text("20261001090000-11")
+
+    removed = prune_versions(str(tmp_path), "20261001090000-11", keep=2)
+
+    # Lexically "-10" < "-2"; parsed, -2 is older and goes first
+    assert sorted(removed) == ["20261001090000", "20261001090000-2"]
+    # Non-version directories and anything newer than the live one survive
+    assert sorted(os.listdir(tmp_path)) == ["20261001090000-10", "20261001090000-11", "20261002000000",
+                                            "CURRENT", "backup-old", "notes"]
+
+def test_prune_keep_one_leaves_only_live(tmp_path):
+    for name in ["20261001090000", "20261001090001"]:
+        (tmp_path / name).mkdir()
+    assert prune_versions(str(tmp_path), "20261001090001", keep=1) == ["20261001090000"]
+    assert os.listdir(tmp_path) == ["20261001090001"]
@@ -0,0 +1,67 @@
+import threading
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+from nlp.batching import EncodeBatcher, _Request
+
+def test_idle_call_runs_inline():
+    calls = []
+    batcher = EncodeBatcher(lambda texts: calls.append((threading.current_thread(), texts)) or np.ones((len(texts), 2)))
+    assert batcher.encode(["python"]).shape == (1, 2)
+    assert calls == [(threading.current_thread(), ["python"])]
+    assert batcher.stats()["direct"] == 1 and batcher.batches == 0
+
+def test_overlapping_calls_are_queued():
+    release = threading.Event()
+
+    def encode(texts):
+        if texts == ["first"]:
+            release.wait(5)
+        return np.ones((len(texts), 2))
+
+    batcher = EncodeBatcher(encode)
+    first = threading.Thread(target=batcher.encode, args=(["first"],))
+    first.start()
+    while batcher._active == 0:
+        pass
+    results = []
+    others = [threading.Thread(target=lambda: results.append(batcher.encode(["t"]).shape)) for _ in range(3)]
+    for t in others:
+        t.start()
+    for t in others:
+        t.join(5)
+    release.set()
+    first.join(5)
+    assert results == [(1, 2)] * 3
+    assert batcher.direct == 1 and batcher.items == 3
+
+def test_collect_never_exceeds_max_batch():
+    batcher = EncodeBatcher(lambda texts: np.ones((len(texts), 2)), max_batch=4, max_wait=0.0)
+    for texts in (["a", "b", "c"], ["d", "e"], ["f"], ["g", "h", "i", "j", "k"]):
+        batcher._queue.put(_Request(texts))
+    sizes = [batcher._collect()[1] for _ in range(3)]
+    # An oversized request still goes, on its own
+    assert sizes == [3, 3, 5]
+
+def test_inline_and_batched_encodes_do_not_overlap():
+    running, overlaps = [0], []
+    lock = threading.Lock()
+
+    def encode(texts):
+        with lock:
+            running[0] += 1
+            overlaps.append(running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+        return np.ones((len(texts), 2))
+
+    batcher = EncodeBatcher(encode, max_batch=4)
+    threads = [threading.Thread(target=batcher.encode, args=(["t"],)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    assert max(overlaps) == 1
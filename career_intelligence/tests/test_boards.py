@@ -0,0 +1,26 @@
+import pytest
+
+from core.boards import BOARDS
+
+@pytest.mark.parametrize("raw, text", [
+    ("$100,000 - $150,000", "$100k - $150k"),
+    ("$90k - $120k", "$90k - $120k"),
+    ("$100-150k", "$100k - $150k"),
+    ("USD 80K - 95K per year", "$80k - $95k"),
+    ("$40 - $60/hr", "$83k - $125k"),
+    ("$5,000 - $7,000 per month", "$60k - $84k"),
+    ("$120,000", "$120k - $120k"),
+    ("Competitive", ""),
+    ("", ""),
+])
+def test_remotive_salary_text(raw, text):
+    item = {"id": 1, "title": "Backend Engineer", "company_name": "Acme", "tags": [], "salary": raw}
+    assert BOARDS["remotive"].normalize(item)["salary"] == text
+
+def test_remotive_salary_reaches_lpa_scale():
+    pytest.importorskip("pandas")
+    from core.ingestion import pipeline
+    item = BOARDS["remotive"].normalize({"id": 1, "title": "Backend Engineer", "company_name": "Acme",
+                                         "tags": ["python"], "salary": "$100,000 - $150,000"})
+    post = next(pipeline([item]))
+    assert (post["Min_Salary"], post["Max_Salary"]) == (25.0, 37.5)
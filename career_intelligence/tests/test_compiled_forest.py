@@ -0,0 +1,69 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+ensemble = pytest.importorskip("sklearn.ensemble")
+
+from core.salary import CompiledForest, compile_forest, predict_salary_batch
+
+N_FEATURES = 385
+
+@pytest.fixture(scope="module")
+def forest():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(400, N_FEATURES)).astype(np.float32)
+    y = 10 + 3 * X[:, 0] - 2 * X[:, 1] + X[:, -1] + rng.normal(scale=0.5, size=len(X))
+    model = ensemble.RandomForestRegressor(n_estimators=20, max_depth=8, random_state=0)
+    model.fit(X, y)
+    return model, compile_forest(model)
+
+def test_matches_sklearn_on_random_inputs(forest):
+    model, compiled = forest
+    X = np.random.default_rng(1).normal(size=(500, N_FEATURES)).astype(np.float32)
+    np.testing.assert_allclose(compiled.predict(X), model.predict(X), rtol=0, atol=1e-9)
+
+def test_matches_sklearn_at_split_thresholds(forest):
+    model, compiled = forest
+    # Every feature of every row sits exactly on (or next to) some split threshold,
+    # which is where float32 features vs float64 thresholds could diverge
+    rng = np.random.default_rng(2)
+    internal = [(t.feature[t.children_left != -1], t.threshold[t.children_left != -1])
+                for t in (e.tree_ for e in model.estimators_)]
+    features = np.concatenate([f for f, _ in internal])
+    thresholds = np.concatenate([th for _, th in internal])
+
+    X = rng.normal(size=(3 * len(features), N_FEATURES)).astype(np.float32)
+    for i, (f, th) in enumerate(zip(features, thresholds)):
+        at = np.float32(th)
+        X[3 * i, f] = at
+        X[3 * i + 1, f] = np.nextafter(at, np.float32(-np.inf))
+        X[3 * i + 2, f] = np.nextafter(at, np.float32(np.inf))
+    np.testing.assert_allclose(compiled.predict(X), model.predict(X), rtol=0, atol=1e-9)
+
+def test_array_round_trip_and_batch_helper(forest):
+    model, compiled = forest
+    X = np.random.default_rng(3).normal(size=(50, N_FEATURES)).astype(np.float32)
+    restored = CompiledForest.from_arrays(compiled.to_arrays())
+    np.testing.assert_array_equal(restored.predict(X), compiled.predict(X))
+
+    low, high = predict_salary_batch(compiled, X[:, :-1], X[:, -1])
+    expected = model.predict(X)
+    np.testing.assert_allclose(low, np.round(expected * 0.85, 1))
+    np.testing.assert_allclose(high, np.round(expected * 1.15, 1))
+
+def test_append_weights_trees_by_training_rows(forest):
+    model, _ = forest
+    rng = np.random.default_rng(4)
+    X_new = rng.normal(size=(40, N_FEATURES)).astype(np.float32)
+    update = ensemble.RandomForestRegressor(n_estimators=5, max_depth=4, random_state=0)
+    update.fit(X_new, 100 + X_new[:, 0])
+
+    base = compile_forest(model, n_rows=400)
+    merged = base.append(compile_forest(update, n_rows=40))
+    assert merged.n_trees == 25
+    X = rng.normal(size=(30, N_FEATURES)).astype(np.float32)
+    expected = (400 * model.predict(X) + 40 * update.predict(X)) / 440
+    np.testing.assert_allclose(merged.predict(X), expected, rtol=1e-12)
+    np.testing.assert_allclose(CompiledForest.from_arrays(merged.to_arrays()).predict(X), expected, rtol=1e-12)
+
+    with pytest.raises(ValueError):
+        compile_forest(model).append(compile_forest(update))
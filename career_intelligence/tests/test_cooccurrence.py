@@ -0,0 +1,17 @@
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+
+from core.cooccurrence import SkillGraph
+
+POSTINGS = [["python", "django", "sql"], ["python", "pandas", "sql"], ["python", "django", "docker"],
+            ["react", "typescript"], ["react", "typescript", "css"], ["python", "pandas"]] * 2
+
+def test_duplicate_profile_skills_count_once():
+    graph = SkillGraph()
+    graph.add_postings(POSTINGS)
+    once = graph.related(["python", "sql"], k=5)
+    assert once
+    assert graph.related(["python", "Python ", "sql", "python"], k=5) == once
+    assert all(skill not in ("python", "sql") for skill, _ in once)
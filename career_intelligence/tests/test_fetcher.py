@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+pytest.importorskip("numpy")
+from aiohttp.test_utils import TestServer
+
+from core.boards import get_boards
+from core.fetcher import ingest_boards
+from core.jobstore import JobStore
+from stub_boards import build_parser, make_app
+
+BOARDS = ["remoteok", "remotive"] # single-page boards, 50 postings each
+
+def ingest(tmp_path, *script, retries=2, retry_after=1):
+    """Runs ingest_boards against the stub boards; returns (report, stub request stats)."""
+    args = build_parser().parse_args(["--latency", "0", "--fail-rate", "0", "--retry-after", str(retry_after),
+                                      "--script", *script])
+
+    async def main():
+        server = TestServer(make_app(args))
+        await server.start_server()
+        try:
+            boards = get_boards(BOARDS, str(server.make_url("")))
+            for board in boards:
+                board.rate, board.burst = 100.0, 10 # the stub's host isn't rate limited
+            report = await ingest_boards(boards, store=JobStore(str(tmp_path)), retries=retries, backoff=0.01)
+            async with aiohttp.ClientSession() as session:
+                async with session.get(server.make_url("/_stats")) as resp:
+                    stats = await resp.json()
+            return report, stats
+        finally:
+            await server.close()
+
+    return asyncio.run(main())
+
+def test_retries_5xx(tmp_path):
+    report, stats = ingest(tmp_path, "remotive=500,503")
+    assert stats["remotive"]["requests"] == 3
+    assert report["Remotive"] == {**report["Remotive"], "fetched": 50, "written": 50, "error": None}
+
+def test_honors_retry_after_on_429(tmp_path):
+    report, stats = ingest(tmp_path, "remotive=429", retry_after=1)
+    assert stats["remotive"]["requests"] == 2
+    assert report["Remotive"]["fetched"] == 50
+    # Backoff alone would be ~10ms; Retry-After asked for a full second
+    assert report["Remotive"]["seconds"] >= 1.0
+
+def test_retries_undecodable_json(tmp_path):
+    report, stats = ingest(tmp_path, "remotive=bad")
+    assert stats["remotive"]["requests"] == 2
+    assert report["Remotive"]["fetched"] == 50 and report["Remotive"]["error"] is None
+
+def test_failing_board_does_not_fail_others(tmp_path):
+    report, stats = ingest(tmp_path, "remotive=500,500,500,500", retries=2)
+    assert stats["remotive"]["requests"] == 3
+    assert report["Remotive"]["written"] == 0 and "HTTP 500" in report["Remotive"]["error"]
+    assert report["RemoteOK"] == {**report["RemoteOK"], "fetched": 50, "written": 50, "error": None}
+    assert len(JobStore(str(tmp_path)).read_all()) == 50
@@ -0,0 +1,68 @@
+import json
+import os
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+
+from core.ingestion import file_source, iter_json_array, run_ingestion
+from core.jobstore import JobStore
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+SAMPLE = os.path.join(FIXTURES, 'remoteok_sample.json')
+UPDATE = os.path.join(FIXTURES, 'remoteok_update.jsonl')
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / 'jobs'))
+
+def _rows(store):
+    df = store.read_all()
+    return {row['Job_ID']: row for row in df.to_dict('records')}
+
+def test_iter_json_array_handles_any_chunking():
+    doc = json.dumps([{"legal": "x"}, {"id": 1, "position": "A, B]"}, 12345, "s]t", [1, 2]])
+    for size in (1, 3, 7, len(doc)):
+        chunks = [doc[i:i + size] for i in range(0, len(doc), size)]
+        assert list(iter_json_array(chunks)) == json.loads(doc)
+    with pytest.raises(ValueError):
+        list(iter_json_array(['[{"a": 1}, {"b"']))
+
+def test_run_ingestion_stores_normalized_rows(store):
+    assert run_ingestion(file_source(SAMPLE), store) == 3
+    rows = _rows(store)
+    assert len(rows) == 3
+
+    senior = rows["remoteok:101"]
+    assert senior['Role'] == "Senior Python Developer"
+    assert senior['Company'] == "Acme"
+    assert senior['Source'] == "RemoteOK"
+    # Tags through the alias table ("k8s"), non-skills dropped, description skills added
+    assert set(senior['Skills']) == {"python", "django", "kubernetes", "postgresql", "docker"}
+    # $60k-$100k at the 0.25 market correction
+    assert (senior['Min_Salary'], senior['Max_Salary'], senior['Salary']) == (15.0, 25.0, 20.0)
+
+    frontend = rows["remoteok:102"]
+    assert frontend['Skills'] == ["react", "typescript"]
+    # No salary posted: title-based fallback range
+    assert (frontend['Min_Salary'], frontend['Max_Salary']) == (8.0, 18.0)
+
+    hashed = [job_id for job_id in rows if job_id.startswith("hash:")]
+    assert len(hashed) == 1
+    assert rows[hashed[0]]['Salary'] == 20.0
+
+def test_second_run_skips_checkpointed_ids(store):
+    run_ingestion(file_source(SAMPLE), store)
+    assert run_ingestion(file_source(SAMPLE), store) == 0
+    assert len(store.read_all()) == 3
+
+    # JSON lines source: one known ID, one new
+    assert run_ingestion(file_source(UPDATE), store) == 1
+    rows = _rows(store)
+    assert len(rows) == 4
+    assert rows["remoteok:104"]['Skills'] == ["aws", "terraform"]
+
+    # A fresh JobStore on the same directory sees the same checkpoint
+    assert run_ingestion(file_source(SAMPLE), JobStore(store.root)) == 0
+    assert store.load_checkpoint()["total"] == 4
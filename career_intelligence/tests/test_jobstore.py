@@ -0,0 +1,68 @@
+import datetime
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+
+from core.demand import DemandEngine
+from core.jobstore import JobStore, posted_day
+
+RECORDS = [
+    {"Job_ID": "a", "Role": "Backend Engineer", "Salary": 20.0, "Experience": 3,
+     "Skills": ["python", "django"], "Posted": "2026-10-01T10:00:00+00:00"},
+    {"Job_ID": "b", "Role": "Frontend Engineer", "Salary": 15.0, "Experience": 2,
+     "Skills": ["react"], "Posted": 1791331200}, # epoch seconds: 2026-10-07
+    {"Job_ID": "c", "Role": "Data Scientist", "Salary": 25.0, "Experience": 5,
+     "Skills": ["python", "pandas", "sql"], "Posted": "Mon, 12 Oct 2026 08:00:00 GMT"},
+    {"Job_ID": "d", "Role": "DevOps Engineer", "Salary": 22.0, "Experience": 4, "Skills": ["aws"]},
+]
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs'))
+    store.write_partition(RECORDS, "test", date="2026-10-15")
+    return store
+
+def test_posted_day_formats():
+    assert posted_day("2026-10-01T10:00:00+00:00") == "2026-10-01"
+    assert posted_day(1791331200) == "2026-10-07"
+    assert posted_day("1791331200000") == "2026-10-07"
+    assert posted_day("Mon, 12 Oct 2026 08:00:00 GMT") == "2026-10-12"
+    assert posted_day(None) == posted_day("") == posted_day("soon") == ""
+
+def test_posted_date_is_stored_and_filterable(store):
+    df = store.read_all()
+    assert df.set_index('Job_ID')['Posted'].to_dict() == {
+        "a": "2026-10-01", "b": "2026-10-07", "c": "2026-10-12", "d": ""}
+
+    table = store.scan(posted_from="2026-10-05", posted_to="2026-10-31")
+    df = table.to_frame()
+    assert df['Job_ID'].tolist() == ["b", "c"]
+    # Skills stay aligned with their rows after filtering
+    assert df['Skills'].tolist() == [["react"], ["python", "pandas", "sql"]]
+    assert table.skill_count_map() == {"react": 1, "python": 1, "pandas": 1, "sql": 1}
+
+def test_parts_without_posted_column_still_read(store):
+    (_, _, path), = store.partitions()
+    os.remove(os.path.join(path, "posted.npy"))
+    assert store.read_all()['Posted'].tolist() == ["", "", "", ""]
+
+def test_demand_engine_rebuilds_from_store(store):
+    engine = DemandEngine.from_store(store)
+    # Newest posting date wins; the undated row falls back to its ingestion day
+    assert engine.day == np.datetime64("2026-10-15").astype(object).toordinal()
+    assert engine.count("python", window=30) == 2
+    assert engine.count("python", window=7) == 1
+    assert engine.count("react", window=7) == 0
+    assert engine.count("aws", window=7) == 1
+
+def test_demand_engine_accepts_epoch_and_rfc2822_days():
+    engine = DemandEngine()
+    engine.add(["sql"], 1791331200) # epoch seconds: 2026-10-07
+    engine.add(["python"], "2026-10-08T09:00:00+00:00")
+    engine.add(["aws"], "Fri, 09 Oct 2026 08:00:00 GMT")
+    engine.add(["go"], 1791331200000) # epoch milliseconds
+    assert engine.day == datetime.date(2026, 10, 9).toordinal()
+    assert set(engine.demand_map()) == {"sql", "python", "aws", "go"}
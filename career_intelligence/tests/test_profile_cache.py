@@ -0,0 +1,19 @@
+from core.profile_cache import GapEngine, TTLCache
+
+ROLES = {"Role": ["Frontend Engineer"], "Core_Skills": [["react", "redux", "typescript"]]}
+
+def test_unknown_role_is_none_and_not_cached():
+    engine = GapEngine(ROLES)
+    assert engine.analyze(["react"], 3, "Astronaut") is None
+    assert engine.cache.stats()["size"] == 0
+
+def test_callers_get_independent_copies():
+    engine = GapEngine(ROLES, cache=TTLCache())
+    first = engine.analyze(["react"], 3, "Frontend Engineer")
+    assert first["gap_skills"] == ["redux", "typescript"]
+    first["gap_skills"].append("cobol")
+    first["roadmap"]["Month 1"].clear()
+    second = engine.analyze(["react"], 3, "Frontend Engineer")
+    assert engine.cache.hits == 1
+    assert second["gap_skills"] == ["redux", "typescript"]
+    assert second["roadmap"] == {"Month 1": ["redux"], "Month 2": ["typescript"], "Month 3": []}
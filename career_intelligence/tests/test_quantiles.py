@@ -0,0 +1,61 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+from core.quantiles import PERCENTILES, SalarySketches, TDigest
+
+def skewed(n, seed):
+    # Log-normal, like salaries: long right tail
+    return np.random.default_rng(seed).lognormal(mean=2.5, sigma=0.6, size=n)
+
+def rank_error(values, estimate, q):
+    """How far the estimate's rank in `values` is from q."""
+    return abs(np.searchsorted(np.sort(values), estimate) / len(values) - q)
+
+def test_percentiles_match_exact_quantiles_on_skewed_data():
+    values = skewed(100000, 0)
+    digest = TDigest()
+    for chunk in np.array_split(values, 50):
+        digest.add(chunk)
+    estimates = digest.quantile(PERCENTILES)
+    exact = np.quantile(values, PERCENTILES)
+    np.testing.assert_allclose(estimates, exact, rtol=0.01)
+    for q, estimate in zip(PERCENTILES, estimates):
+        assert rank_error(values, estimate, q) < 0.005
+    assert digest.count == len(values)
+    assert len(digest.weights) <= digest.compression
+
+def test_merged_shards_match_single_digest():
+    shards = [skewed(20000, seed) for seed in range(1, 6)]
+    single = TDigest()
+    single.add(np.concatenate(shards))
+    merged = TDigest()
+    for shard in shards:
+        digest = TDigest()
+        digest.add(shard)
+        merged.merge(digest)
+    assert merged.count == single.count
+    assert (merged.min, merged.max) == (single.min, single.max)
+    np.testing.assert_allclose(merged.quantile(PERCENTILES), single.quantile(PERCENTILES), rtol=0.01)
+    np.testing.assert_allclose(merged.quantile(PERCENTILES), np.quantile(np.concatenate(shards), PERCENTILES),
+                               rtol=0.01)
+
+def test_unknown_experience_skips_bands():
+    sketches = SalarySketches()
+    sketches.add_postings(["Data Scientist"] * 2, [["python"], ["sql"]], [20.0, 30.0], [3, math.nan])
+    assert sketches.percentiles("role", "Data Scientist")[3] == 2
+    assert sketches.percentiles("band", "3-5")[3] == 1
+    assert sketches.percentiles("role_band", "Data Scientist|3-5")[3] == 1
+    assert sketches.percentiles("band", "10+") is None
+
+def test_save_load_round_trip(tmp_path):
+    sketches = SalarySketches()
+    values = skewed(5000, 7)
+    sketches.add_postings(["Backend Engineer"] * len(values), [["go"]] * len(values), values, [4] * len(values))
+    path = str(tmp_path / "sketches.npz")
+    sketches.save(path)
+    restored = SalarySketches.load(path)
+    assert restored.percentiles("skill", "Go") == pytest.approx(sketches.percentiles("skill", "go"))
+    np.testing.assert_allclose(restored.quantile("role", "Backend Engineer", 0.9),
+                               sketches.quantile("role", "Backend Engineer", 0.9))
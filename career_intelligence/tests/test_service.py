@@ -0,0 +1,53 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("numpy")
+from service import MicroBatcher, parse_request
+
+def test_bad_item_fails_alone():
+    def fn(items):
+        return [ValueError(it) if it == "bad" else it.upper() for it in items]
+
+    async def main():
+        batcher = MicroBatcher(fn, ThreadPoolExecutor(2), max_wait=0.01)
+        batcher.start()
+        return await asyncio.gather(*(batcher.submit(it) for it in ["a", "bad", "b"]), return_exceptions=True)
+
+    a, bad, b = asyncio.run(main())
+    assert (a, b) == ("A", "B")
+    assert isinstance(bad, ValueError)
+
+def test_batches_run_in_parallel():
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def fn(items):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        return items
+
+    async def main():
+        batcher = MicroBatcher(fn, ThreadPoolExecutor(4), max_batch=1, max_wait=0, max_inflight=4)
+        batcher.start()
+        return await asyncio.gather(*(batcher.submit(i) for i in range(8)))
+
+    assert asyncio.run(main()) == list(range(8))
+    assert peak[0] > 1
+
+def test_parse_request_defaults():
+    assert parse_request({"skills": "Python, SQL"}) == (["Python", "SQL"], 0.0, None, 3)
+
+@pytest.mark.parametrize("payload", [
+    [], "python", {"experience": "lots"}, {"experience": -1}, {"experience": "nan"},
+    {"k": "three"}, {"k": 0}, {"k": -2}, {"skills": 5}, {"target_role": ["x"]},
+])
+def test_parse_request_rejects_bad_input(payload):
+    with pytest.raises(ValueError):
+        parse_request(payload)
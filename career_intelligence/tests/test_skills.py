@@ -0,0 +1,24 @@
+import pytest
+
+from core.skills import canonical_skill, extract_skills, filter_skills, normalize_skill
+
+def test_aliases_map_to_whitelist_names():
+    assert normalize_skill("ReactJS") == "react"
+    assert normalize_skill("K8s") == "kubernetes"
+    assert normalize_skill("underwater basket weaving") is None
+    assert canonical_skill("  Underwater  Basket ") == "underwater basket"
+    assert filter_skills(["Python3", "py", "marketing", "node"]) == ["python", "node.js"]
+
+def test_extract_prefers_longest_match():
+    assert extract_skills("Apache Spark and <b>PostgreSQL</b>, some Docker") == ["spark", "postgresql", "docker"]
+
+def test_gap_uses_alias_map():
+    pytest.importorskip("numpy")
+    from core.demand import get_gap_skills
+    assert get_gap_skills(["ReactJS", "TS"], ["react", "typescript", "redux"]) == ["redux"]
+
+def test_gap_engine_uses_alias_map():
+    pd = pytest.importorskip("pandas")
+    from core.profile_cache import GapEngine
+    engine = GapEngine(pd.DataFrame({"Role": ["Frontend Engineer"], "Core_Skills": [["react", "redux"]]}))
+    assert engine.gap(["ReactJS"], "Frontend Engineer") == ["redux"]
@@ -0,0 +1,23 @@
+import pytest
+
+pytest.importorskip("pandas")
+from core.taxonomy import RoleTaxonomy, normalize_title
+
+@pytest.mark.parametrize("title, normalized", [
+    ("Sr. Full-Stack Developer (Remote)", "full stack developer"),
+    ("Backend Engineer - Payments", "backend engineer"),
+    ("Senior Engineer - Frontend", "engineer frontend"),
+    ("Product Lead", "product lead"),
+])
+def test_normalize_title(title, normalized):
+    assert normalize_title(title) == normalized
+
+@pytest.mark.parametrize("title, category", [
+    ("Senior Engineer - Frontend", "Frontend Engineer"),
+    ("Backend Engineer - Payments", "Backend Engineer"),
+    ("Product Lead", "Product Manager"),
+    ("Lead Data Scientist", "Data Scientist"),
+    ("Staff Engineer - Berlin", "Software Engineer"),
+])
+def test_rules_without_fallback(title, category):
+    assert RoleTaxonomy().classify_one(title) == category
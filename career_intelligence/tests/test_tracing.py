@@ -0,0 +1,19 @@
+import json
+import os
+import time
+
+from core.tracing import start_json_dump
+
+def test_json_dump_survives_write_errors(tmp_path, capsys):
+    out_dir = tmp_path / "metrics"
+    path = str(out_dir / "snapshot.json")
+    start_json_dump(path, interval=0.02)
+    time.sleep(0.1) # directory missing: every dump fails
+    assert "Metrics dump" in capsys.readouterr().out
+
+    os.makedirs(out_dir)
+    deadline = time.monotonic() + 2
+    while not os.path.exists(path) and time.monotonic() < deadline:
+        time.sleep(0.02)
+    with open(path) as f:
+        assert isinstance(json.load(f), dict)